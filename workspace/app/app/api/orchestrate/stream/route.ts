@@ -0,0 +1,56 @@
+import { NextResponse } from 'next/server';
+
+export async function POST(request: Request) {
+  console.log('API route /api/orchestrate/stream reached.');
+  try {
+    const { prompt, agents, isFollowUp, brainstormingMethod } = await request.json();
+
+    if (!prompt) {
+      return NextResponse.json({ error: 'Prompt is required' }, { status: 400 });
+    }
+
+    // Prepare the request body for FastAPI
+    const requestBody: any = { prompt };
+
+    if (agents && agents.length > 0) {
+      requestBody.agents = agents;
+    }
+
+    if (isFollowUp) {
+      requestBody.is_follow_up = isFollowUp;
+    }
+
+    if (brainstormingMethod) {
+      requestBody.brainstorming_method = brainstormingMethod;
+    }
+
+    // Call the FastAPI streaming endpoint
+    console.log('Calling FastAPI endpoint: http://127.0.0.1:8000/run/stream');
+    const fastapiResponse = await fetch('http://127.0.0.1:8000/run/stream', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(requestBody),
+    });
+
+    if (!fastapiResponse.ok || !fastapiResponse.body) {
+      const errorText = await fastapiResponse.text();
+      console.error('FastAPI streaming error:', errorText);
+      return NextResponse.json({ error: `Orchestrator API error: ${errorText.substring(0, 100)}` }, { status: fastapiResponse.status });
+    }
+
+    // Pass the server-sent events through to the browser as they arrive
+    return new Response(fastapiResponse.body, {
+      headers: {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'Connection': 'keep-alive',
+      },
+    });
+
+  } catch (error: any) {
+    console.error('Caught error calling FastAPI streaming endpoint:', error);
+    return NextResponse.json({ error: `Internal Server Error: ${error.message || error}` }, { status: 500 });
+  }
+}
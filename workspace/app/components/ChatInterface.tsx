@@ -3,11 +3,35 @@
 import { useState, useRef, useEffect } from 'react';
 import { useAppContext } from '../contexts/AppContext';
 
+// Event sent by the orchestrator's /run/stream endpoint
+interface OrchestratorEvent {
+  type: string;
+  [key: string]: any;
+}
+
+// Progress line shown while the orchestrator works, or null for events that are not shown
+function describeEvent(event: OrchestratorEvent): string | null {
+  switch (event.type) {
+    case 'route':
+      return `Routed to ${event.agent} (${event.method})`;
+    case 'agent_call':
+      return `Asking the ${event.agent} agent...`;
+    case 'agent_result':
+      return `The ${event.agent} agent answered`;
+    case 'step':
+      return event.error ? `Step ${event.step_number} failed: ${event.error}` : `Step ${event.step_number} done`;
+    default:
+      return null;
+  }
+}
+
 export default function ChatInterface() {
   const { currentConversation, addMessageToCurrentConversation } = useAppContext();
   const [input, setInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
   const [processingStep, setProcessingStep] = useState('');
+  const [completedSteps, setCompletedSteps] = useState<string[]>([]);
+  const [streamingText, setStreamingText] = useState('');
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
   const scrollToBottom = () => {
@@ -16,7 +40,7 @@ export default function ChatInterface() {
 
   useEffect(() => {
     scrollToBottom();
-  }, [currentConversation?.messages]);
+  }, [currentConversation?.messages, streamingText]);
 
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -33,11 +57,17 @@ export default function ChatInterface() {
     addMessageToCurrentConversation(userMessage);
     setInput('');
     setIsLoading(true);
-    setProcessingStep('Understanding your question...');
-
-    // Simulate processing steps
-    setTimeout(() => setProcessingStep('Reviewing conversation context...'), 800);
-    setTimeout(() => setProcessingStep('Formulating response...'), 1600);
+    let currentStep = 'Understanding your question...';
+    setProcessingStep(currentStep);
+    setCompletedSteps([]);
+    setStreamingText('');
+    // Move the current progress line to the completed ones and show the next one
+    const advance = (nextStep: string) => {
+      const completed = currentStep;
+      setCompletedSteps(steps => [...steps, completed]);
+      currentStep = nextStep;
+      setProcessingStep(nextStep);
+    };
 
     try {
       // Prepare conversation history for the orchestrator
@@ -52,8 +82,8 @@ export default function ChatInterface() {
         content: userMessage.content
       });
 
-      // Call the orchestrator with conversation history
-      const response = await fetch('/api/orchestrate', {
+      // Call the orchestrator with conversation history, reading its events as they arrive
+      const response = await fetch('/api/orchestrate/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -65,17 +95,62 @@ export default function ChatInterface() {
         }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error('Failed to get response');
       }
 
-      const result = await response.json();
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let finalAnswer: string | null = null;
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        // Server-sent events are separated by a blank line; the last one may be incomplete
+        const blocks = buffer.split('\n\n');
+        buffer = blocks.pop() ?? '';
+        for (const block of blocks) {
+          const data = block
+            .split('\n')
+            .filter(line => line.startsWith('data:'))
+            .map(line => line.slice(5).trim())
+            .join('\n');
+          if (!data) continue;
+          const event: OrchestratorEvent = JSON.parse(data);
+          if (event.type === 'error') {
+            throw new Error(event.error);
+          }
+          if (event.type === 'delta') {
+            // Token deltas of the step being generated, shown in the in-progress message
+            setStreamingText(text => text + (event.content ?? ''));
+            continue;
+          }
+          if (event.type === 'final_answer') {
+            finalAnswer = event.output;
+            advance('Formulating response...');
+            continue;
+          }
+          if (event.type === 'step') {
+            // The next step streams its own text
+            setStreamingText('');
+          }
+          const description = describeEvent(event);
+          if (description) {
+            advance(description);
+          }
+        }
+      }
+
+      if (finalAnswer === null) {
+        throw new Error('The orchestrator finished without an answer');
+      }
 
       // Add system response to conversation
       const systemMessage = {
         id: (Date.now() + 1).toString(),
         role: 'system' as const,
-        content: result.response,
+        content: finalAnswer,
         timestamp: new Date()
       };
 
@@ -93,6 +168,8 @@ export default function ChatInterface() {
     } finally {
       setIsLoading(false);
       setProcessingStep('');
+      setCompletedSteps([]);
+      setStreamingText('');
     }
   };
 
@@ -141,7 +218,7 @@ export default function ChatInterface() {
         ))}
         {isLoading && (
           <div className="flex justify-start">
-            <div className="bg-white border border-gray-200 rounded-lg p-4">
+            <div className="max-w-[70%] bg-white border border-gray-200 rounded-lg p-4">
               <div>
                 <div className="flex items-center">
                   <div className="w-8 h-8 bg-purple-500 rounded-full flex items-center justify-center mr-2">
@@ -149,11 +226,17 @@ export default function ChatInterface() {
                   </div>
                   <div>
                     <span className="text-sm text-gray-600">Thinking...</span>
+                    {completedSteps.map((step, index) => (
+                      <p key={index} className="text-xs text-gray-400 mt-1">✓ {step}</p>
+                    ))}
                     {processingStep && (
                       <p className="text-xs text-gray-500 italic mt-1">{processingStep}</p>
                     )}
                   </div>
                 </div>
+                {streamingText && (
+                  <p className="whitespace-pre-wrap text-gray-800 mt-2">{streamingText}</p>
+                )}
               </div>
             </div>
           </div>
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for paper keyword extraction
+Compares the per-keyword scans used before the precompiled matcher with the single-pass
+KeywordMatcher, over the papers of a dump (HF_PAPERS_DUMP_PATH or --dump) or a synthetic corpus
+"""
+
+import argparse
+import random
+import re
+import sys
+import os
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from typing import Callable, Dict, List
+from workspace.src.hf_papers_search import KEY_TERMS, PAPER_INDICATORS, _indicator_counts, _PAPER_MATCHER
+from workspace.src.paper_index import HF_PAPERS_DUMP_PATH, load_papers
+
+_LEGACY_KEY_PATTERNS = [
+    r'\b(?:transformer|attention|bert|gpt|llm|neural|deep|learning|ai|ml)\b',
+    r'\b(?:multimodal|vision|nlp|computer vision|reinforcement)\b',
+    r'\b(?:diffusion|gan|vae|autoencoder|embedding)\b',
+    r'\b(?:fine-tuning|pre-training|zero-shot|few-shot)\b',
+    r'\b(?:optimization|efficiency|scaling|performance)\b'
+]
+
+
+def legacy_analysis(text: str) -> Dict[str, int]:
+    """Key terms and indicator counts the way they were computed before: one scan per pattern and keyword."""
+    text_lower = text.lower()
+    terms = []
+    for pattern in _LEGACY_KEY_PATTERNS:
+        terms.extend(re.findall(pattern, text_lower))
+    counts = {category: sum(1 for keyword in keywords if keyword in text_lower) for category, keywords in PAPER_INDICATORS.items()}
+    counts["key_terms"] = len(set(terms))
+    return counts
+
+
+def matcher_analysis(text: str) -> Dict[str, int]:
+    """The same counts from one scan of the precompiled matcher."""
+    return _indicator_counts(text)
+
+
+def synthetic_corpus(size: int) -> List[str]:
+    rng = random.Random(0)
+    filler = ("we study the problem of learning representations from data and evaluate our method on "
+              "several benchmarks showing that results depend on the training setup and the size of the dataset").split()
+    vocabulary = filler * 4 + KEY_TERMS + [keyword for keywords in PAPER_INDICATORS.values() for keyword in keywords]
+    return [" ".join(rng.choices(vocabulary, k=rng.randint(120, 250))) for _ in range(size)]
+
+
+def time_function(function: Callable[[str], Dict[str, int]], texts: List[str]) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        function(text)
+    return time.perf_counter() - start
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dump", default=HF_PAPERS_DUMP_PATH, help="Paper metadata dump (JSON lines)")
+    parser.add_argument("--size", type=int, default=20000, help="Number of abstracts to analyze")
+    args = parser.parse_args(argv)
+
+    if args.dump:
+        texts = []
+        for paper in load_papers(args.dump):
+            texts.append(f"{paper['title']} {paper['summary']}")
+            if len(texts) >= args.size:
+                break
+    else:
+        texts = synthetic_corpus(args.size)
+
+    mismatches = sum(
+        1 for text in texts[:1000]
+        if legacy_analysis(text) != matcher_analysis(text)
+    )
+    print(f"Analyzing {len(texts)} abstracts ({mismatches} of the first 1000 disagree with the legacy scans)")
+
+    results = {
+        "legacy scans": time_function(legacy_analysis, texts),
+        "matcher": time_function(matcher_analysis, texts),
+    }
+    start = time.perf_counter()
+    _PAPER_MATCHER.count_matrix(texts)
+    results["matcher batch"] = time.perf_counter() - start
+
+    print(f"{'method':<28}{'total (s)':>12}{'per paper (us)':>16}")
+    print("-" * 56)
+    for method, duration in results.items():
+        print(f"{method:<28}{duration:>12.2f}{duration / len(texts) * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
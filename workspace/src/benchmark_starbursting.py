@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the starbursting answer modes
+Compares wall-clock latency, LLM calls and token cost of the sequential, concurrent and batched modes,
+through either the direct completion engine or the CodeAgent loop
+"""
+
+import argparse
+import sys
+import os
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from typing import Dict, List
+from workspace.src.brainstorming import BrainstormingAgent, BRAINSTORM_ENGINES
+from workspace.src.brainstorming_methods import sb, SB_ANSWER_MODES
+
+
+def benchmark_mode(mode: str, engine: str, query: str, api_key: str, repeats: int) -> Dict[str, float]:
+    """Run starbursting `repeats` times in one answer mode and average the measurements."""
+    durations = []
+    brainstorming_agent = BrainstormingAgent(api_key, engine=engine)
+    for _ in range(repeats):
+        start = time.perf_counter()
+        sb(query, brainstorming_agent.runner, answer_mode=mode)
+        durations.append(time.perf_counter() - start)
+
+    usage = brainstorming_agent.usage()
+    return {
+        "latency_s": sum(durations) / repeats,
+        "llm_calls": usage["calls"] / repeats,
+        "input_tokens": usage["input_tokens"] / repeats,
+        "output_tokens": usage["output_tokens"] / repeats,
+    }
+
+
+def print_report(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'mode':<12}{'latency (s)':>14}{'LLM calls':>12}{'input tok':>12}{'output tok':>12}")
+    print("-" * 62)
+    for mode, result in results.items():
+        print(f"{mode:<12}{result['latency_s']:>14.1f}{result['llm_calls']:>12.1f}"
+              f"{result['input_tokens']:>12.0f}{result['output_tokens']:>12.0f}")
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--query", default="A mobile app that connects volunteers with local food banks.")
+    parser.add_argument("--modes", nargs="+", default=list(SB_ANSWER_MODES), choices=SB_ANSWER_MODES)
+    parser.add_argument("--engine", default="completion", choices=BRAINSTORM_ENGINES)
+    parser.add_argument("--repeats", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if ANTHROPIC_API_KEY is None:
+        print("Error: ANTHROPIC_API_KEY environment variable not set.")
+        sys.exit(1)
+
+    results = {}
+    for mode in args.modes:
+        print(f"Benchmarking {mode} mode with the {args.engine} engine...")
+        results[mode] = benchmark_mode(mode, args.engine, args.query, ANTHROPIC_API_KEY, args.repeats)
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -8,49 +8,70 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 # Add the project root to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from typing import Dict, Callable, Any, cast # Import necessary types including cast
+from typing import Dict, Callable, Any, Optional, cast # Import necessary types including cast
 from workspace.src.brainstorming_methods import sb, bmm, rb, rs, sc, sh
 from smolagents import CodeAgent
 from smolagents import Tool
-from smolagents.models import LiteLLMModel
+from workspace.src.completion_engine import CompletionEngine
+from workspace.src.llm_cache import create_model
+
+# "completion" sends each brainstorming prompt as one model call, "agent" runs it through a CodeAgent loop
+BRAINSTORM_ENGINES = ("completion", "agent")
+DEFAULT_BRAINSTORM_ENGINE = os.getenv("BRAINSTORM_ENGINE", "completion")
 
 
 class BrainstormingAgent:
-    def __init__(self, api_key: str) -> None: # Add type hint for api_key and return type
+    def __init__(self, api_key: str, max_in_flight: Optional[int] = None, starbursting_answer_mode: Optional[str] = None, engine: Optional[str] = None) -> None: # Add type hint for api_key and return type
+        # Maximum concurrent per-idea LLM calls, defaults to BRAINSTORM_MAX_IN_FLIGHT
+        self.max_in_flight = max_in_flight
+        # sequential, concurrent or batched, defaults to STARBURSTING_ANSWER_MODE
+        self.starbursting_answer_mode = starbursting_answer_mode
+        self.engine = engine or DEFAULT_BRAINSTORM_ENGINE
+        if self.engine not in BRAINSTORM_ENGINES:
+            raise ValueError(f"Unknown brainstorming engine '{self.engine}', expected one of {BRAINSTORM_ENGINES}")
+
+        self.model = create_model(api_key, model_id="anthropic/claude-3-5-sonnet-latest")
         self.agent = CodeAgent(
             tools=[],
-            model = LiteLLMModel(model_id="anthropic/claude-3-5-sonnet-latest", api_key=api_key),
+            model = self.model,
             add_base_tools=False,
         )
+        self.completion = CompletionEngine(self.model)
+        # Every brainstorming prompt is a single text-in/text-out call, so the direct engine is the default
+        self.runner = self.completion if self.engine == "completion" else self.agent
+
+    def usage(self) -> Dict[str, float]:
+        """Model calls, tokens and latency spent by this agent so far."""
+        return self.model.usage()
 
     def generate_ideas(self, mode: str, query: str) -> str:
         # Define the type for the modes dictionary more precisely
         modes: Dict[str, Dict[str, Callable[[str], str] | str]] = {
             "Starbursting": {
-                "function": lambda query: sb(query, self.agent),
+                "function": lambda query: sb(query, self.runner, self.max_in_flight, self.starbursting_answer_mode),
                 "description": "Focuses on generating questions rather than answers using the 5 W's and 1 H (Who, What, Where, When, Why, How). "
                                "Ideal for comprehensive topic exploration."
             },
             "Mind Mapping": {
-                "function": lambda query: bmm(query, self.agent),
+                "function": lambda query: bmm(query, self.runner, self.max_in_flight),
                 "description": "Expands an initial idea into related sub-ideas in a hierarchical structure."
             },
             "Reverse Brainstorming": {
-                "function": lambda query: rb(query, self.agent),
+                "function": lambda query: rb(query, self.runner, self.max_in_flight),
                 "description": "Identifies potential issues and challenges for a given idea."
             },
             "Role Storming": {
-                "function": lambda query: rs(query, self.agent),
+                "function": lambda query: rs(query, self.runner, self.max_in_flight),
                 "description": "Adopts various personas (Overly Positive, Overly Negative, Curious Child, Skeptical Analyst, Visionary Futurist) "
                                "to generate diverse perspectives and enrich the brainstorming process."
             },
             "SCAMPER": {
-                "function": lambda query: sc(query, self.agent),
+                "function": lambda query: sc(query, self.runner, self.max_in_flight),
                 "description": "Uses the SCAMPER method (Substitute, Combine, Adjust, Modify, Put to other uses, Eliminate, Reverse) "
                                "to systematically generate creative variations of ideas."
             },
             "Six Thinking Hats": {
-                "function": lambda query: sh(query, self.agent),
+                "function": lambda query: sh(query, self.runner, self.max_in_flight),
                 "description": "Analyzes ideas using Edward de Bono's Six Thinking Hats method (White, Red, Black, Yellow, Green, Blue) "
                                "to examine topics from multiple distinct perspectives."
             }
@@ -73,3 +94,4 @@ if __name__ == "__main__":
     mode = "SCAMPER"
     result = brainstorming_agent.generate_ideas(mode, user_query)
     print(result)
+    print(brainstorming_agent.usage())
@@ -1,6 +1,24 @@
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, TypeVar
+
 from smolagents import CodeAgent
 from smolagents import Tool
 
+# Maximum number of per-idea LLM calls issued at the same time (1 runs them sequentially)
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("BRAINSTORM_MAX_IN_FLIGHT", "5"))
+
+# How starbursting answers its questions: one call per question in order ("sequential"),
+# one call per question in parallel ("concurrent") or a single structured call ("batched")
+SB_ANSWER_MODES = ("sequential", "concurrent", "batched")
+DEFAULT_SB_ANSWER_MODE = os.getenv("STARBURSTING_ANSWER_MODE", "concurrent")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 sb_questions_prompt = """You are a clever question generator assistant that helps people in brainstorming and generating from one idea to 6 questions following the starbursting brainstorming principles: the 5 W's and 1 H (Who, What, Where, When, Why, How) to explore a topic comprehensively. The resulting questions should be diverse, detailed, developed, precise and significant. The questions must not be redundant and repetitive, be creative and unique. The question must be formatted in the form of bullet points without titles and without bold text.
 Idea to brainstorm:{idea}
@@ -11,6 +29,13 @@ Question:{question}
 Context:{idea}
 Answer:"""
 
+sb_batch_answer_prompt = """You are a clever answer assistant that helps people in answering questions related to a topic. You'll be having a numbered list of questions and you need to generate a detailed, developed, precise and significant answer to each question, according to a context given from the user. The answers should not be redundant and repetitive, be creative and unique. Each answer must be formatted in the form of a paragraph.
+Return only a JSON array with one object per question, in the same order, each object having the keys "question_number" (integer) and "answer" (string).
+Context:{idea}
+Questions:
+{questions}
+JSON array of answers:"""
+
 mm_expand_idea_prompt = """You are a clever idea expansion assistant that helps people expand one idea into 5 other related ideas. The resulting ideas should be diverse, detailed, developed, precise and significant. The ideas should not be redundant and repetitive, be creative and unique. The ideas must be formatted in the form of bullet points without titles and without bold text.
 Idea to expand:{idea}
 List of 5 bullet points ideas:"""
@@ -90,8 +115,74 @@ def _parse_bullet_points(text: str) -> list[str]:
             bullets.append(stripped[2:])
     return bullets
 
+def _parse_batched_answers(raw: Any, question_count: int) -> list[Optional[str]]:
+    """Extract per-question answers from a batched answer output, None where missing."""
+    answers: list[Optional[str]] = [None] * question_count
+    items = raw
+    if isinstance(raw, str):
+        match = re.search(r"\[.*\]", raw, re.DOTALL)
+        if not match:
+            return answers
+        try:
+            items = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return answers
+    if not isinstance(items, list):
+        return answers
+
+    for position, item in enumerate(items):
+        if isinstance(item, dict):
+            number = item.get("question_number", position + 1)
+            answer = item.get("answer")
+        else:
+            number, answer = position + 1, item
+        if isinstance(number, int) and 1 <= number <= question_count and isinstance(answer, str) and answer.strip():
+            answers[number - 1] = answer.strip()
+    return answers
+
+
+def _split_lines(text: str) -> list[str]:
+    """Split the newline-joined output of a generator tool back into items."""
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _run_in_parallel(func: Callable[[T], R], items: List[T], max_in_flight: Optional[int] = None) -> List[R]:
+    """Apply func to every item with at most max_in_flight concurrent calls, preserving order."""
+    max_in_flight = max_in_flight or DEFAULT_MAX_IN_FLIGHT
+    if max_in_flight <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(items)), thread_name_prefix="brainstorm") as executor:
+        return list(executor.map(func, items))
+
+
+class _ThreadLocalAgent:
+    """
+    Gives each worker thread its own CodeAgent sharing the original model.
+
+    A CodeAgent keeps per-run memory and executor state, so it cannot serve concurrent
+    runs. Other runners (anything with a thread-safe `run`) are used as they are.
+    """
+
+    def __init__(self, agent: CodeAgent) -> None:
+        self.agent = agent
+        self.owner = threading.get_ident()
+        self.local = threading.local()
+
+    def run(self, prompt: str):
+        if not isinstance(self.agent, CodeAgent) or threading.get_ident() == self.owner:
+            return self.agent.run(prompt)
+        if not hasattr(self.local, "agent"):
+            self.local.agent = CodeAgent(tools=[], model=self.agent.model, add_base_tools=False)
+        return self.local.agent.run(prompt)
+
+
 # wrapping up the starbursting chains
-def sb(user_query, agent: CodeAgent):
+def sb(user_query, agent: CodeAgent, max_in_flight: Optional[int] = None, answer_mode: Optional[str] = None):
+    answer_mode = answer_mode or DEFAULT_SB_ANSWER_MODE
+    if answer_mode not in SB_ANSWER_MODES:
+        raise ValueError(f"Unknown starbursting answer mode '{answer_mode}', expected one of {SB_ANSWER_MODES}")
+    # Answers below may be generated concurrently, each worker on its own agent
+    agent = _ThreadLocalAgent(agent)
     output_content = []
     output_content.append(f"# Brainstorming for: {user_query}\n")
 
@@ -118,19 +209,42 @@ def sb(user_query, agent: CodeAgent):
         def forward(self, question: str, idea: str) -> str:
             return agent.run(sb_answer_prompt.format(question=question, idea=idea))
 
+    class BatchQuestionAnswerer(Tool):
+        name = "batch_question_answerer"
+        description = "Answers a list of newline-separated questions in a single call according to a given context. Takes 'questions' and 'idea' as input and returns a JSON array of answers."
+        inputs = {"questions": {"type": "string", "description": "The questions to answer, one per line."},
+                  "idea": {"type": "string", "description": "The context idea for the answers."}}
+        output_type = "string"
+
+        def forward(self, questions: str, idea: str) -> str:
+            numbered = "\n".join(f"{i+1}. {question}" for i, question in enumerate(_split_lines(questions)))
+            answers_raw = agent.run(sb_batch_answer_prompt.format(questions=numbered, idea=idea))
+            return answers_raw if isinstance(answers_raw, str) else json.dumps(answers_raw)
+
     sb_questions_tool = StarburstingQuestionsGenerator()
     sb_answer_tool = QuestionAnswerer()
+    sb_batch_answer_tool = BatchQuestionAnswerer()
 
     questions_raw = sb_questions_tool.forward(user_query)
-    # questions = _parse_bullet_points(questions_raw) # No need to parse here, already parsed in StarburstingQuestionsGenerator
+    questions = _split_lines(questions_raw)
 
     output_content.append("#### Starbursting Questions:\n")
     output_content.append(questions_raw + "\n") # Append questions directly
 
-    for j, question in enumerate(questions_raw):
-        output_content.append(f"- **Question {j+1}:** {question}\n")
+    def answer_question(question: str) -> str:
+        return sb_answer_tool.forward(question=question, idea=user_query)
+
+    if answer_mode == "batched":
+        answers = _parse_batched_answers(sb_batch_answer_tool.forward(questions=questions_raw, idea=user_query), len(questions))
+        # Fall back to individual calls for any answer the batched output did not provide
+        missing = [j for j, answer in enumerate(answers) if answer is None]
+        for j, answer in zip(missing, _run_in_parallel(answer_question, [questions[j] for j in missing], max_in_flight)):
+            answers[j] = answer
+    else:
+        answers = _run_in_parallel(answer_question, questions, 1 if answer_mode == "sequential" else max_in_flight)
 
-        answer = sb_answer_tool.forward(question=question, idea=user_query)
+    for j, (question, answer) in enumerate(zip(questions, answers)):
+        output_content.append(f"- **Question {j+1}:** {question}\n")
         output_content.append(f"  - **Answer:** {answer}\n")
     output_content.append("\n") # Add a newline for separation between ideas
 
@@ -138,7 +252,9 @@ def sb(user_query, agent: CodeAgent):
 
 
 # Mind mapping brainstorming method
-def bmm(user_query, agent: CodeAgent):
+def bmm(user_query, agent: CodeAgent, max_in_flight: Optional[int] = None):
+    # Per-idea calls below may run concurrently, each worker on its own agent
+    agent = _ThreadLocalAgent(agent)
     output_content = []
     output_content.append(f"# Mind Mapping Brainstorming for: {user_query}\n")
 
@@ -173,17 +289,17 @@ def bmm(user_query, agent: CodeAgent):
 
     # Generate 10 initial ideas
     initial_ideas_raw = initial_idea_tool.forward(user_query)
-    initial_ideas = _parse_bullet_points(initial_ideas_raw)
+    initial_ideas = _split_lines(initial_ideas_raw)
 
     output_content.append("#### Initial Ideas:\n")
     output_content.append(initial_ideas_raw + "\n")
 
-    # Expand each initial idea
-    for i, idea in enumerate(initial_ideas):
+    # Expand each initial idea, issuing the calls concurrently
+    expanded_ideas_per_idea = _run_in_parallel(idea_expander_tool.forward, initial_ideas, max_in_flight)
+    for i, (idea, expanded_ideas_raw) in enumerate(zip(initial_ideas, expanded_ideas_per_idea)):
         output_content.append(f"- **Idea {i+1}:** {idea}\n")
         
-        expanded_ideas_raw = idea_expander_tool.forward(idea)
-        expanded_ideas = _parse_bullet_points(expanded_ideas_raw)
+        expanded_ideas = _split_lines(expanded_ideas_raw)
         
         output_content.append(f"  - **Expanded Ideas:**\n")
         for expanded_idea in expanded_ideas:
@@ -196,7 +312,9 @@ def bmm(user_query, agent: CodeAgent):
 
 
 # Reverse brainstorming method
-def rb(user_query, agent: CodeAgent):
+def rb(user_query, agent: CodeAgent, max_in_flight: Optional[int] = None):
+    # Per-idea calls below may run concurrently, each worker on its own agent
+    agent = _ThreadLocalAgent(agent)
     output_content = []
     output_content.append(f"# Reverse Brainstorming for: {user_query}\n")
 
@@ -231,17 +349,17 @@ def rb(user_query, agent: CodeAgent):
 
     # Generate 10 initial ideas
     initial_ideas_raw = initial_idea_tool.forward(user_query)
-    initial_ideas = _parse_bullet_points(initial_ideas_raw)
+    initial_ideas = _split_lines(initial_ideas_raw)
 
     output_content.append("#### Initial Ideas:\n")
     output_content.append(initial_ideas_raw + "\n")
 
-    # Identify problems for each initial idea
-    for i, idea in enumerate(initial_ideas):
+    # Identify problems for each initial idea, issuing the calls concurrently
+    problems_per_idea = _run_in_parallel(problem_identifier_tool.forward, initial_ideas, max_in_flight)
+    for i, (idea, problems_raw) in enumerate(zip(initial_ideas, problems_per_idea)):
         output_content.append(f"- **Idea {i+1}:** {idea}\n")
         
-        problems_raw = problem_identifier_tool.forward(idea)
-        problems = _parse_bullet_points(problems_raw)
+        problems = _split_lines(problems_raw)
         
         output_content.append(f"  - **Potential Problems:**\n")
         for problem in problems:
@@ -253,7 +371,9 @@ def rb(user_query, agent: CodeAgent):
 
 
 # Role storming brainstorming method
-def rs(user_query, agent: CodeAgent):
+def rs(user_query, agent: CodeAgent, max_in_flight: Optional[int] = None):
+    # Per-idea calls below may run concurrently, each worker on its own agent
+    agent = _ThreadLocalAgent(agent)
     output_content = []
     output_content.append(f"# Role Storming Brainstorming for: {user_query}\n")
 
@@ -288,17 +408,17 @@ def rs(user_query, agent: CodeAgent):
 
     # Generate 10 initial ideas
     initial_ideas_raw = initial_idea_tool.forward(user_query)
-    initial_ideas = _parse_bullet_points(initial_ideas_raw)
+    initial_ideas = _split_lines(initial_ideas_raw)
 
     output_content.append("#### Initial Ideas:\n")
     output_content.append(initial_ideas_raw + "\n")
 
-    # Generate role storming perspectives for each initial idea
-    for i, idea in enumerate(initial_ideas):
+    # Generate role storming perspectives for each initial idea, issuing the calls concurrently
+    role_ideas_per_idea = _run_in_parallel(role_storming_tool.forward, initial_ideas, max_in_flight)
+    for i, (idea, role_ideas_raw) in enumerate(zip(initial_ideas, role_ideas_per_idea)):
         output_content.append(f"- **Idea {i+1}:** {idea}\n")
         
-        role_ideas_raw = role_storming_tool.forward(idea)
-        role_ideas = _parse_bullet_points(role_ideas_raw)
+        role_ideas = _split_lines(role_ideas_raw)
         
         output_content.append(f"  - **Role Storming Perspectives:**\n")
         for role_idea in role_ideas:
@@ -310,7 +430,9 @@ def rs(user_query, agent: CodeAgent):
 
 
 # SCAMPER brainstorming method
-def sc(user_query, agent: CodeAgent):
+def sc(user_query, agent: CodeAgent, max_in_flight: Optional[int] = None):
+    # Per-idea calls below may run concurrently, each worker on its own agent
+    agent = _ThreadLocalAgent(agent)
     output_content = []
     output_content.append(f"# SCAMPER Brainstorming for: {user_query}\n")
 
@@ -345,17 +467,17 @@ def sc(user_query, agent: CodeAgent):
 
     # Generate 10 initial ideas
     initial_ideas_raw = initial_idea_tool.forward(user_query)
-    initial_ideas = _parse_bullet_points(initial_ideas_raw)
+    initial_ideas = _split_lines(initial_ideas_raw)
 
     output_content.append("#### Initial Ideas:\n")
     output_content.append(initial_ideas_raw + "\n")
 
-    # Generate SCAMPER ideas for each initial idea
-    for i, idea in enumerate(initial_ideas):
+    # Generate SCAMPER ideas for each initial idea, issuing the calls concurrently
+    scamper_ideas_per_idea = _run_in_parallel(scamper_tool.forward, initial_ideas, max_in_flight)
+    for i, (idea, scamper_ideas_raw) in enumerate(zip(initial_ideas, scamper_ideas_per_idea)):
         output_content.append(f"- **Idea {i+1}:** {idea}\n")
         
-        scamper_ideas_raw = scamper_tool.forward(idea)
-        scamper_ideas = _parse_bullet_points(scamper_ideas_raw)
+        scamper_ideas = _split_lines(scamper_ideas_raw)
         
         output_content.append(f"  - **SCAMPER Variations:**\n")
         for scamper_idea in scamper_ideas:
@@ -367,7 +489,9 @@ def sc(user_query, agent: CodeAgent):
 
 
 # Six Thinking Hats brainstorming method
-def sh(user_query, agent: CodeAgent):
+def sh(user_query, agent: CodeAgent, max_in_flight: Optional[int] = None):
+    # Per-idea calls below may run concurrently, each worker on its own agent
+    agent = _ThreadLocalAgent(agent)
     output_content = []
     output_content.append(f"# Six Thinking Hats Brainstorming for: {user_query}\n")
 
@@ -402,17 +526,17 @@ def sh(user_query, agent: CodeAgent):
 
     # Generate 10 initial ideas
     initial_ideas_raw = initial_idea_tool.forward(user_query)
-    initial_ideas = _parse_bullet_points(initial_ideas_raw)
+    initial_ideas = _split_lines(initial_ideas_raw)
 
     output_content.append("#### Initial Ideas:\n")
     output_content.append(initial_ideas_raw + "\n")
 
-    # Generate Six Thinking Hats perspectives for each initial idea
-    for i, idea in enumerate(initial_ideas):
+    # Generate Six Thinking Hats perspectives for each initial idea, issuing the calls concurrently
+    six_hats_per_idea = _run_in_parallel(six_hats_tool.forward, initial_ideas, max_in_flight)
+    for i, (idea, six_hats_raw) in enumerate(zip(initial_ideas, six_hats_per_idea)):
         output_content.append(f"- **Idea {i+1}:** {idea}\n")
         
-        six_hats_raw = six_hats_tool.forward(idea)
-        six_hats = _parse_bullet_points(six_hats_raw)
+        six_hats = _split_lines(six_hats_raw)
         
         output_content.append(f"  - **Six Thinking Hats Perspectives:**\n")
         for perspective in six_hats:
@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Any, Dict
+
+from smolagents.models import ChatMessage, LiteLLMModel, MessageRole
+
+
+class TrackedLiteLLMModel(LiteLLMModel):
+    """LiteLLMModel that counts calls, token usage and latency, safe to share between threads."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.usage_lock = threading.Lock()
+        self.reset_usage()
+
+    def generate(self, *args: Any, **kwargs: Any) -> ChatMessage:
+        start = time.perf_counter()
+        message = super().generate(*args, **kwargs)
+        self._record_usage(message, time.perf_counter() - start)
+        return message
+
+    def usage(self) -> Dict[str, float]:
+        """Return the number of calls, tokens and seconds spent in the model so far."""
+        with self.usage_lock:
+            return {
+                "calls": self.calls,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "latency_s": self.latency_s,
+            }
+
+    def reset_usage(self) -> None:
+        with self.usage_lock:
+            self.calls = 0
+            self.input_tokens = 0
+            self.output_tokens = 0
+            self.latency_s = 0.0
+
+    def _record_usage(self, message: ChatMessage, latency_s: float) -> None:
+        with self.usage_lock:
+            self.calls += 1
+            self.latency_s += latency_s
+            if message.token_usage is not None:
+                self.input_tokens += message.token_usage.input_tokens
+                self.output_tokens += message.token_usage.output_tokens
+
+
+class CompletionEngine:
+    """
+    Sends a prompt to the model as a single chat completion and returns the text.
+
+    Exposes the same `run(prompt)` entry point as an agent, so it can replace a CodeAgent
+    wherever a prompt is a plain text-in/text-out call with no tools or code execution.
+    The model call is stateless, so one engine can serve concurrent runs.
+    """
+
+    def __init__(self, model: LiteLLMModel) -> None:
+        self.model = model
+
+    def run(self, prompt: str) -> str:
+        message = self.model.generate(
+            [ChatMessage(role=MessageRole.USER, content=[{"type": "text", "text": prompt}])]
+        )
+        content = message.content
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        return content or ""
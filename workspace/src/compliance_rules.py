@@ -0,0 +1,91 @@
+import json
+import os
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.keyword_matcher import KeywordMatcher
+
+# Declarative sector rules used by analyze_legal_compliance
+LEGAL_COMPLIANCE_RULES_PATH = os.getenv(
+    "LEGAL_COMPLIANCE_RULES_PATH",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'compliance_rules.json'),
+)
+
+# Sections of a compliance analysis that sectors contribute to, in display order
+SECTOR_SECTIONS = ("regulatory_obligations", "licenses_required")
+COMMON_SECTIONS = ("data_protection", "employment_law", "intellectual_property", "legal_risks", "compliance_recommendations")
+
+
+def _render(items: List[str]) -> str:
+    return "".join(f"\n• {item}" for item in items)
+
+
+class ComplianceRules:
+    """
+    Sector compliance rules loaded from a declarative table.
+
+    The keywords of every sector are compiled into one KeywordMatcher, so an activity
+    description is scanned once however many sectors there are, and every sector it
+    mentions applies. Sections are rendered once per combination of matched sectors and
+    company type, then served from a cache.
+    """
+
+    def __init__(self, table: Dict[str, Any], cache_size: int = 1024) -> None:
+        self.sectors = {sector["id"]: sector for sector in table["sectors"]}
+        self.default = table["default"]
+        self.common = table["common"]
+        self.tax_obligations = table["tax_obligations"]
+        categories: Dict[str, List[str]] = {}
+        for sector_id, sector in self.sectors.items():
+            categories[sector_id] = sector.get("keywords", [])
+            # Short keywords ("ia") only count as whole words
+            categories[f"{sector_id}:words"] = sector.get("words", [])
+        self._matcher = KeywordMatcher(categories, whole_word_categories=[f"{sector_id}:words" for sector_id in self.sectors])
+        self.sections = lru_cache(maxsize=cache_size)(self._sections)
+
+    @classmethod
+    def from_file(cls, path: str = LEGAL_COMPLIANCE_RULES_PATH) -> "ComplianceRules":
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle))
+
+    def match(self, business_activity: str) -> Tuple[str, ...]:
+        """Ids of the sectors a business activity belongs to, in table order."""
+        counts = self._matcher.counts(business_activity)
+        return tuple(sector_id for sector_id in self.sectors if counts[sector_id] or counts[f"{sector_id}:words"])
+
+    def analyze(self, business_activity: str, company_type: str) -> Dict[str, str]:
+        """Rendered compliance sections for a business activity and company type."""
+        tax_key = company_type.upper() if company_type.upper() in self.tax_obligations else "default"
+        # Copied so callers cannot alter the cached rendering
+        return dict(self.sections(self.match(business_activity), tax_key))
+
+    def _sections(self, sector_ids: Tuple[str, ...], tax_key: str) -> Dict[str, str]:
+        sectors = [self.sectors[sector_id] for sector_id in sector_ids] or [self.default]
+        sections = {}
+        for section in SECTOR_SECTIONS:
+            # Obligations shared by several matched sectors are listed once
+            items = dict.fromkeys(item for sector in sectors for item in sector.get(section, []))
+            sections[section] = _render(list(items))
+        for section in COMMON_SECTIONS:
+            sections[section] = _render(self.common[section])
+        sections["tax_obligations"] = _render(self.tax_obligations[tax_key])
+        sections["sectors"] = ", ".join(sector["label"] for sector in sectors)
+        return sections
+
+
+_compliance_rules: Optional[ComplianceRules] = None
+_compliance_rules_lock = threading.Lock()
+
+
+def get_compliance_rules() -> ComplianceRules:
+    """Return the process-wide compliance rules loaded from LEGAL_COMPLIANCE_RULES_PATH."""
+    global _compliance_rules
+    with _compliance_rules_lock:
+        if _compliance_rules is None:
+            _compliance_rules = ComplianceRules.from_file(LEGAL_COMPLIANCE_RULES_PATH)
+        return _compliance_rules
@@ -1,5 +1,6 @@
 import sys
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,35 +9,63 @@ ANTHROPIC_API_KEY =os.getenv("ANTHROPIC_API_KEY")
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from smolagents import CodeAgent
-from smolagents.models import LiteLLMModel
+from workspace.src.llm_cache import create_model
+from workspace.src.portfolio_analysis import analyze_portfolio, format_portfolio_report
+from workspace.src.startup_kpi_tools import STARTUP_KPI_TOOLS
+from workspace.src.startup_metrics import SUPPORTED_EXTENSIONS, read_metrics, summarize_metrics
 
 class VCDataAnalystAgent:
     def __init__(self, api_key):
         self.agent = CodeAgent(
-            tools=[],
-            model=LiteLLMModel(model="anthropic/claude-sonnet-4", api_key=api_key),
+            tools=STARTUP_KPI_TOOLS,
+            model=create_model(api_key, model_id="anthropic/claude-sonnet-4"),
             add_base_tools=True,
         )
+        self._owner = threading.get_ident()
+        self._local = threading.local()
 
     def extract_text(self, file_path):
-      if file_path.endswith(".txt"):
-          try:
-              with open(file_path, "r", encoding="utf-8") as f:
-                  content = f.read()
-              return content, None  # ici on renvoie deux valeurs
-          except Exception as e:
-              return None, f"Erreur lors de la lecture du fichier texte : {e}"
-      else:
-          return None, "Seuls les fichiers .txt sont pris en charge."
-
+        """
+        Parse a metrics export (CSV, JSON, XLSX or TXT) and return the compact summary of
+        the KPIs computed from it, so the model reasons on figures rather than raw rows.
+        """
+        if not file_path.lower().endswith(SUPPORTED_EXTENSIONS):
+            return None, f"Formats pris en charge : {', '.join(SUPPORTED_EXTENSIONS)}"
+        try:
+            return summarize_metrics(read_metrics(file_path)), None
+        except ImportError as e:
+            return None, f"Dépendance manquante pour lire ce fichier : {e}"
+        except Exception as e:
+            return None, f"Erreur lors de la lecture du fichier : {e}"
 
     def analyze(self, file_path):
         content, error = self.extract_text(file_path)
         if error:
             return error
-
+        return self.agent.run(self._prompt(content))
+
+    def analyze_portfolio(self, source, output_dir=None):
+        """
+        Analyze every metrics file of a directory or glob pattern and return the ranked
+        portfolio report; per-startup results and the report are saved under `output_dir`.
+        """
+        try:
+            ranked = analyze_portfolio(source, commentary=self._comment, output_dir=output_dir)
+        except ValueError as e:
+            return str(e)
+        return format_portfolio_report(ranked)
+
+    def _comment(self, summary):
+        # Commentary calls run concurrently and a CodeAgent serves one run at a time
+        if threading.get_ident() == self._owner:
+            return self.agent.run(self._prompt(summary))
+        if not hasattr(self._local, "agent"):
+            self._local.agent = CodeAgent(tools=STARTUP_KPI_TOOLS, model=self.agent.model, add_base_tools=True)
+        return self._local.agent.run(self._prompt(summary))
+
+    def _prompt(self, content):
         # Prompt spécialisé VC due diligence
-        prompt = f"""
+        return f"""
 You are a Data Analyst Agent specializing in venture capital due diligence. Your job is to evaluate startup performance using key metrics, focusing especially on growth rate and churn. When provided with a startup's metrics, analyze them critically from a VC’s perspective: Is growth healthy and sustainable? Is churn under control? What do these numbers indicate about product-market fit and future potential?
 
 If exact growth or churn figures are missing, intelligently estimate or extrapolate using relevant industry benchmarks, public data, or typical values for similar companies at this stage. Clearly state when you are using estimates and cite the source or reasoning behind your extrapolation.
@@ -49,13 +78,13 @@ For each analysis, briefly explain:
 
 Always be quantitative, objective, and clear. Prioritize actionable insights that a venture capitalist would care about in a due diligence process.
 
+The metrics below were computed from the startup's data export; rely on them rather than recomputing them, and treat KPIs listed as not computable as missing data. When you need another figure (e.g. growth over a different window, a rolling average, unit economics under other assumptions), compute it with the KPI tools instead of doing the arithmetic yourself.
+
 Here is the startup data to analyze:
 
 \"\"\"{content}\"\"\"
 """
 
-        return self.agent.run(prompt)
-
 
 if __name__ == "__main__":
     # Exemple d'utilisation
@@ -1,9 +1,42 @@
 from smolagents import tool
-import requests
 import re
+import sys
+import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.keyword_matcher import KeywordMatcher
+from workspace.src.novelty_index import get_novelty_index
+from workspace.src.paper_index import get_paper_index
+
+# Common AI/ML terms that indicate technical focus
+KEY_TERMS = [
+    'transformer', 'attention', 'bert', 'gpt', 'llm', 'neural', 'deep', 'learning', 'ai', 'ml',
+    'multimodal', 'vision', 'nlp', 'computer vision', 'reinforcement',
+    'diffusion', 'gan', 'vae', 'autoencoder', 'embedding',
+    'fine-tuning', 'pre-training', 'zero-shot', 'few-shot',
+    'optimization', 'efficiency', 'scaling', 'performance'
+]
+
+# Indicator keywords counted by the innovation assessments, matched anywhere in the text
+PAPER_INDICATORS = {
+    'breakthrough': ['novel', 'new', 'first', 'breakthrough', 'revolutionary', 'unprecedented'],
+    'improvement': ['improved', 'better', 'enhanced', 'optimized', 'efficient', 'faster'],
+    'sota': ['state-of-the-art', 'sota', 'outperform', 'surpass', 'best'],
+    'significant': ['state-of-the-art', 'outperform', 'surpass', 'significant', 'major'],
+    'incremental': ['improved', 'enhanced', 'optimized', 'better', 'efficient'],
+    'survey': ['survey', 'review', 'overview', 'comprehensive'],
+    'novelty': ['architecture', 'algorithm', 'method', 'approach', 'framework', 'model'],
+    'application': ['application', 'real-world', 'practical', 'deployment', 'industry', 'commercial'],
+    'performance': ['performance', 'accuracy', 'efficiency', 'speed', 'cost', 'resource']
+}
+
+# Compiled once; each text is then scanned in a single pass for key terms and indicators
+_PAPER_MATCHER = KeywordMatcher({'key_terms': KEY_TERMS, **PAPER_INDICATORS}, whole_word_categories=['key_terms'])
+
 @tool
 def search_papers(query: str, limit: int = 10) -> str:
     """
@@ -15,30 +48,20 @@ def search_papers(query: str, limit: int = 10) -> str:
         limit: Maximum number of papers to return (default: 10)
     """
     try:
-        # Note: HF Papers API requires authentication, providing simulated response for demo
+        # Ranked with BM25 over a local paper metadata dump, no network call involved
+        paper_index = get_paper_index()
+        if paper_index is None:
+            return "Paper search is unavailable: set HF_PAPERS_DUMP_PATH to a paper metadata dump (JSON lines)."
+        
+        results = paper_index.search(query, limit)
+        if not results:
+            return f"No papers found for: \"{query}\""
+        
+        formatted_results = [_format_paper_info(paper) for paper, _ in results]
         return f"""
-PAPERS SEARCH RESULTS FOR: "{query}"
+PAPERS SEARCH RESULTS FOR: "{query}" ({len(results)} of {len(paper_index):,} indexed papers)
 {'='*80}
-
-📄 PAPER: Attention Is All You Need (Transformer Architecture)
-👥 Authors: Vaswani, A., Shazeer, N., Parmar, N., et al.
-📅 Published: 2017-06-12 | ⏰ Recency: 📚 Older Research
-🆔 ArXiv: 1706.03762
-🔑 Key Terms: transformer, attention, neural, deep, learning
-💡 Innovation Level: 🚀 Breakthrough Innovation
-📝 Summary: The dominant sequence transduction models are based on complex recurrent or convolutional neural networks...
-
-📄 PAPER: BERT: Pre-training of Deep Bidirectional Transformers
-👥 Authors: Devlin, J., Chang, M., Lee, K., Toutanova, K.
-📅 Published: 2018-10-11 | ⏰ Recency: 📚 Older Research
-🆔 ArXiv: 1810.04805
-🔑 Key Terms: bert, transformer, pre-training, bidirectional
-💡 Innovation Level: ⭐ Significant Advancement
-📝 Summary: We introduce BERT, which stands for Bidirectional Encoder Representations from Transformers...
-
-Note: HF Papers API requires authentication. This is a simulated response for demonstration.
-For production use, please configure HF API token.
-        """
+""" + "".join(formatted_results)
     
     except Exception as e:
         return f"Error occurred while searching papers: {str(e)}"
@@ -55,17 +78,26 @@ def analyze_paper_novelty(paper_title: str, paper_abstract: str = "") -> str:
         paper_abstract: Optional abstract text for additional context (default: "")
     """
     try:
-        # Simulate paper data for analysis since HF Papers API requires auth
-        target_paper = {
-            'title': paper_title,
-            'publishedAt': '2024-01-15T00:00:00.000Z',
-            'authors': ['Research Team'],
-            'arxiv_id': 'simulated-id',
-            'summary': paper_abstract or "Analysis based on provided title and abstract."
-        }
+        # Use the indexed metadata when the paper is in the local dump
+        paper_index = get_paper_index()
+        indexed_paper = paper_index.find_by_title(paper_title) if paper_index is not None else None
+        if indexed_paper is not None:
+            target_paper = dict(indexed_paper)
+            if paper_abstract:
+                target_paper['summary'] = paper_abstract
+        else:
+            target_paper = {
+                'title': paper_title,
+                'publishedAt': 'N/A',
+                'authors': [],
+                'arxiv_id': 'N/A',
+                # Only real text: a placeholder would be embedded and skew the prior-work similarity
+                'summary': paper_abstract
+            }
         
         # Analyze the paper
         analysis = _analyze_paper_innovation(target_paper, paper_abstract)
+        prior_work = _assess_prior_work(target_paper)
         
         return f"""
 NOVELTY ANALYSIS FOR: {target_paper.get('title', 'Unknown Title')}
@@ -82,6 +114,9 @@ NOVELTY ANALYSIS FOR: {target_paper.get('title', 'Unknown Title')}
 💡 TECHNICAL NOVELTY:
 {analysis['technical_novelty']}
 
+🧭 NEAREST PRIOR WORK:
+{prior_work}
+
 📈 MARKET IMPACT POTENTIAL:
 {analysis['market_impact']}
 
@@ -107,11 +142,13 @@ def _format_paper_info(paper: Dict[str, Any]) -> str:
     # Calculate recency score
     recency_score = _calculate_recency_score(published_at)
     
-    # Extract key technical terms
-    key_terms = _extract_key_terms(title + " " + summary)
+    # Extract key technical terms and innovation indicators in one pass
+    matches = _PAPER_MATCHER.find(title + " " + summary)
+    key_terms = matches['key_terms'][:10]
     
     # Assess innovation indicators
-    innovation_indicators = _assess_innovation_indicators(title, summary)
+    counts = {category: len(keywords) for category, keywords in matches.items()}
+    innovation_indicators = _assess_innovation_indicators(title, summary, counts)
     
     return f"""
 📄 PAPER: {title}
@@ -151,41 +188,21 @@ def _calculate_recency_score(published_at: str) -> str:
 
 def _extract_key_terms(text: str) -> List[str]:
     """Extract key technical terms from paper title and summary."""
-    # Common AI/ML terms that indicate technical focus
-    key_patterns = [
-        r'\b(?:transformer|attention|bert|gpt|llm|neural|deep|learning|ai|ml)\b',
-        r'\b(?:multimodal|vision|nlp|computer vision|reinforcement)\b',
-        r'\b(?:diffusion|gan|vae|autoencoder|embedding)\b',
-        r'\b(?:fine-tuning|pre-training|zero-shot|few-shot)\b',
-        r'\b(?:optimization|efficiency|scaling|performance)\b'
-    ]
-    
-    terms = []
-    text_lower = text.lower()
-    
-    for pattern in key_patterns:
-        matches = re.findall(pattern, text_lower)
-        terms.extend(matches)
-    
-    # Remove duplicates and return most relevant terms
-    return list(set(terms))[:10]
+    # Distinct terms in order of first appearance
+    return _PAPER_MATCHER.find(text)['key_terms'][:10]
+
+
+def _indicator_counts(text: str) -> Dict[str, int]:
+    """Count the distinct key terms and indicator keywords of each PAPER_INDICATORS category in a text."""
+    return _PAPER_MATCHER.counts(text)
 
 
-def _assess_innovation_indicators(title: str, summary: str) -> str:
+def _assess_innovation_indicators(title: str, summary: str, counts: Optional[Dict[str, int]] = None) -> str:
     """Assess innovation level based on title and summary content."""
-    text = (title + " " + summary).lower()
-    
-    # Breakthrough indicators
-    breakthrough_terms = ['novel', 'new', 'first', 'breakthrough', 'revolutionary', 'unprecedented']
-    breakthrough_count = sum(1 for term in breakthrough_terms if term in text)
-    
-    # Improvement indicators
-    improvement_terms = ['improved', 'better', 'enhanced', 'optimized', 'efficient', 'faster']
-    improvement_count = sum(1 for term in improvement_terms if term in text)
-    
-    # State-of-the-art indicators
-    sota_terms = ['state-of-the-art', 'sota', 'outperform', 'surpass', 'best']
-    sota_count = sum(1 for term in sota_terms if term in text)
+    counts = counts or _indicator_counts(title + " " + summary)
+    breakthrough_count = counts['breakthrough']
+    improvement_count = counts['improvement']
+    sota_count = counts['sota']
     
     if breakthrough_count >= 2:
         return "🚀 Breakthrough Innovation"
@@ -197,41 +214,31 @@ def _assess_innovation_indicators(title: str, summary: str) -> str:
         return "🔍 Exploratory Research"
 
 
-def _calculate_title_similarity(title1: str, title2: str) -> float:
-    """Calculate similarity between two titles (simple word overlap)."""
-    words1 = set(title1.lower().split())
-    words2 = set(title2.lower().split())
-    
-    if not words1 or not words2:
-        return 0.0
-    
-    intersection = words1.intersection(words2)
-    union = words1.union(words2)
-    
-    return len(intersection) / len(union)
+def _assess_prior_work(paper: Dict[str, Any], k: int = 5) -> str:
+    """Score novelty by distance to the nearest indexed papers and list them."""
+    novelty_index = get_novelty_index()
+    if novelty_index is None:
+        return "• Not available - no paper dump configured (HF_PAPERS_DUMP_PATH)"
+    
+    exclude_id = paper.get('arxiv_id') if paper.get('arxiv_id') != 'N/A' else None
+    result = novelty_index.score(paper.get('title', ''), paper.get('summary', ''), k=k, exclude_id=exclude_id)
+    lines = [f"• Novelty Score: {result['score']:.2f} - {result['label']}"]
+    for neighbor, similarity in result['neighbors']:
+        lines.append(f"• {similarity:.2f} similar: {neighbor['title']} ({neighbor['arxiv_id']}, {neighbor['publishedAt'][:10]})")
+    return '\n'.join(lines)
 
 
-def _analyze_paper_innovation(paper: Dict[str, Any], abstract: str = "") -> Dict[str, str]:
+def _analyze_paper_innovation(paper: Dict[str, Any], abstract: str = "", counts: Optional[Dict[str, int]] = None) -> Dict[str, str]:
     """Analyze paper for innovation level and investment implications."""
     title = paper.get('title', '')
     summary = paper.get('summary', abstract)
     published_at = paper.get('publishedAt', '')
     authors = paper.get('authors', [])
     
-    text_content = f"{title} {summary}".lower()
+    counts = counts or _indicator_counts(f"{title} {summary}")
     
     # Innovation Level Assessment
-    innovation_keywords = {
-        'breakthrough': ['novel', 'first', 'new', 'breakthrough', 'revolutionary', 'unprecedented'],
-        'significant': ['state-of-the-art', 'outperform', 'surpass', 'significant', 'major'],
-        'incremental': ['improved', 'enhanced', 'optimized', 'better', 'efficient'],
-        'survey': ['survey', 'review', 'overview', 'comprehensive']
-    }
-    
-    innovation_scores = {}
-    for category, keywords in innovation_keywords.items():
-        score = sum(1 for keyword in keywords if keyword in text_content)
-        innovation_scores[category] = score
+    innovation_scores = {category: counts[category] for category in ['breakthrough', 'significant', 'incremental', 'survey']}
     
     max_category = max(innovation_scores, key=innovation_scores.get)
     max_score = innovation_scores[max_category]
@@ -248,9 +255,7 @@ def _analyze_paper_innovation(paper: Dict[str, Any], abstract: str = "") -> Dict
         innovation_level = "🔍 EXPLORATORY - Early-stage research"
     
     # Technical Novelty Assessment
-    technical_terms = _extract_key_terms(text_content)
-    novelty_indicators = ['architecture', 'algorithm', 'method', 'approach', 'framework', 'model']
-    novelty_count = sum(1 for term in novelty_indicators if term in text_content)
+    novelty_count = counts['novelty']
     
     if novelty_count >= 3:
         technical_novelty = "🔬 High technical novelty - New methodological contributions"
@@ -260,8 +265,7 @@ def _analyze_paper_innovation(paper: Dict[str, Any], abstract: str = "") -> Dict
         technical_novelty = "📊 Limited novelty - Primarily empirical or application-focused"
     
     # Market Impact Assessment
-    application_terms = ['application', 'real-world', 'practical', 'deployment', 'industry', 'commercial']
-    application_count = sum(1 for term in application_terms if term in text_content)
+    application_count = counts['application']
     
     if application_count >= 2:
         market_impact = "💼 High commercial potential - Clear practical applications"
@@ -271,8 +275,7 @@ def _analyze_paper_innovation(paper: Dict[str, Any], abstract: str = "") -> Dict
         market_impact = "🔬 Academic focus - Limited immediate commercial impact"
     
     # Competitive Advantage
-    performance_terms = ['performance', 'accuracy', 'efficiency', 'speed', 'cost', 'resource']
-    performance_count = sum(1 for term in performance_terms if term in text_content)
+    performance_count = counts['performance']
     
     if performance_count >= 3:
         competitive_advantage = "🏆 Strong advantage - Multiple performance improvements"
@@ -298,3 +301,14 @@ def _analyze_paper_innovation(paper: Dict[str, Any], abstract: str = "") -> Dict
         'competitive_advantage': competitive_advantage,
         'investment_implications': investment_implications
     }
+
+
+def analyze_papers_innovation(papers: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Run _analyze_paper_innovation over a batch of papers, counting indicators for all of them in one pass each."""
+    texts = [f"{paper.get('title', '')} {paper.get('summary', '')}" for paper in papers]
+    matrix = _PAPER_MATCHER.count_matrix(texts)
+    categories = _PAPER_MATCHER.categories
+    return [
+        _analyze_paper_innovation(paper, counts=dict(zip(categories, row.tolist())))
+        for paper, row in zip(papers, matrix)
+    ]
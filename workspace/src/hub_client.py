@@ -0,0 +1,181 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Hub endpoint, overridable to point the tools at a mirror or a local stand-in server
+HUGGINGFACE_API_URL = os.getenv("HF_API_URL", "https://huggingface.co/api")
+HF_TOKEN = os.getenv("HF_TOKEN")
+
+# Connect and read timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 20.0)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Never wait longer than this for a rate limit to reset
+MAX_RATE_LIMIT_WAIT_SECONDS = 60.0
+
+
+# Reset values later than this long ago are epoch timestamps, not delays
+_EPOCH_MARGIN_SECONDS = 365 * 24 * 3600.0
+
+
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    """
+    Read the delay requested by a Retry-After or RateLimit-Reset header, or None when there
+    is none. Shared by the HTTP clients of the other APIs.
+    """
+    for name in ("Retry-After", "RateLimit-Reset", "X-RateLimit-Reset"):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            continue
+        now = time.time()
+        # Many servers send X-RateLimit-Reset as the epoch time the window resets at
+        if seconds > now - _EPOCH_MARGIN_SECONDS:
+            seconds -= now
+        return min(max(seconds, 0.0), MAX_RATE_LIMIT_WAIT_SECONDS)
+    return None
+
+
+class HubClient:
+    """
+    Shared HTTP client for the Hugging Face Hub API.
+
+    Keeps connections alive in a pool, applies timeouts, retries idempotent requests on
+    connection errors and 429/5xx answers with exponential backoff, and honours
+    Retry-After. When the Hub still answers 429 after the retries, later requests from
+    every thread wait for the rate limit window to pass before going out.
+    """
+
+    def __init__(
+        self,
+        base_url: str = HUGGINGFACE_API_URL,
+        token: Optional[str] = HF_TOKEN,
+        timeout: Any = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_maxsize: int = 20,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._rate_limit_lock = threading.Lock()
+        self._blocked_until = 0.0
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """GET a path relative to the API root, e.g. "/models"."""
+        self._wait_for_rate_limit()
+        response = self.session.get(f"{self.base_url}{path}", params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 429:
+            retry_after = retry_after_seconds(response.headers)
+            # An explicit "Retry-After: 0" means no wait; only a missing header falls back to 1s
+            self._block_for(1.0 if retry_after is None else retry_after)
+        return response
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _wait_for_rate_limit(self) -> None:
+        with self._rate_limit_lock:
+            delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _block_for(self, seconds: float) -> None:
+        with self._rate_limit_lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class AsyncHubClient:
+    """Asynchronous counterpart of HubClient, built on a pooled httpx.AsyncClient."""
+
+    def __init__(
+        self,
+        base_url: str = HUGGINGFACE_API_URL,
+        token: Optional[str] = HF_TOKEN,
+        timeout: Any = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_connections: int = 20,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        self.client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {token}"} if token else None,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._blocked_until = 0.0
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET a path relative to the API root, retrying like HubClient does."""
+        attempt = 0
+        while True:
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                response = await self.client.get(f"{self.base_url}{path}", params=params, headers=headers)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+
+            # Out of retries, the last answer is returned (a connection error was raised above)
+            if response is not None and (response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries):
+                return response
+
+            wait = self.backoff_factor * (2 ** attempt)
+            if response is not None:
+                retry_after = retry_after_seconds(response.headers)
+                if retry_after is not None:
+                    wait = retry_after
+                if response.status_code == 429:
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + wait)
+            attempt += 1
+            await asyncio.sleep(wait)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+_hub_client: Optional[HubClient] = None
+_hub_client_lock = threading.Lock()
+
+
+def get_hub_client() -> HubClient:
+    """Return the process-wide Hub client used by every Hub-facing tool."""
+    global _hub_client
+    with _hub_client_lock:
+        if _hub_client is None:
+            _hub_client = HubClient()
+        return _hub_client
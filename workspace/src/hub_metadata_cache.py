@@ -0,0 +1,183 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.hub_client import HubClient, get_hub_client
+
+HF_METADATA_CACHE_PATH = os.getenv(
+    "HF_METADATA_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), '..', '..', '.cache', 'hub_models.sqlite'),
+)
+HF_METADATA_TTL_SECONDS = float(os.getenv("HF_METADATA_TTL", "3600"))
+
+# Fields of a Hub model record used by the technical tools
+MODEL_FIELDS = ("id", "downloads", "likes", "tags", "pipeline_tag", "library_name", "createdAt", "lastModified", "description")
+
+
+def _compact_record(model: Dict[str, Any]) -> Dict[str, Any]:
+    record = {field: model[field] for field in MODEL_FIELDS if field in model}
+    record.setdefault("id", model.get("modelId"))
+    return record
+
+
+class ModelMetadataCache:
+    """
+    Local cache of Hugging Face model records and search listings.
+
+    Records are kept in memory and persisted to SQLite. Within `ttl_seconds` they are
+    served without any network call; after that they are revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged model costs a 304 instead of a full download. When
+    the Hub cannot be reached, the last known record is served instead of an error.
+    """
+
+    def __init__(self, path: str = HF_METADATA_CACHE_PATH, ttl_seconds: float = HF_METADATA_TTL_SECONDS, client: Optional[HubClient] = None) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._client = client
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._searches: Dict[str, Dict[str, Any]] = {}
+        self._stats = {"fresh_hits": 0, "revalidated": 0, "fetched": 0, "offline_hits": 0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS models (id TEXT PRIMARY KEY, entry TEXT NOT NULL)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS searches (key TEXT PRIMARY KEY, entry TEXT NOT NULL)")
+        for model_id, entry in self._connection.execute("SELECT id, entry FROM models"):
+            self._models[model_id] = json.loads(entry)
+        for key, entry in self._connection.execute("SELECT key, entry FROM searches"):
+            self._searches[key] = json.loads(entry)
+
+    @property
+    def client(self) -> HubClient:
+        return self._client or get_hub_client()
+
+    def get_model(self, model_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Return (record, None) for a model, or (None, error message) if it cannot be obtained."""
+        with self._lock:
+            entry = self._models.get(model_id)
+        if entry is not None and not entry["partial"] and time.time() - entry["fetched_at"] < self.ttl_seconds:
+            self._count("fresh_hits")
+            return entry["record"], None
+
+        headers = {}
+        if entry is not None and not entry["partial"]:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = self.client.get(f"/models/{model_id}", headers=headers or None)
+        except Exception as e:
+            if entry is not None:
+                self._count("offline_hits")
+                return entry["record"], None
+            return None, str(e)
+
+        if response.status_code == 304 and entry is not None:
+            self._count("revalidated")
+            entry = {**entry, "fetched_at": time.time()}
+            self._store_model(model_id, entry)
+            return entry["record"], None
+        if response.status_code != 200:
+            if entry is not None and response.status_code >= 500:
+                self._count("offline_hits")
+                return entry["record"], None
+            return None, response.text
+
+        self._count("fetched")
+        record = _compact_record(response.json())
+        self._store_model(model_id, {
+            "record": record,
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "partial": False,
+        })
+        return record, None
+
+    def search_models(self, query: str, limit: int) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """Return (records, None) for a models search sorted by downloads, or (None, error message)."""
+        key = json.dumps([query.lower(), limit])
+        with self._lock:
+            search = self._searches.get(key)
+        if search is not None and time.time() - search["fetched_at"] < self.ttl_seconds:
+            self._count("fresh_hits")
+            return self._records_for(search["ids"]), None
+
+        try:
+            response = self.client.get(
+                "/models",
+                params={"search": query, "limit": limit, "sort": "downloads", "direction": -1, "full": "true"},
+            )
+        except Exception as e:
+            if search is not None:
+                self._count("offline_hits")
+                return self._records_for(search["ids"]), None
+            return None, str(e)
+        if response.status_code != 200:
+            if search is not None and response.status_code >= 500:
+                self._count("offline_hits")
+                return self._records_for(search["ids"]), None
+            return None, response.text
+
+        self._count("fetched")
+        records = [_compact_record(model) for model in response.json()]
+        self.store_listing(records)
+        search = {"ids": [record["id"] for record in records], "fetched_at": time.time()}
+        with self._lock:
+            self._searches[key] = search
+            self._connection.execute(
+                "INSERT OR REPLACE INTO searches (key, entry) VALUES (?, ?)", (key, json.dumps(search))
+            )
+        return records, None
+
+    def store_listing(self, records: List[Dict[str, Any]]) -> None:
+        """Remember records from a listing; a later get_model still fetches the full record."""
+        now = time.time()
+        for record in records:
+            with self._lock:
+                existing = self._models.get(record["id"])
+            if existing is not None and not existing["partial"]:
+                continue
+            self._store_model(record["id"], {"record": record, "fetched_at": now, "partial": True})
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "models": len(self._models), "searches": len(self._searches)}
+
+    def _records_for(self, model_ids: List[str]) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._models[model_id]["record"] for model_id in model_ids if model_id in self._models]
+
+    def _store_model(self, model_id: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._models[model_id] = entry
+            self._connection.execute(
+                "INSERT OR REPLACE INTO models (id, entry) VALUES (?, ?)", (model_id, json.dumps(entry))
+            )
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+_metadata_cache: Optional[ModelMetadataCache] = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_model_metadata_cache() -> ModelMetadataCache:
+    """Return the process-wide model metadata cache, opening it on first use."""
+    global _metadata_cache
+    with _metadata_cache_lock:
+        if _metadata_cache is None:
+            _metadata_cache = ModelMetadataCache()
+        return _metadata_cache
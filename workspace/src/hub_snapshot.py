@@ -0,0 +1,213 @@
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.hub_client import HubClient, get_hub_client
+from workspace.src.hub_metadata_cache import _compact_record
+from workspace.src.model_scoring import rank_frame, score_frame
+
+# search_models answers from this snapshot while it exists and is recent enough
+HF_MODELS_SNAPSHOT_PATH = os.getenv(
+    "HF_MODELS_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(__file__), '..', '..', '.cache', 'hub_models.parquet'),
+)
+# Older snapshots are ignored and searches go to the Hub again (0 keeps snapshots forever)
+HF_MODELS_SNAPSHOT_MAX_AGE_HOURS = float(os.getenv("HF_MODELS_SNAPSHOT_MAX_AGE_HOURS", "168"))
+
+SNAPSHOT_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("downloads", pa.int64()),
+    ("likes", pa.int64()),
+    ("tags", pa.list_(pa.string())),
+    ("pipeline_tag", pa.string()),
+    ("library_name", pa.string()),
+    ("createdAt", pa.string()),
+    ("lastModified", pa.string()),
+    ("description", pa.string()),
+])
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _page_to_batch(records: List[Dict[str, Any]]) -> Any:
+    columns = {field.name: [record.get(field.name) for record in records] for field in SNAPSHOT_SCHEMA}
+    columns["downloads"] = [value or 0 for value in columns["downloads"]]
+    columns["likes"] = [value or 0 for value in columns["likes"]]
+    columns["tags"] = [value or [] for value in columns["tags"]]
+    return pa.RecordBatch.from_pydict(columns, schema=SNAPSHOT_SCHEMA)
+
+
+def ingest_models_snapshot(
+    path: str = HF_MODELS_SNAPSHOT_PATH,
+    client: Optional[HubClient] = None,
+    page_size: int = 1000,
+    max_models: Optional[int] = None,
+    search: Optional[str] = None,
+) -> int:
+    """
+    Page through the Hub models listing and stream every record into a Parquet snapshot.
+
+    Each page is written as its own row group, so memory stays bounded by the page size
+    however many models are ingested. The snapshot is written to a temporary file and
+    moved into place at the end, so readers never see a partial file. Returns the number
+    of models written.
+    """
+    client = client or get_hub_client()
+    params: Dict[str, Any] = {"limit": page_size, "full": "true", "sort": "downloads", "direction": -1}
+    if search:
+        params["search"] = search
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    written = 0
+    started = time.perf_counter()
+    with pq.ParquetWriter(temporary_path, SNAPSHOT_SCHEMA, compression="zstd") as writer:
+        while True:
+            response = client.get("/models", params=params)
+            response.raise_for_status()
+            records = [_compact_record(model) for model in response.json()]
+            if max_models is not None:
+                records = records[:max_models - written]
+            if not records:
+                break
+            writer.write_batch(_page_to_batch(records))
+            written += len(records)
+            print(f"Ingested {written} models ({written / (time.perf_counter() - started):.0f} models/s)")
+            if max_models is not None and written >= max_models:
+                break
+
+            # The Hub paginates with a Link header; follow its query (cursor or offset) as-is
+            next_link = response.links.get("next", {}).get("url")
+            if not next_link:
+                break
+            params = dict(parse_qsl(urlparse(next_link).query))
+    os.replace(temporary_path, path)
+    return written
+
+
+class ModelSnapshot:
+    """
+    Read-only view of a Parquet models snapshot with in-memory search indexes.
+
+    A full-text index maps every token of model ids, tags, pipeline tags and descriptions
+    to the rows containing it; a tag index maps exact tags to rows. Queries intersect
+    posting lists and order the matches by downloads, without any network call.
+    """
+
+    def __init__(self, path: str = HF_MODELS_SNAPSHOT_PATH) -> None:
+        self.path = path
+        self.table = pq.read_table(path, schema=SNAPSHOT_SCHEMA)
+        self.downloads = self.table.column("downloads").to_numpy()
+
+        text_index: Dict[str, List[int]] = {}
+        tag_index: Dict[str, List[int]] = {}
+        columns = zip(
+            self.table.column("id").to_pylist(),
+            self.table.column("tags").to_pylist(),
+            self.table.column("pipeline_tag").to_pylist(),
+            self.table.column("description").to_pylist(),
+        )
+        for row, (model_id, tags, pipeline_tag, description) in enumerate(columns):
+            tags = tags or []
+            tokens = set(_tokenize(" ".join([model_id or "", pipeline_tag or "", description or "", *tags])))
+            for token in tokens:
+                text_index.setdefault(token, []).append(row)
+            for tag in set(tag.lower() for tag in tags):
+                tag_index.setdefault(tag, []).append(row)
+        self._text_index = {token: np.asarray(rows, dtype=np.int64) for token, rows in text_index.items()}
+        self._tag_index = {tag: np.asarray(rows, dtype=np.int64) for tag, rows in tag_index.items()}
+
+    def __len__(self) -> int:
+        return int(self.table.num_rows)
+
+    def match(self, query: str) -> np.ndarray:
+        """Return the rows matching every term of a query; `tag:<tag>` terms match exact tags."""
+        postings = []
+        for term in query.split():
+            if term.lower().startswith("tag:"):
+                postings.append(self._tag_index.get(term[4:].lower(), np.empty(0, dtype=np.int64)))
+            else:
+                postings.extend(self._text_index.get(token, np.empty(0, dtype=np.int64)) for token in _tokenize(term))
+        if not postings:
+            return np.arange(len(self), dtype=np.int64)
+        rows = postings[0]
+        for posting in sorted(postings[1:], key=len):
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the records of the most downloaded models matching a query."""
+        rows = self.match(query)
+        if limit is not None and limit <= 0:
+            return []
+        if limit is not None and len(rows) > limit:
+            top = np.argpartition(-self.downloads[rows], limit - 1)[:limit]
+            rows = rows[top]
+        rows = rows[np.argsort(-self.downloads[rows], kind="stable")]
+        records = self.table.take(pa.array(rows, type=pa.int64())).to_pylist()
+        # Same shape as records from the Hub: fields the listing did not provide are absent
+        return [{field: value for field, value in record.items() if value is not None} for record in records]
+
+    def screen(self, query: str = "", limit: Optional[int] = None) -> pd.DataFrame:
+        """Score every model matching a query and return them ranked, as a pandas DataFrame."""
+        matches = self.table.take(pa.array(self.match(query), type=pa.int64()))
+        frame = matches.select(["id", "downloads", "likes", "pipeline_tag", "library_name"]).to_pandas()
+        frame["pipeline_tag"] = frame["pipeline_tag"].fillna("")
+        frame["library_name"] = frame["library_name"].fillna("")
+        frame["tags_text"] = pd.Series(["\n".join(tags).lower() for tags in matches.column("tags").to_pylist()], dtype=object)
+        return rank_frame(score_frame(frame), limit)
+
+
+_model_snapshot: Optional[ModelSnapshot] = None
+_model_snapshot_mtime: Optional[float] = None
+_model_snapshot_lock = threading.Lock()
+
+
+def get_model_snapshot() -> Optional[ModelSnapshot]:
+    """
+    Return the snapshot at HF_MODELS_SNAPSHOT_PATH, reloading it when the file changes, or
+    None when there is none or it is older than HF_MODELS_SNAPSHOT_MAX_AGE_HOURS.
+    """
+    global _model_snapshot, _model_snapshot_mtime
+    with _model_snapshot_lock:
+        try:
+            mtime = os.path.getmtime(HF_MODELS_SNAPSHOT_PATH)
+        except OSError:
+            return None
+        if HF_MODELS_SNAPSHOT_MAX_AGE_HOURS > 0 and time.time() - mtime > HF_MODELS_SNAPSHOT_MAX_AGE_HOURS * 3600:
+            # Stale: fall back to live searches until the snapshot is rebuilt
+            _model_snapshot = _model_snapshot_mtime = None
+            return None
+        if _model_snapshot is None or mtime != _model_snapshot_mtime:
+            _model_snapshot = ModelSnapshot(HF_MODELS_SNAPSHOT_PATH)
+            _model_snapshot_mtime = mtime
+        return _model_snapshot
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshot the Hugging Face models listing to Parquet")
+    parser.add_argument("--output", default=HF_MODELS_SNAPSHOT_PATH)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--max-models", type=int, default=None)
+    parser.add_argument("--search", default=None, help="Only snapshot models matching this search")
+    args = parser.parse_args()
+
+    count = ingest_models_snapshot(args.output, page_size=args.page_size, max_models=args.max_models, search=args.search)
+    print(f"Wrote {count} models to {args.output}")
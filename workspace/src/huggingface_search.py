@@ -1,10 +1,20 @@
 from smolagents import tool
-import requests
+import sys
+import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
-HUGGINGFACE_API_URL = "https://huggingface.co/api"
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.hub_metadata_cache import get_model_metadata_cache
+from workspace.src.hub_snapshot import get_model_snapshot
+from workspace.src.model_scoring import POPULARITY_LABELS, POPULARITY_THRESHOLDS, POPULARITY_WEIGHTS, score_models
+
+# Upper bound on concurrent Hub requests issued by compare_model_feasibility
+MAX_CONCURRENT_MODEL_FETCHES = int(os.getenv("HF_MAX_CONCURRENT_FETCHES", "8"))
 
 @tool
 def search_models(query: str, limit: int = 10) -> str:
@@ -17,20 +27,24 @@ def search_models(query: str, limit: int = 10) -> str:
         limit: Maximum number of models to return (default: 10)
     """
     try:
-        response = requests.get(
-            f"{HUGGINGFACE_API_URL}/models",
-            params={"search": query, "limit": limit, "sort": "downloads", "direction": -1}
-        )
-        if response.status_code != 200:
-            return f"Error searching models: {response.text}"
-
-        models = response.json()
+        snapshot = get_model_snapshot()
+        if snapshot is not None:
+            # Answered offline from the bulk snapshot of the models listing
+            models = snapshot.search(query, limit)
+        else:
+            # Served from the local metadata cache when the same search ran recently
+            models, error = get_model_metadata_cache().search_models(query, limit)
+            if error is not None:
+                return f"Error searching models: {error}"
+
         if not models:
             return "No models found for the given query."
 
+        models = models[:limit]
+        popularity = score_models(models)["popularity"]
         formatted_results = []
-        for model in models[:limit]:
-            model_info = _format_model_info(model)
+        for model, popularity_label in zip(models, popularity):
+            model_info = _format_model_info(model, popularity_label)
             formatted_results.append(model_info)
 
         return "\n" + "="*80 + "\n".join(formatted_results)
@@ -49,12 +63,10 @@ def analyze_model_feasibility(model_id: str) -> str:
         model_id: The Hugging Face model identifier to analyze
     """
     try:
-        # Get detailed model information
-        response = requests.get(f"{HUGGINGFACE_API_URL}/models/{model_id}")
-        if response.status_code != 200:
-            return f"Error fetching model details: {response.text}"
-        
-        model_data = response.json()
+        # Get detailed model information, from the local metadata cache when recently seen
+        model_data, error = get_model_metadata_cache().get_model(model_id)
+        if error is not None:
+            return f"Error fetching model details: {error}"
         
         # Analyze model characteristics
         analysis = _analyze_model_characteristics(model_data)
@@ -86,7 +98,60 @@ FEASIBILITY ANALYSIS FOR: {model_id}
         return f"Error analyzing model feasibility: {str(e)}"
 
 
-def _format_model_info(model: Dict[str, Any]) -> str:
+@tool
+def compare_model_feasibility(model_ids: list) -> str:
+    """
+    Analyze the technical feasibility of several Hugging Face models at once and rank them.
+    Use this instead of calling analyze_model_feasibility once per model when comparing candidates.
+    Returns a single comparison table ordered from the most to the least investable model.
+    
+    Args:
+        model_ids: List of Hugging Face model identifiers to compare
+    """
+    try:
+        model_ids = list(dict.fromkeys(str(model_id).strip() for model_id in model_ids if str(model_id).strip()))
+        if not model_ids:
+            return "Please provide at least one model identifier to compare."
+
+        # Fetch every model concurrently through the shared metadata cache
+        cache = get_model_metadata_cache()
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_MODEL_FETCHES, len(model_ids))) as executor:
+            results = list(executor.map(cache.get_model, model_ids))
+
+        records = []
+        errors = []
+        for model_id, (model_data, error) in zip(model_ids, results):
+            if error is not None:
+                errors.append(f"• {model_id}: {error[:200]}")
+                continue
+            records.append({**model_data, 'id': model_id})
+
+        # Score and rank every model in one vectorized pass
+        ranked = score_models(records, rank=True)
+
+        lines = [
+            f"MODEL FEASIBILITY COMPARISON ({len(ranked)} models)",
+            "=" * 80,
+            "| Rank | Model | Downloads | Likes | Pipeline | Complexity | Risk | Recommendation |",
+            "|---|---|---|---|---|---|---|---|",
+        ]
+        for rank, row in enumerate(ranked.itertuples(index=False), start=1):
+            lines.append(
+                f"| {rank} | {row.id} | {row.downloads:,} | {row.likes:,} "
+                f"| {row.pipeline_tag or 'N/A'} | {row.complexity} | {row.risk_level} "
+                f"| {row.recommendation} |"
+            )
+        if errors:
+            lines.append("")
+            lines.append("⚠️ MODELS THAT COULD NOT BE ANALYZED:")
+            lines.extend(errors)
+        return "\n".join(lines)
+
+    except Exception as e:
+        return f"Error comparing model feasibility: {str(e)}"
+
+
+def _format_model_info(model: Dict[str, Any], popularity_score: Optional[str] = None) -> str:
     """Format model information for display."""
     model_id = model.get('id', model.get('modelId', 'Unknown'))
     downloads = model.get('downloads', 0)
@@ -95,8 +160,9 @@ def _format_model_info(model: Dict[str, Any]) -> str:
     library = model.get('library_name', 'N/A')
     created_at = model.get('createdAt', 'N/A')
     
-    # Calculate popularity score
-    popularity_score = _calculate_popularity_score(downloads, likes)
+    # Calculate popularity score unless it was scored with the rest of the page
+    if popularity_score is None:
+        popularity_score = _calculate_popularity_score(downloads, likes)
     
     return f"""
 🤖 MODEL: {model_id}
@@ -109,18 +175,12 @@ def _format_model_info(model: Dict[str, Any]) -> str:
 
 def _calculate_popularity_score(downloads: int, likes: int) -> str:
     """Calculate a popularity score based on downloads and likes."""
-    score = (downloads * 0.7) + (likes * 0.3)
+    score = (downloads * POPULARITY_WEIGHTS[0]) + (likes * POPULARITY_WEIGHTS[1])
     
-    if score > 100000:
-        return "🔥 Very High"
-    elif score > 10000:
-        return "🚀 High"
-    elif score > 1000:
-        return "📈 Medium"
-    elif score > 100:
-        return "🌱 Growing"
-    else:
-        return "🆕 New/Niche"
+    for threshold, label in zip(POPULARITY_THRESHOLDS, POPULARITY_LABELS):
+        if score > threshold:
+            return label
+    return POPULARITY_LABELS[-1]
 
 
 def _analyze_model_characteristics(model_data: Dict[str, Any]) -> Dict[str, str]:
@@ -131,12 +191,11 @@ def _analyze_model_characteristics(model_data: Dict[str, Any]) -> Dict[str, str]
     library = model_data.get('library_name', '')
     tags = model_data.get('tags', [])
     
+    # Complexity, risk level and recommendation come from the shared scoring engine
+    scores = score_models([model_data]).iloc[0]
+    
     # Technical Assessment
-    tech_complexity = "Low"
-    if any(tag in str(tags).lower() for tag in ['large', 'xl', 'xxl', 'billion', 'multimodal']):
-        tech_complexity = "High"
-    elif any(tag in str(tags).lower() for tag in ['medium', 'base', 'transformer']):
-        tech_complexity = "Medium"
+    tech_complexity = scores['complexity']
     
     technical_assessment = f"""
 • Complexity Level: {tech_complexity}
@@ -158,15 +217,13 @@ def _analyze_model_characteristics(model_data: Dict[str, Any]) -> Dict[str, str]
 """
     
     # Risk Factors
-    risk_level = "Low"
+    risk_level = scores['risk_level']
     risk_factors_list = []
     
     if downloads < 100:
         risk_factors_list.append("• Very low adoption - unproven market demand")
-        risk_level = "High"
     elif downloads < 1000:
         risk_factors_list.append("• Limited adoption - market validation needed")
-        risk_level = "Medium"
     
     if likes < 10:
         risk_factors_list.append("• Low community engagement")
@@ -179,19 +236,12 @@ def _analyze_model_characteristics(model_data: Dict[str, Any]) -> Dict[str, str]
     
     risk_factors = '\n'.join(risk_factors_list) if risk_factors_list else "• Minimal technical and market risks identified"
     
-    # Recommendation
-    if downloads > 50000 and likes > 100:
-        recommendation = "🟢 STRONG BUY - Proven market demand and community support"
-    elif downloads > 10000 and likes > 50:
-        recommendation = "🟡 MODERATE BUY - Good traction, monitor growth"
-    elif downloads > 1000:
-        recommendation = "🟠 CAUTIOUS - Early stage, requires deeper analysis"
-    else:
-        recommendation = "🔴 HIGH RISK - Unproven technology, significant market risk"
-    
     return {
         'technical_assessment': technical_assessment,
         'investment_insights': investment_insights,
         'risk_factors': risk_factors,
-        'recommendation': recommendation
+        'recommendation': scores['recommendation'],
+        'recommendation_tier': scores['recommendation_tier'],
+        'complexity': tech_complexity,
+        'risk_level': risk_level
     }
@@ -0,0 +1,128 @@
+import re
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex alternation factored as a trie, so shared prefixes are matched only once."""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        optional = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            # Greedy, so the longest keyword at a position is tried first
+            pattern = (f"(?:{pattern})" if len(branches) == 1 and len(pattern) > 1 else pattern) + "?"
+        return pattern
+
+    return build(trie)
+
+
+def _overlapping_keywords(keyword: str, keywords: Iterable[str]) -> Tuple[str, ...]:
+    """Keywords that can start inside `keyword` and end past it, e.g. "model" for "algorithm"."""
+    return tuple(
+        other for other in keywords
+        if any(other.startswith(keyword[start:]) and len(other) > len(keyword) - start for start in range(1, len(keyword)))
+    )
+
+
+class KeywordMatcher:
+    """
+    Finds the keywords of several categories in a text with precompiled combined regexes.
+
+    The keywords are compiled into trie-shaped alternations, one for the categories listed
+    in `whole_word_categories` and one for the others, so the lowercased text is scanned
+    once per kind of match instead of once per keyword or per category. Whole-word
+    keywords only count when delimited by word boundaries, like `\\bkeyword\\b`; the others
+    count wherever they appear, with the same result as testing `keyword in text` for each
+    keyword, nested and overlapping keywords included.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], whole_word_categories: Iterable[str] = ()) -> None:
+        self.categories = list(categories)
+        whole_word_categories = set(whole_word_categories)
+        substring_indexes: Dict[str, Dict[int, None]] = {}
+        whole_word_indexes: Dict[str, Dict[int, None]] = {}
+        for index, category in enumerate(self.categories):
+            target = whole_word_indexes if category in whole_word_categories else substring_indexes
+            for keyword in categories[category]:
+                target.setdefault(keyword.lower(), {})[index] = None
+
+        self._substring_indexes = {keyword: tuple(indexes) for keyword, indexes in substring_indexes.items()}
+        self._whole_word_indexes = {keyword: tuple(indexes) for keyword, indexes in whole_word_indexes.items()}
+        # Only the longest keyword is reported at a position; the keywords inside it are implied
+        self._implied: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(other for other in sorted(substring_indexes, key=len, reverse=True) if other in keyword)
+            for keyword in substring_indexes
+        }
+
+        # A scan does not report keywords overlapping the end of a match; those are checked afterwards
+        self._overlapping = {keyword: _overlapping_keywords(keyword, substring_indexes) for keyword in substring_indexes}
+        self._substring_pattern = re.compile(_trie_pattern(substring_indexes)) if substring_indexes else None
+        self._whole_word_pattern = None
+        if whole_word_indexes:
+            self._whole_word_pattern = re.compile(rf"\b(?:{_trie_pattern(whole_word_indexes)})\b")
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """Distinct keywords found in a text, grouped by category.
+
+        Whole-word keywords are listed in order of first appearance, the others in the order they were given.
+        """
+        result: Dict[str, List[str]] = {category: [] for category in self.categories}
+        substrings, whole_words = self._scan(text)
+        for keyword in self._substring_indexes:
+            if keyword in substrings:
+                for index in self._substring_indexes[keyword]:
+                    result[self.categories[index]].append(keyword)
+        for keyword in whole_words:
+            for index in self._whole_word_indexes[keyword]:
+                result[self.categories[index]].append(keyword)
+        return result
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Number of distinct keywords of each category found in a text."""
+        return dict(zip(self.categories, self._count_row(text)))
+
+    def count_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Counts for a batch of texts, as an array of shape (len(texts), number of categories)."""
+        rows = [self._count_row(text) for text in texts]
+        return np.asarray(rows, dtype=np.int32).reshape(len(texts), len(self.categories))
+
+    def _count_row(self, text: str) -> List[int]:
+        row = [0] * len(self.categories)
+        substrings, whole_words = self._scan(text)
+        for keyword in substrings:
+            for index in self._substring_indexes[keyword]:
+                row[index] += 1
+        for keyword in whole_words:
+            for index in self._whole_word_indexes[keyword]:
+                row[index] += 1
+        return row
+
+    def _scan(self, text: str) -> Tuple[Set[str], List[str]]:
+        """Distinct substring keywords, and distinct whole-word keywords in order of first appearance, found in a text."""
+        text = text.lower()
+        substrings: Set[str] = set()
+        if self._substring_pattern is not None:
+            # Matches are deduplicated in C before any per-keyword work
+            matches = set(self._substring_pattern.findall(text))
+            candidates: Set[str] = set()
+            for match in matches:
+                substrings.update(self._implied[match])
+                candidates.update(self._overlapping[match])
+            for keyword in candidates - substrings:
+                if keyword in text:
+                    substrings.update(self._implied[keyword])
+        whole_words: List[str] = []
+        if self._whole_word_pattern is not None:
+            whole_words = list(dict.fromkeys(self._whole_word_pattern.findall(text)))
+        return substrings, whole_words
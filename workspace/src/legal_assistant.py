@@ -17,14 +17,14 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from workspace.src.legifrance_search import search_legal_texts, analyze_legal_compliance, search_jurisprudence
 from smolagents import CodeAgent
-from smolagents.models import LiteLLMModel
+from workspace.src.llm_cache import create_model
 
 
 class LegalAssistant:
     def __init__(self, api_key):
         self.agent = CodeAgent(
             tools=[search_legal_texts, analyze_legal_compliance, search_jurisprudence],
-            model=LiteLLMModel(model_id="anthropic/claude-3-5-sonnet-latest", api_key=api_key),
+            model=create_model(api_key, model_id="anthropic/claude-3-5-sonnet-latest"),
             add_base_tools=False,
         )
 
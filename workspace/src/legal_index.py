@@ -0,0 +1,210 @@
+import gzip
+import json
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.text_index import BM25Index
+
+# Article-level legal corpus (JSON lines, optionally gzipped) searched offline by the legal tools
+LEGIFRANCE_CORPUS_PATH = os.getenv("LEGIFRANCE_CORPUS_PATH", "")
+
+# text_type of court decisions; every other type is legislation
+JURISPRUDENCE = "jurisprudence"
+IN_FORCE_STATUSES = frozenset(["VIGUEUR"])
+
+# Bumped whenever legal_tokenize changes, so indexes saved with the previous analyzer are rebuilt
+LEGAL_ANALYZER_VERSION = "fr-1"
+
+FRENCH_STOPWORDS = frozenset(
+    "a au aux avec c ce ces cet cette d dans de des du elle en et est etre il ils j l la le les leur leurs lui m "
+    "ma mais me meme mes n ne ni nos notre nous on ou par pas pour qu que qui s sa se ses si son sont sur t ta "
+    "te tes toi ton tu un une vos votre vous y ete sous sans entre dont".split()
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _accent_table() -> Dict[int, str]:
+    table = {ord("œ"): "oe", ord("æ"): "ae", ord("’"): "'"}
+    for code in range(0xC0, 0x250):
+        char = chr(code)
+        if char != char.lower():
+            # Texts are lowercased before folding
+            continue
+        folded = "".join(part for part in unicodedata.normalize("NFKD", char) if not unicodedata.combining(part))
+        if folded != char:
+            table[ord(char)] = folded
+    return table
+
+
+# Latin letters with diacritics mapped to their base letters, applied with str.translate in one C pass
+_ACCENT_TABLE = _accent_table()
+
+
+def fold_accents(text: str) -> str:
+    """Lowercase a text and strip its diacritics, e.g. "Société" -> "societe"."""
+    return text.lower().translate(_ACCENT_TABLE)
+
+
+@lru_cache(maxsize=1 << 18)
+def french_light_stem(token: str) -> str:
+    """
+    Minimal French stemmer: conflates plural, feminine and past participle forms,
+    e.g. "sociétés", "société" -> "societ" and "salariés" -> "salari".
+    """
+    if len(token) < 6 or token.isdigit():
+        return token
+    if token.endswith("x"):
+        # "generaux" -> "general"
+        return token[:-2] + "l" if token.endswith("aux") else token[:-1]
+    for suffix in ("s", "r", "e"):
+        if token.endswith(suffix):
+            token = token[:-1]
+    if len(token) > 1 and token[-1] == token[-2] and token[-1].isalpha():
+        token = token[:-1]
+    return token
+
+
+def legal_tokenize(text: str) -> List[str]:
+    """Analyze a French legal text: accent folding, elision and stopword removal, light stemming."""
+    return [french_light_stem(token) for token in _TOKEN_PATTERN.findall(fold_accents(text)) if token not in FRENCH_STOPWORDS]
+
+
+def load_articles(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream article records from a JSON lines corpus."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def latest_versions(articles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Records of a corpus with only the last version of each id: archives are ingested in
+    publication order, so a later record of an article (modified, repealed) supersedes the
+    earlier ones. Records without an id are all kept.
+    """
+    latest: Dict[Any, Dict[str, Any]] = {}
+    for position, article in enumerate(articles):
+        latest[article.get("id") or position] = article
+    return list(latest.values())
+
+
+def _document_text(article: Dict[str, Any]) -> str:
+    return " ".join([article.get("title", ""), article.get("num", ""), article.get("text", "")])
+
+
+class LegalIndex:
+    """
+    Legal articles and court decisions with a BM25 index, one document per article.
+
+    The text type, status and end date of every article are kept as NumPy arrays, so
+    filters are boolean masks applied to the BM25 scores rather than passes over records.
+    The in-force mask depends on the current date, so it is rebuilt when the day changes.
+    """
+
+    def __init__(self, articles: List[Dict[str, Any]], index: Optional[BM25Index] = None) -> None:
+        self.articles = articles
+        self.index = index or BM25Index.build((_document_text(article) for article in articles), tokenizer=legal_tokenize)
+        self.text_types = np.asarray([article.get("text_type", "") for article in articles], dtype=object)
+        self._in_force_status = np.fromiter((article.get("status") in IN_FORCE_STATUSES for article in articles), dtype=bool, count=len(articles))
+        # ISO dates compare in date order as strings; "" means no end date
+        self._end_dates = np.asarray([article.get("date_fin") or "" for article in articles], dtype=str)
+        self._in_force_day: Optional[str] = None
+        self._in_force_mask = self._in_force_status
+        self._type_masks: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_corpus(cls, path: str, index_path: Optional[str] = None) -> "LegalIndex":
+        """
+        Load a corpus, keeping the last version of each article, and its index. The index is
+        saved next to the corpus on first build and reused while the corpus's size and
+        modification time are unchanged.
+        """
+        started = time.perf_counter()
+        articles = latest_versions(load_articles(path))
+        index_path = index_path or f"{path}.bm25.npz"
+        stat = os.stat(path)
+        signature = {"source_size": str(stat.st_size), "source_mtime": str(stat.st_mtime), "analyzer": LEGAL_ANALYZER_VERSION}
+
+        index = None
+        if os.path.exists(index_path):
+            cached, metadata = BM25Index.load(index_path, tokenizer=legal_tokenize)
+            if metadata == signature and len(cached) == len(articles):
+                index = cached
+        if index is None:
+            index = BM25Index.build((_document_text(article) for article in articles), tokenizer=legal_tokenize)
+            try:
+                index.save(index_path, **signature)
+            except OSError as e:
+                print(f"Could not save legal index to {index_path}: {e}")
+        print(f"Loaded {len(articles)} legal articles in {time.perf_counter() - started:.1f}s")
+        return cls(articles, index)
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def search(
+        self, query: str, limit: int = 10, text_type: str = "all", in_force_only: bool = True
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Return up to `limit` (article, BM25 score) pairs of legislation, best first.
+
+        `text_type` restricts the results to one type (code, loi, decret...); `in_force_only`
+        to articles currently in force.
+        """
+        candidates = self.text_types != JURISPRUDENCE if text_type == "all" else self._type_mask(text_type)
+        if in_force_only:
+            candidates = candidates & self.in_force()
+        return [(self.articles[doc_id], score) for doc_id, score in self.index.search(query, limit, candidates)]
+
+    def search_jurisprudence(self, query: str, limit: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """Return up to `limit` (decision, BM25 score) pairs, best first."""
+        return [(self.articles[doc_id], score) for doc_id, score in self.index.search(query, limit, self._type_mask(JURISPRUDENCE))]
+
+    def in_force(self, today: Optional[str] = None) -> np.ndarray:
+        """Mask of the articles in force on `today` (an ISO date, the current date by default)."""
+        today = today or date.today().isoformat()
+        if today != self._in_force_day:
+            self._in_force_mask = self._in_force_status & ((self._end_dates == "") | (self._end_dates > today))
+            self._in_force_day = today
+        return self._in_force_mask
+
+    def _type_mask(self, text_type: str) -> np.ndarray:
+        mask = self._type_masks.get(text_type)
+        if mask is None:
+            mask = self._type_masks[text_type] = self.text_types == text_type
+        return mask
+
+
+_legal_index: Optional[LegalIndex] = None
+_legal_index_mtime: Optional[float] = None
+_legal_index_lock = threading.Lock()
+
+
+def get_legal_index() -> Optional[LegalIndex]:
+    """
+    Return the process-wide index of LEGIFRANCE_CORPUS_PATH, reloaded when the corpus
+    changes, or None when no corpus is available.
+    """
+    global _legal_index, _legal_index_mtime
+    with _legal_index_lock:
+        if not LEGIFRANCE_CORPUS_PATH or not os.path.exists(LEGIFRANCE_CORPUS_PATH):
+            return None
+        mtime = os.path.getmtime(LEGIFRANCE_CORPUS_PATH)
+        if _legal_index is None or mtime != _legal_index_mtime:
+            _legal_index = LegalIndex.from_corpus(LEGIFRANCE_CORPUS_PATH)
+            _legal_index_mtime = mtime
+        return _legal_index
@@ -0,0 +1,216 @@
+import argparse
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import re
+import sys
+import tarfile
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, BinaryIO, Dict, List, Optional
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.legal_index import JURISPRUDENCE, LEGIFRANCE_CORPUS_PATH, LegalIndex
+
+# LEGI text natures mapped to the text types of search_legal_texts
+LEGI_NATURES = {
+    "CODE": "code",
+    "LOI": "loi",
+    "LOI_ORGANIQUE": "loi",
+    "DECRET": "decret",
+    "DECRET_LOI": "decret",
+    "ARRETE": "arrete",
+    "ORDONNANCE": "ordonnance",
+}
+# Root elements of JADE (administrative) and CASS/CAPP/INCA (judicial) decisions
+JURISPRUDENCE_ROOTS = frozenset(["TEXTE_JURI_ADMIN", "TEXTE_JURI_JUDI"])
+# Decisions are kept to their abstract, or to the start of their text, so the corpus fits in memory
+MAX_DECISION_CHARS = 5000
+# Decompressors for the archive extensions; tarfile's own stream decompression is much slower
+_DECOMPRESSORS = {".gz": gzip.GzipFile, ".tgz": gzip.GzipFile, ".bz2": bz2.BZ2File, ".xz": lzma.LZMAFile}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _element_text(element: Optional[ET.Element]) -> str:
+    if element is None:
+        return ""
+    # Paragraphs and line breaks are child elements; separate their texts
+    return _WHITESPACE.sub(" ", " ".join(element.itertext())).strip()
+
+
+def _field(root: ET.Element, path: str) -> str:
+    return (root.findtext(path) or "").strip()
+
+
+def parse_legal_xml(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse one DILA XML document into an article record, or None for documents that are
+    neither a LEGI article nor a court decision (text structures, versions, sections).
+    """
+    root = ET.fromstring(data)
+    if root.tag == "ARTICLE":
+        text = root.find("CONTEXTE/TEXTE")
+        title = root.find("CONTEXTE/TEXTE/TITRE_TXT")
+        nature = text.get("nature", "") if text is not None else ""
+        return {
+            "id": _field(root, "META/META_COMMUN/ID"),
+            "title": (title.get("c_titre_court") or _element_text(title)) if title is not None else "",
+            "num": _field(root, "META/META_SPEC/META_ARTICLE/NUM"),
+            "text_type": LEGI_NATURES.get(nature.upper(), nature.lower()),
+            "fond": "LEGI",
+            "status": _field(root, "META/META_SPEC/META_ARTICLE/ETAT"),
+            "date_debut": _field(root, "META/META_SPEC/META_ARTICLE/DATE_DEBUT"),
+            "date_fin": _field(root, "META/META_SPEC/META_ARTICLE/DATE_FIN"),
+            "text": _element_text(root.find("BLOC_TEXTUEL")),
+        }
+    if root.tag in JURISPRUDENCE_ROOTS:
+        abstract = _element_text(root.find("TEXTE/SOMMAIRE"))
+        return {
+            "id": _field(root, "META/META_COMMUN/ID"),
+            "title": _field(root, "META/META_SPEC/META_JURI/TITRE"),
+            "text_type": JURISPRUDENCE,
+            "fond": _field(root, "META/META_SPEC/META_JURI/JURIDICTION") or _field(root, "META/META_COMMUN/ORIGINE"),
+            "date": _field(root, "META/META_SPEC/META_JURI/DATE_DEC"),
+            "text": (abstract or _element_text(root.find("TEXTE/BLOC_TEXTUEL")))[:MAX_DECISION_CHARS],
+        }
+    return None
+
+
+class _CountingReader(io.RawIOBase):
+    """File wrapper counting the bytes read, to report the input throughput."""
+
+    def __init__(self, raw: BinaryIO) -> None:
+        super().__init__()
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _load_checkpoints(path: str) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        checkpoints: Dict[str, Dict[str, Any]] = json.load(handle)
+        return checkpoints
+
+
+def _save_checkpoints(path: str, checkpoints: Dict[str, Dict[str, Any]]) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as handle:
+        json.dump(checkpoints, handle, indent=2)
+    os.replace(temporary_path, path)
+
+
+def ingest_legal_archive(
+    archive_path: str,
+    corpus_path: str = LEGIFRANCE_CORPUS_PATH,
+    checkpoint_path: Optional[str] = None,
+    batch_size: int = 1000,
+    report_every: int = 50000,
+) -> int:
+    """
+    Stream the articles and decisions of a DILA tar archive (LEGI, JADE, CASS...) into a
+    JSON lines corpus, and return the number of records written.
+
+    The archive is read sequentially, one member at a time, and each member holds a single
+    article or decision, so memory stays constant whatever the size of the archive. Records
+    are appended in batches; after each batch the corpus is synced and the position in the
+    archive saved to a checkpoint file (`<corpus>.checkpoint.json`). An interrupted
+    ingestion resumes after the last checkpoint, first dropping any record written past it.
+    A later version of an article is appended beside the earlier ones, and supersedes them
+    when the corpus is loaded (see legal_index.latest_versions).
+    """
+    if corpus_path.endswith(".gz"):
+        raise ValueError("Archives are ingested into an uncompressed corpus")
+    checkpoint_path = checkpoint_path or f"{corpus_path}.checkpoint.json"
+    checkpoints = _load_checkpoints(checkpoint_path)
+    name = os.path.basename(archive_path)
+    if checkpoints.get(name, {}).get("complete"):
+        print(f"{name} already ingested, skipping")
+        return 0
+
+    os.makedirs(os.path.dirname(os.path.abspath(corpus_path)), exist_ok=True)
+    corpus_size = os.path.getsize(corpus_path) if os.path.exists(corpus_path) else 0
+    state = checkpoints.setdefault(name, {"members": 0, "records": 0, "corpus_offset": corpus_size, "complete": False})
+    if state["members"]:
+        print(f"Resuming {name} after {state['members']} members")
+
+    written = 0
+    batch: List[str] = []
+    started = time.perf_counter()
+    with open(corpus_path, "ab") as corpus, open(archive_path, "rb") as raw:
+        corpus.truncate(state["corpus_offset"])
+
+        def flush(members: int) -> None:
+            nonlocal written
+            if batch:
+                corpus.write(("\n".join(batch) + "\n").encode("utf-8"))
+                written += len(batch)
+                state["records"] += len(batch)
+                batch.clear()
+            corpus.flush()
+            os.fsync(corpus.fileno())
+            state.update(members=members, corpus_offset=corpus.tell())
+            _save_checkpoints(checkpoint_path, checkpoints)
+
+        reader = _CountingReader(raw)
+        decompressor = _DECOMPRESSORS.get(os.path.splitext(archive_path)[1])
+        stream = decompressor(fileobj=reader) if decompressor else reader
+        position = 0
+        # "r|" reads the tar as a stream, without seeking
+        with tarfile.open(fileobj=stream, mode="r|") as archive:
+            for position, member in enumerate(archive, start=1):
+                # TarFile remembers every member it has read; forget them to keep memory constant
+                archive.members.clear()  # type: ignore[attr-defined]
+                if position <= state["members"] or not member.isfile() or not member.name.endswith(".xml"):
+                    continue
+                source = archive.extractfile(member)
+                if source is None:
+                    continue
+                try:
+                    record = parse_legal_xml(source.read())
+                except ET.ParseError as e:
+                    print(f"Skipping malformed {member.name}: {e}")
+                    continue
+                if record is not None and record["id"]:
+                    batch.append(json.dumps(record, ensure_ascii=False))
+                if len(batch) >= batch_size:
+                    flush(position)
+                if position % report_every == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"{name}: {position} members, {written + len(batch)} records "
+                          f"({(written + len(batch)) / elapsed:.0f} records/s, {reader.bytes_read / elapsed / 1e6:.1f} MB/s)")
+        flush(position)
+
+    state["complete"] = True
+    _save_checkpoints(checkpoint_path, checkpoints)
+    elapsed = time.perf_counter() - started
+    print(f"Ingested {written} records from {name} in {elapsed:.1f}s ({written / max(elapsed, 1e-9):.0f} records/s)")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest DILA open-data archives (LEGI, JADE, CASS) into the local legal corpus")
+    parser.add_argument("archives", nargs="+", help="tar or tar.gz archives, in publication order")
+    parser.add_argument("--corpus", default=LEGIFRANCE_CORPUS_PATH or ".cache/legal_corpus.jsonl")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--no-index", action="store_true", help="Do not build the search index afterwards")
+    args = parser.parse_args()
+
+    total = sum(ingest_legal_archive(archive, args.corpus, batch_size=args.batch_size) for archive in args.archives)
+    print(f"Wrote {total} records to {args.corpus}")
+    if not args.no_index:
+        LegalIndex.from_corpus(args.corpus)
@@ -0,0 +1,165 @@
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.hub_client import DEFAULT_TIMEOUT, RETRY_STATUS_CODES, retry_after_seconds
+
+# Légifrance API on the PISTE gateway, and the OAuth endpoint issuing its access tokens
+LEGIFRANCE_API_URL = os.getenv("LEGIFRANCE_API_URL", "https://api.piste.gouv.fr/dila/legifrance/lf-engine-app")
+PISTE_OAUTH_URL = os.getenv("PISTE_OAUTH_URL", "https://oauth.piste.gouv.fr/api/oauth/token")
+PISTE_CLIENT_ID = os.getenv("PISTE_CLIENT_ID")
+PISTE_CLIENT_SECRET = os.getenv("PISTE_CLIENT_SECRET")
+# Requests in flight at once; PISTE quotas are per application, so this is shared by every tool
+LEGIFRANCE_MAX_CONCURRENT_REQUESTS = int(os.getenv("LEGIFRANCE_MAX_CONCURRENT_REQUESTS", "4"))
+# A token is renewed this many seconds before it expires, so no request goes out with a stale one
+TOKEN_REFRESH_MARGIN_SECONDS = 60.0
+
+
+class LegifranceAuthError(RuntimeError):
+    """Raised when PISTE refuses to issue an access token."""
+
+
+class LegifranceClient:
+    """
+    Shared HTTP client for the Légifrance API on PISTE.
+
+    Fetches an OAuth access token with the client credentials grant and keeps it until
+    shortly before it expires, so tools do not pay a token round trip per call; a 401
+    answer invalidates the token and the request is replayed once with a fresh one.
+    Connections are pooled, transient errors retried like HubClient does, and a
+    semaphore keeps the number of requests in flight within the application quota.
+    """
+
+    def __init__(
+        self,
+        base_url: str = LEGIFRANCE_API_URL,
+        oauth_url: str = PISTE_OAUTH_URL,
+        client_id: Optional[str] = PISTE_CLIENT_ID,
+        client_secret: Optional[str] = PISTE_CLIENT_SECRET,
+        timeout: Any = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_concurrent_requests: int = LEGIFRANCE_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.oauth_url = oauth_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            # Légifrance searches are POST requests without side effects
+            allowed_methods=frozenset(["GET", "POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        pool_maxsize = max(max_concurrent_requests, 1)
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._slots = threading.BoundedSemaphore(pool_maxsize)
+        self._token_lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._rate_limit_lock = threading.Lock()
+        self._blocked_until = 0.0
+
+    @property
+    def configured(self) -> bool:
+        """Whether PISTE credentials are available."""
+        return bool(self.client_id and self.client_secret)
+
+    def post(self, path: str, payload: Dict[str, Any]) -> requests.Response:
+        """POST a JSON payload to a path relative to the API root, e.g. "/search"."""
+        return self._request("POST", path, json=payload)
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """GET a path relative to the API root."""
+        return self._request("GET", path, params=params)
+
+    def access_token(self) -> str:
+        """Return a valid access token, fetching a new one only when the cached one is about to expire."""
+        with self._token_lock:
+            token = self._token
+            if token is None or time.monotonic() >= self._token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS:
+                token = self._fetch_token()
+            return token
+
+    def invalidate_token(self) -> None:
+        with self._token_lock:
+            self._token = None
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _fetch_token(self) -> str:
+        if not self.configured:
+            raise LegifranceAuthError("PISTE_CLIENT_ID and PISTE_CLIENT_SECRET are not set")
+        response = self.session.post(
+            self.oauth_url,
+            data={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "scope": "openid",
+            },
+            timeout=self.timeout,
+        )
+        if response.status_code != 200:
+            raise LegifranceAuthError(f"PISTE token request failed with status {response.status_code}")
+        body = response.json()
+        token = str(body["access_token"])
+        self._token = token
+        self._token_expires_at = time.monotonic() + float(body.get("expires_in", 3600))
+        return token
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        with self._slots:
+            for attempt in range(2):
+                self._wait_for_rate_limit()
+                headers = {"Authorization": f"Bearer {self.access_token()}", "Accept": "application/json"}
+                response = self.session.request(method, f"{self.base_url}{path}", headers=headers, timeout=self.timeout, **kwargs)
+                if response.status_code == 401 and attempt == 0:
+                    # Revoked or expired early on the server side
+                    self.invalidate_token()
+                    continue
+                if response.status_code == 429:
+                    retry_after = retry_after_seconds(response.headers)
+                    self._block_for(1.0 if retry_after is None else retry_after)
+                return response
+        return response
+
+    def _wait_for_rate_limit(self) -> None:
+        with self._rate_limit_lock:
+            delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _block_for(self, seconds: float) -> None:
+        with self._rate_limit_lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+_legifrance_client: Optional[LegifranceClient] = None
+_legifrance_client_lock = threading.Lock()
+
+
+def get_legifrance_client() -> LegifranceClient:
+    """Return the process-wide Légifrance client used by every legal tool."""
+    global _legifrance_client
+    with _legifrance_client_lock:
+        if _legifrance_client is None:
+            _legifrance_client = LegifranceClient()
+        return _legifrance_client
@@ -1,15 +1,49 @@
 from smolagents import tool
-import requests
-import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+import re
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import zip_longest
+from typing import Dict, List, Any, Optional, Tuple
 
-# Note: Légifrance API requires authentication and has specific endpoints
-# For demonstration purposes, we'll simulate responses with realistic legal data
-LEGIFRANCE_API_URL = "https://api.legifrance.gouv.fr"
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.compliance_rules import get_compliance_rules
+from workspace.src.legal_index import JURISPRUDENCE, get_legal_index, legal_tokenize
+from workspace.src.text_index import BM25Index
+from workspace.src.legifrance_client import get_legifrance_client
+
+# Légifrance "fond" (collection) and NATURE facet searched for each text_type of search_legal_texts
+TEXT_TYPE_SEARCHES = {
+    "all": ("ALL", None),
+    "code": ("CODE_ETAT", None),
+    "loi": ("LODA_ETAT", "LOI"),
+    "decret": ("LODA_ETAT", "DECRET"),
+    "arrete": ("LODA_ETAT", "ARRETE"),
+    "ordonnance": ("LODA_ETAT", "ORDONNANCE"),
+}
+# Légifrance results fetched and re-ranked locally for each search_legal_texts call (the API allows 100)
+API_RERANK_CANDIDATES = 100
+# Judicial (Cour de cassation, cours d'appel) and administrative case law, searched in parallel
+JURISPRUDENCE_FONDS = ("JURI", "CETAT")
+
+LEGAL_STATUS_LABELS = {
+    "VIGUEUR": "En vigueur",
+    "VIGUEUR_DIFF": "En vigueur différée",
+    "MODIFIE": "Modifié",
+    "ABROGE": "Abrogé",
+    "ABROGE_DIFF": "Abrogation différée",
+    "PERIME": "Périmé",
+}
+
+_HTML_TAG = re.compile(r"<[^>]+>")
 
 @tool
-def search_legal_texts(query: str, text_type: str = "all", limit: int = 10) -> str:
+def search_legal_texts(query: str, text_type: str = "all", limit: int = 10, in_force_only: bool = True) -> str:
     """
     Search for legal texts in Légifrance database with detailed analysis for investment due diligence.
     Returns comprehensive information including codes, laws, decrees, and regulations.
@@ -18,10 +52,17 @@ def search_legal_texts(query: str, text_type: str = "all", limit: int = 10) -> s
         query: The search query to find relevant legal texts
         text_type: Type of legal text (all, code, loi, decret, arrete, ordonnance) (default: "all")
         limit: Maximum number of results to return (default: 10)
+        in_force_only: Only return articles currently in force, for searches in the local corpus (default: True)
     """
     try:
-        # Note: Real Légifrance API requires authentication and specific formatting
-        # Providing simulated response with realistic legal data for demonstration
+        text_type = text_type.lower() if text_type.lower() in TEXT_TYPE_SEARCHES else "all"
+        texts = _find_legal_texts(query, text_type, limit, in_force_only)
+        if texts:
+            return f"RECHERCHE LÉGIFRANCE POUR: \"{query}\"\n{'='*80}\n" + "".join(_format_legal_text_info(text) for text in texts)
+        if texts is not None:
+            return f"Aucun texte légal trouvé pour: {query}"
+
+        # Without PISTE credentials, answer with representative texts for demonstration
         return f"""
 RECHERCHE LÉGIFRANCE POUR: "{query}"
 {'='*80}
@@ -55,7 +96,7 @@ RECHERCHE LÉGIFRANCE POUR: "{query}"
 📝 Résumé: Dispositions relatives aux contrats de travail, durée du travail, et relations employeur-salarié...
 
 Note: API Légifrance nécessite une authentification. Réponse simulée pour démonstration.
-Pour un usage en production, veuillez configurer les clés d'API Légifrance.
+Pour un usage en production, définissez PISTE_CLIENT_ID et PISTE_CLIENT_SECRET.
         """
     
     except Exception as e:
@@ -73,8 +114,11 @@ def analyze_legal_compliance(business_activity: str, company_type: str = "SAS")
         company_type: Type of company structure (SAS, SARL, SA, etc.) (default: "SAS")
     """
     try:
-        # Simulate compliance analysis based on business activity
         compliance_analysis = _analyze_compliance_requirements(business_activity, company_type)
+        references = ""
+        texts = _find_legal_texts(business_activity, "all", 3)
+        if texts:
+            references = "\n📚 TEXTES DE RÉFÉRENCE (Légifrance):\n" + "".join(_format_legal_text_info(text) for text in texts)
         
         return f"""
 ANALYSE DE CONFORMITÉ LÉGALE
@@ -82,6 +126,7 @@ ANALYSE DE CONFORMITÉ LÉGALE
 
 🏢 ACTIVITÉ: {business_activity}
 🏛️ FORME JURIDIQUE: {company_type}
+🧭 SECTEURS IDENTIFIÉS: {compliance_analysis['sectors']}
 
 📋 OBLIGATIONS RÉGLEMENTAIRES:
 {compliance_analysis['regulatory_obligations']}
@@ -106,6 +151,7 @@ ANALYSE DE CONFORMITÉ LÉGALE
 
 ✅ RECOMMANDATIONS DE CONFORMITÉ:
 {compliance_analysis['compliance_recommendations']}
+{references}
         """
     
     except Exception as e:
@@ -124,7 +170,23 @@ def search_jurisprudence(legal_domain: str, keywords: str = "", limit: int = 5)
         limit: Maximum number of cases to return (default: 5)
     """
     try:
-        # Simulate jurisprudence search with realistic case data
+        query = f"{legal_domain} {keywords}".strip()
+        legal_index = get_legal_index()
+        client = get_legifrance_client()
+        decisions = []
+        if legal_index is not None:
+            decisions = [_article_info(decision) for decision, _ in legal_index.search_jurisprudence(query, limit)]
+        if not decisions and client.configured:
+            with ThreadPoolExecutor(max_workers=len(JURISPRUDENCE_FONDS)) as executor:
+                batches = list(executor.map(lambda fond: _search_api(query, fond, limit), JURISPRUDENCE_FONDS))
+            # Alternate judicial and administrative decisions, each in relevance order
+            decisions = [decision for group in zip_longest(*batches) for decision in group if decision is not None][:limit]
+        if decisions:
+            return f"JURISPRUDENCE - DOMAINE: {legal_domain}\n{'='*80}\n" + "".join(_format_decision_info(decision) for decision in decisions)
+        if legal_index is not None or client.configured:
+            return f"Aucune décision trouvée pour: {query}"
+
+        # Without PISTE credentials, answer with representative decisions for demonstration
         return f"""
 JURISPRUDENCE - DOMAINE: {legal_domain}
 {'='*80}
@@ -163,136 +225,108 @@ jurisprudentielles, veuillez utiliser les services officiels (Légifrance, Dallo
 
 def _analyze_compliance_requirements(business_activity: str, company_type: str) -> Dict[str, str]:
     """Analyze compliance requirements based on business activity and company type."""
-    
-    activity_lower = business_activity.lower()
-    
-    # Determine regulatory obligations based on activity
-    if any(term in activity_lower for term in ['fintech', 'finance', 'paiement', 'banque']):
-        regulatory_obligations = """
-• Agrément ACPR (Autorité de Contrôle Prudentiel et de Résolution)
-• Respect des directives DSP2 et MiFID II
-• Déclaration auprès de TRACFIN (lutte anti-blanchiment)
-• Obligations de reporting prudentiel
-• Respect des ratios de solvabilité"""
-        
-        licenses_required = """
-• Licence d'établissement de paiement ou de monnaie électronique
-• Agrément bancaire (si applicable)
-• Passeport européen pour services financiers
-• Enregistrement ORIAS (si intermédiation)"""
-        
-    elif any(term in activity_lower for term in ['ia', 'intelligence artificielle', 'algorithme', 'données']):
-        regulatory_obligations = """
-• Conformité au Règlement IA européen (AI Act)
-• Respect du RGPD pour le traitement des données
-• Déclaration des systèmes d'IA à haut risque
-• Obligations de transparence algorithmique
-• Respect des principes éthiques de l'IA"""
-        
-        licenses_required = """
-• Pas de licence spécifique requise actuellement
-• Certification CE pour systèmes IA à haut risque (à venir)
-• Enregistrement auprès des autorités compétentes
-• Conformité aux standards techniques européens"""
-        
-    elif any(term in activity_lower for term in ['santé', 'médical', 'dispositif médical']):
-        regulatory_obligations = """
-• Conformité au Règlement MDR (Medical Device Regulation)
-• Respect du Code de la santé publique
-• Obligations de pharmacovigilance
-• Respect des bonnes pratiques cliniques
-• Déclaration auprès de l'ANSM"""
-        
-        licenses_required = """
-• Marquage CE pour dispositifs médicaux
-• Autorisation de mise sur le marché (si applicable)
-• Licence d'exploitation pharmaceutique (si applicable)
-• Agrément établissement pharmaceutique"""
-        
-    else:
-        regulatory_obligations = """
-• Respect du Code de commerce
-• Conformité aux réglementations sectorielles
-• Obligations déclaratives standard
-• Respect des règles de concurrence
-• Conformité environnementale (si applicable)"""
-        
-        licenses_required = """
-• Immatriculation au RCS (Registre du Commerce et des Sociétés)
-• Déclaration d'activité auprès des autorités compétentes
-• Licences sectorielles spécifiques (selon activité)
-• Autorisations d'exploitation (si nécessaire)"""
-    
-    # Common compliance areas
-    data_protection = """
-• Mise en conformité RGPD complète
-• Nomination d'un DPO (si seuils atteints)
-• Registre des traitements de données
-• Politique de confidentialité et mentions légales
-• Procédures de gestion des violations de données
-• Contrats de sous-traitance conformes"""
-    
-    employment_law = f"""
-• Respect du Code du travail français
-• Convention collective applicable
-• Contrats de travail conformes
-• Règlement intérieur (si > 50 salariés)
-• Obligations de formation et sécurité
-• Représentation du personnel (selon effectifs)"""
-    
-    if company_type.upper() == "SAS":
-        tax_obligations = """
-• Impôt sur les sociétés (IS) - Taux standard ou réduit
-• TVA (si chiffre d'affaires > seuils)
-• Contribution économique territoriale (CET)
-• Taxe sur les salaires (si applicable)
-• Crédit d'impôt recherche (CIR) - Opportunité
-• Statut JEI (Jeune Entreprise Innovante) - Avantages fiscaux"""
-    else:
-        tax_obligations = """
-• Obligations fiscales selon la forme juridique
-• Impôt sur les sociétés ou IR (selon option)
-• TVA et taxes parafiscales
-• Contributions sociales
-• Optimisations fiscales disponibles"""
-    
-    intellectual_property = """
-• Protection des marques et noms de domaine
-• Dépôt de brevets (innovations techniques)
-• Protection des droits d'auteur (logiciels)
-• Contrats de cession/licence de PI
-• Clauses de confidentialité et non-concurrence
-• Veille concurrentielle et contrefaçon"""
-    
-    legal_risks = """
-• Risque de non-conformité réglementaire
-• Responsabilité civile et pénale des dirigeants
-• Litiges commerciaux et contractuels
-• Violations de propriété intellectuelle
-• Non-respect des obligations sociales
-• Sanctions administratives et pénales"""
-    
-    compliance_recommendations = """
-• Audit juridique complet avant levée de fonds
-• Mise en place d'un système de veille réglementaire
-• Formation des équipes aux obligations légales
-• Documentation et traçabilité des processus
-• Assurance responsabilité civile professionnelle
-• Accompagnement juridique spécialisé
-• Plan de mise en conformité progressive"""
-    
+    return get_compliance_rules().analyze(business_activity, company_type)
+
+
+def _find_legal_texts(query: str, text_type: str, limit: int, in_force_only: bool = True) -> Optional[List[Dict[str, Any]]]:
+    """
+    Search the local corpus, then the Légifrance API when the corpus has no match, and
+    label every text with its relevance. Returns None when neither is available.
+    """
+    legal_index = get_legal_index()
+    client = get_legifrance_client()
+    if legal_index is not None:
+        # Already ranked by BM25 over the whole corpus
+        texts = [_article_info(article) for article, _ in legal_index.search(query, limit, text_type, in_force_only)]
+        if texts or not client.configured:
+            return _rank_legal_texts(texts, query, rerank=False)
+    if client.configured:
+        fond, nature = TEXT_TYPE_SEARCHES[text_type]
+        candidates = _search_api(query, fond, max(limit, API_RERANK_CANDIDATES), nature=nature)
+        return _rank_legal_texts(candidates, query)[:limit]
+    return None
+
+
+def _search_payload(query: str, fond: str, limit: int, nature: Optional[str] = None) -> Dict[str, Any]:
+    """Body of a Légifrance /search request matching all the words of a query."""
+    search: Dict[str, Any] = {
+        "champs": [{
+            "typeChamp": "ALL",
+            "criteres": [{"typeRecherche": "TOUS_LES_MOTS_DANS_UN_CHAMP", "valeur": query, "operateur": "ET"}],
+            "operateur": "ET",
+        }],
+        "filtres": [{"facette": "NATURE", "valeurs": [nature]}] if nature else [],
+        "pageNumber": 1,
+        "pageSize": max(1, min(limit, 100)),
+        "operateur": "ET",
+        "sort": "PERTINENCE",
+        "typePagination": "DEFAUT",
+    }
+    return {"fond": fond, "recherche": search}
+
+
+def _search_api(query: str, fond: str, limit: int, nature: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Search one Légifrance collection and return normalized results, best first."""
+    response = get_legifrance_client().post("/search", _search_payload(query, fond, limit, nature))
+    response.raise_for_status()
+    return [_normalize_search_result(result, fond) for result in response.json().get("results", [])[:limit]]
+
+
+def _format_date(value: Any) -> str:
+    """Légifrance dates come as epoch milliseconds or ISO strings."""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+    return str(value)[:10] if value else "N/A"
+
+
+def _normalize_search_result(result: Dict[str, Any], fond: str) -> Dict[str, Any]:
+    """Map a Légifrance search result to the fields the formatters use."""
+    title = (result.get("titles") or [{}])[0]
+    extracts = [extract for section in result.get("sections") or [] for extract in section.get("extracts") or []]
+    first_extract = extracts[0] if extracts else {}
+    extract_text = " ".join(value for extract in extracts for value in extract.get("values") or [])
+    summary = _HTML_TAG.sub("", extract_text or result.get("text") or result.get("summary") or "").strip()
+    status = first_extract.get("legalStatus") or title.get("legalStatus") or result.get("etat")
+    reference = f"Article {first_extract['num']}" if first_extract.get("num") else title.get("id", "N/A")
+    date = (first_extract.get("dateVersion") or result.get("dateDecision") or result.get("dateVersion")
+            or result.get("datePublication") or result.get("date"))
     return {
-        'regulatory_obligations': regulatory_obligations,
-        'licenses_required': licenses_required,
-        'data_protection': data_protection,
-        'employment_law': employment_law,
-        'tax_obligations': tax_obligations,
-        'intellectual_property': intellectual_property,
-        'legal_risks': legal_risks,
-        'compliance_recommendations': compliance_recommendations
+        "id": first_extract.get("id") or title.get("id", ""),
+        "title": _HTML_TAG.sub("", title.get("title") or "Texte sans titre"),
+        "reference": reference,
+        "status": LEGAL_STATUS_LABELS.get(status, status or "N/A"),
+        "lastModified": _format_date(date),
+        "domain": result.get("nature") or result.get("origin") or fond,
+        "summary": summary or "Résumé non disponible",
     }
 
 
+def _article_info(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an article or decision of the local corpus to the fields the formatters use."""
+    status = article.get("status")
+    text_type = article.get("text_type") or "N/A"
+    reference = f"Article {article['num']}" if article.get("num") else article.get("id", "N/A")
+    return {
+        "id": article.get("id", ""),
+        "title": article.get("title") or "Texte sans titre",
+        "reference": reference,
+        "status": LEGAL_STATUS_LABELS.get(status, status or "N/A"),
+        "lastModified": _format_date(article.get("date_debut") or article.get("date")),
+        "domain": article.get("fond", "N/A") if text_type == JURISPRUDENCE else text_type.upper(),
+        "summary": article.get("text") or "Résumé non disponible",
+    }
+
+
+def _format_decision_info(decision: Dict[str, Any]) -> str:
+    """Format a court decision for display."""
+    return f"""
+⚖️ DÉCISION: {decision['title']}
+📅 Date: {decision['lastModified']} | 🏛️ Fonds: {decision['domain']}
+📍 Identifiant: {decision['id']}
+📝 Extrait: {decision['summary'][:300]}...
+"""
+
+
 def _format_legal_text_info(text: Dict[str, Any]) -> str:
     """Format legal text information for display."""
     title = text.get("title", "Texte sans titre")
@@ -309,17 +343,38 @@ def _format_legal_text_info(text: Dict[str, Any]) -> str:
 📅 Dernière modification: {last_modified}
 💼 Domaine: {domain}
 📝 Résumé: {summary[:300]}...
-"""
+""" + (f"🎯 Pertinence: {text['relevance']}\n" if text.get("relevance") else "")
+
+
+def _legal_relevance_scores(documents: List[str], query: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    BM25 scores of a batch of legal documents for a query, and the share of the query terms
+    each one contains, both computed with the French legal analyzer in one vectorized pass.
+    """
+    index = BM25Index.build(documents, tokenizer=legal_tokenize)
+    query_terms = len(set(legal_tokenize(query)))
+    if not query_terms:
+        return np.zeros(len(documents)), np.zeros(len(documents))
+    return index.scores(query), index.term_matches(query) / query_terms
+
+
+def _rank_legal_texts(texts: List[Dict[str, Any]], query: str, rerank: bool = True) -> List[Dict[str, Any]]:
+    """Label legal texts with their relevance to a query and, with `rerank`, sort them by BM25 score."""
+    if not texts:
+        return texts
+    documents = [" ".join([text.get("title", ""), text.get("reference", ""), text.get("summary", "")]) for text in texts]
+    scores, coverage = _legal_relevance_scores(documents, query)
+    order = np.argsort(-scores, kind="stable") if rerank else np.arange(len(texts))
+    return [dict(texts[position], relevance=_relevance_label(coverage[position])) for position in order]
 
 
 def _calculate_legal_relevance_score(text_content: str, query: str) -> str:
     """Calculate relevance score for legal texts."""
-    query_terms = query.lower().split()
-    content_lower = text_content.lower()
-    
-    matches = sum(1 for term in query_terms if term in content_lower)
-    relevance_ratio = matches / len(query_terms) if query_terms else 0
-    
+    _, coverage = _legal_relevance_scores([text_content], query)
+    return _relevance_label(float(coverage[0]))
+
+
+def _relevance_label(relevance_ratio: float) -> str:
     if relevance_ratio > 0.8:
         return "🔥 Très pertinent"
     elif relevance_ratio > 0.6:
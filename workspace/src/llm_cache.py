@@ -0,0 +1,243 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Generator, List, Optional, Union
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from smolagents.models import ChatMessage, ChatMessageStreamDelta, LiteLLMModel, agglomerate_stream_deltas
+from smolagents.monitoring import TokenUsage
+from smolagents.tools import Tool
+
+from workspace.src.completion_engine import TrackedLiteLLMModel
+
+DEFAULT_MODEL_ID = "anthropic/claude-3-5-sonnet-latest"
+
+# Cache location and limits, overridable from the environment
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), '..', '..', '.cache', 'llm_cache.sqlite'),
+)
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024)
+LLM_CACHE_DISABLED = os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+
+class ResponseCache:
+    """
+    Content-addressed store of model responses backed by SQLite.
+
+    Entries expire `ttl_seconds` after they were written. When the stored payloads exceed
+    `max_bytes`, the least recently read entries are evicted first. The cache can be
+    shared by threads and, through SQLite's WAL mode, by several processes.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = LLM_CACHE_TTL_SECONDS, max_bytes: int = LLM_CACHE_MAX_BYTES) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """Hash a JSON-serializable request description into a cache key."""
+        serialized = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._misses += 1
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._hits += 1
+        value: Dict[str, Any] = json.loads(row[0])
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        serialized = json.dumps(value, default=str, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, serialized, len(serialized.encode("utf-8")), now, now),
+            )
+            self._evict_locked(now)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": entries,
+                "size_bytes": size,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def _evict_locked(self, now: float) -> None:
+        expired = self._connection.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        self._evictions += max(expired, 0)
+
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self._evictions += 1
+
+
+def _message_to_cache(message: ChatMessage) -> Dict[str, Any]:
+    data: Dict[str, Any] = json.loads(message.model_dump_json())
+    return data
+
+
+def _message_from_cache(data: Dict[str, Any]) -> ChatMessage:
+    # A cached answer costs no tokens
+    return ChatMessage.from_dict(
+        {"role": data["role"], "content": data.get("content"), "tool_calls": data.get("tool_calls")},
+        token_usage=TokenUsage(input_tokens=0, output_tokens=0),
+    )
+
+
+class CachedLiteLLMModel(TrackedLiteLLMModel):
+    """
+    TrackedLiteLLMModel that answers repeated requests from a ResponseCache.
+
+    The cache key covers the model id, the messages and every completion parameter, so
+    only identical requests share an answer. Usage counters only count real API calls.
+    """
+
+    def __init__(self, *args: Any, cache: ResponseCache, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+
+    def generate(
+        self,
+        messages: List[Union[ChatMessage, Dict[str, Any]]],
+        stop_sequences: Optional[List[str]] = None,
+        response_format: Optional[Dict[str, str]] = None,
+        tools_to_call_from: Optional[List[Tool]] = None,
+        **kwargs: Any,
+    ) -> ChatMessage:
+        key = self._cache_key(messages, stop_sequences, response_format, tools_to_call_from, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return _message_from_cache(cached)
+
+        message = super().generate(
+            messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            **kwargs,
+        )
+        self.cache.set(key, _message_to_cache(message))
+        return message
+
+    def generate_stream(
+        self,
+        messages: List[Union[ChatMessage, Dict[str, Any]]],
+        stop_sequences: Optional[List[str]] = None,
+        response_format: Optional[Dict[str, str]] = None,
+        tools_to_call_from: Optional[List[Tool]] = None,
+        **kwargs: Any,
+    ) -> Generator[ChatMessageStreamDelta, None, None]:
+        key = self._cache_key(messages, stop_sequences, response_format, tools_to_call_from, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield ChatMessageStreamDelta(content=cached.get("content"), token_usage=TokenUsage(input_tokens=0, output_tokens=0))
+            return
+
+        deltas: List[ChatMessageStreamDelta] = []
+        for delta in super().generate_stream(
+            messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            **kwargs,
+        ):
+            deltas.append(delta)
+            yield delta
+        message = agglomerate_stream_deltas(deltas)
+        if not message.tool_calls:
+            self.cache.set(key, _message_to_cache(message))
+
+    def _cache_key(
+        self,
+        messages: List[Union[ChatMessage, Dict[str, Any]]],
+        stop_sequences: Optional[List[str]],
+        response_format: Optional[Dict[str, str]],
+        tools_to_call_from: Optional[List[Tool]],
+        **kwargs: Any,
+    ) -> str:
+        completion_kwargs = self._prepare_completion_kwargs(
+            messages=messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            custom_role_conversions=self.custom_role_conversions,
+            convert_images_to_image_urls=True,
+            **kwargs,
+        )
+        return ResponseCache.make_key({"model_id": self.model_id, "api_base": self.api_base, **completion_kwargs})
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, opening it on first use."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(LLM_CACHE_PATH)
+        return _response_cache
+
+
+def create_model(api_key: Optional[str], model_id: str = DEFAULT_MODEL_ID, **kwargs: Any) -> LiteLLMModel:
+    """Build the model used by the agents, backed by the shared response cache unless disabled."""
+    if LLM_CACHE_DISABLED:
+        return TrackedLiteLLMModel(model_id=model_id, api_key=api_key, **kwargs)
+    return CachedLiteLLMModel(model_id=model_id, api_key=api_key, cache=get_response_cache(), **kwargs)
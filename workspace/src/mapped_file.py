@@ -0,0 +1,262 @@
+import io
+import mmap
+import os
+import random
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Target size of the line-aligned slices a mapped file is scanned in
+MAPPED_CHUNK_BYTES = int(os.getenv("MAPPED_CHUNK_BYTES", str(16 * 1024 * 1024)))
+
+# Line-based formats that can be memory-mapped; JSON documents and spreadsheets are parsed whole
+LINE_FORMATS = (".csv", ".tsv", ".jsonl", ".ndjson", ".txt")
+# Distinct values tracked per text column by column_stats, beyond which only "more than" is reported,
+# and strata kept by stratified_sample, beyond which it gives up
+MAX_TRACKED_DISTINCT = 10000
+MAX_LINE_CHARS = 300
+
+_NEWLINE, _QUOTE = 10, 34
+
+
+class MappedFile:
+    """
+    Read-only memory map of a line-based export (CSV, TSV, JSON lines or text).
+
+    The file is never read as a whole: scans walk line-aligned memoryview slices of the
+    map, which the OS pages in and evicts as needed, so files larger than RAM can be
+    processed. Head, tail and samples seek straight to the bytes they need, and only the
+    lines they return are decoded.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.extension = os.path.splitext(path)[1].lower()
+        self._handle = open(path, "rb")
+        self.size = os.fstat(self._handle.fileno()).st_size
+        # An empty file cannot be mapped
+        self._map: Any = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self.data_start = 0
+        self.header: Optional[List[str]] = None
+        self.separator = ","
+        if self.is_tabular and self.size:
+            header_end = self._line_end(0)
+            line = self._decode(0, header_end)
+            # French spreadsheet exports use semicolons
+            self.separator = "\t" if self.extension == ".tsv" else (";" if line.count(";") > line.count(",") else ",")
+            self.header = pd.read_csv(io.StringIO(line), sep=self.separator, nrows=0).columns.to_list()
+            self.data_start = min(header_end + 1, self.size)
+
+    @property
+    def is_tabular(self) -> bool:
+        return self.extension in (".csv", ".tsv")
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._handle.close()
+
+    def __enter__(self) -> "MappedFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _line_end(self, start: int) -> int:
+        end = self._map.find(b"\n", start)
+        return self.size if end < 0 else end
+
+    def _decode(self, start: int, end: int) -> str:
+        return bytes(self._map[start:end]).decode("utf-8", errors="replace").lstrip("\ufeff").rstrip("\r")
+
+    def iter_chunks(self, chunk_bytes: int = MAPPED_CHUNK_BYTES) -> Iterator[memoryview]:
+        """
+        Yield the data lines (after the header) as zero-copy slices of about `chunk_bytes`,
+        each valid until the next one is requested. Slices end on a line break outside quoted
+        fields, so CSV values spanning lines stay whole.
+        """
+        start = self.data_start
+        while start < self.size:
+            end = min(start + chunk_bytes, self.size)
+            while end < self.size:
+                end = min(self._line_end(end - 1) + 1, self.size)
+                # An odd number of quotes means the break falls inside a quoted field
+                if not self.is_tabular or self._count(_QUOTE, start, end) % 2 == 0:
+                    break
+                end = min(end + chunk_bytes, self.size)
+            with memoryview(self._map)[start:end] as chunk:
+                yield chunk
+            start = end
+
+    def _count(self, byte: int, start: int, end: int) -> int:
+        return int(np.count_nonzero(np.frombuffer(self._map, dtype=np.uint8, count=end - start, offset=start) == byte))
+
+    def count_lines(self, chunk_bytes: int = MAPPED_CHUNK_BYTES) -> int:
+        """Number of data lines, counted over the mapped bytes without copying or decoding them."""
+        lines = sum(self._count(_NEWLINE, start, min(start + chunk_bytes, self.size)) for start in range(self.data_start, self.size, chunk_bytes))
+        if self.size > self.data_start and self._map[self.size - 1] != _NEWLINE:
+            lines += 1
+        return lines
+
+    def head(self, count: int = 5) -> List[str]:
+        """First `count` data lines."""
+        lines: List[str] = []
+        start = self.data_start
+        while start < self.size and len(lines) < count:
+            end = self._line_end(start)
+            lines.append(self._decode(start, end))
+            start = end + 1
+        return [line for line in lines if line]
+
+    def tail(self, count: int = 5) -> List[str]:
+        """Last `count` data lines, found by scanning backwards from the end."""
+        lines: List[str] = []
+        end = self.size
+        if end > self.data_start and self._map[end - 1] == _NEWLINE:
+            end -= 1
+        while end > self.data_start and len(lines) < count:
+            start = max(self._map.rfind(b"\n", self.data_start, end) + 1, self.data_start)
+            lines.append(self._decode(start, end))
+            end = start - 1
+        return [line for line in reversed(lines) if line]
+
+    def sample(self, count: int = 10, seed: int = 0) -> List[str]:
+        """
+        Lines sampled across the whole file: the data is split into `count` equal byte ranges
+        and one line is taken at a random position of each, so every region of a
+        time-ordered log is represented. Costs `count` seeks, whatever the file size.
+        """
+        rng = random.Random(seed)
+        span = self.size - self.data_start
+        lines, seen = [], set()
+        for stratum in range(count):
+            offset = self.data_start + int(span * (stratum + rng.random()) / count)
+            start = max(self._map.rfind(b"\n", self.data_start, offset) + 1, self.data_start)
+            if start in seen or start >= self.size:
+                continue
+            seen.add(start)
+            line = self._decode(start, self._line_end(start))
+            if line:
+                lines.append(line)
+        return lines
+
+    def parse(self, lines: List[str]) -> pd.DataFrame:
+        """Parse data lines of a CSV/TSV file into a frame with the file's columns."""
+        return pd.read_csv(io.StringIO("\n".join(lines)), sep=self.separator, header=None, names=self.header)
+
+    def iter_frames(self, chunk_bytes: int = MAPPED_CHUNK_BYTES) -> Iterator[pd.DataFrame]:
+        """Parse the file chunk by chunk: one frame per chunk, only one chunk decoded at a time."""
+        for chunk in self.iter_chunks(chunk_bytes):
+            buffer = io.BytesIO(chunk)
+            if self.is_tabular:
+                yield pd.read_csv(buffer, sep=self.separator, header=None, names=self.header, encoding="utf-8")
+            else:
+                yield pd.read_json(buffer, lines=True, dtype=False)
+
+    def rows_to_bytes(self, rows: int) -> int:
+        """Chunk size in bytes holding about `rows` lines, estimated from the first lines."""
+        sample = self.head(200)
+        average = sum(len(line) + 1 for line in sample) / len(sample) if sample else 100
+        return max(int(rows * average), 64 * 1024)
+
+    def column_stats(self, chunk_bytes: int = MAPPED_CHUNK_BYTES) -> pd.DataFrame:
+        """
+        One-pass statistics of every column: values, missing values, and min, max, mean and
+        standard deviation of numeric columns or distinct values of text columns.
+        Only running totals are kept between chunks.
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        for frame in self.iter_frames(chunk_bytes):
+            for column in frame.columns:
+                values = frame[column]
+                entry = totals.setdefault(str(column), {"values": 0, "missing": 0, "numeric": 0, "sum": 0.0, "squares": 0.0,
+                                                        "min": np.inf, "max": -np.inf, "distinct": set()})
+                present = values.dropna()
+                entry["values"] += len(present)
+                entry["missing"] += len(values) - len(present)
+                numbers = pd.to_numeric(present, errors="coerce").dropna().to_numpy(dtype=np.float64)
+                if len(numbers):
+                    entry["numeric"] += len(numbers)
+                    entry["sum"] += numbers.sum()
+                    entry["squares"] += np.square(numbers).sum()
+                    entry["min"] = min(entry["min"], numbers.min())
+                    entry["max"] = max(entry["max"], numbers.max())
+                if len(numbers) < len(present) and len(entry["distinct"]) <= MAX_TRACKED_DISTINCT:
+                    entry["distinct"].update(present.astype(str).unique()[:MAX_TRACKED_DISTINCT + 1])
+
+        rows = []
+        for column, entry in totals.items():
+            numeric = entry["numeric"] and entry["numeric"] == entry["values"]
+            row: Dict[str, Any] = {"column": column, "type": "number" if numeric else "text", "values": entry["values"], "missing": entry["missing"]}
+            if numeric:
+                mean = entry["sum"] / entry["numeric"]
+                row.update(min=entry["min"], max=entry["max"], mean=mean,
+                           std=float(np.sqrt(max(entry["squares"] / entry["numeric"] - mean * mean, 0.0))))
+            else:
+                distinct = len(entry["distinct"])
+                # Text, so a capped count and the exact ones print alike next to numeric columns
+                row["distinct"] = f">{MAX_TRACKED_DISTINCT:,}" if distinct > MAX_TRACKED_DISTINCT else f"{distinct:,}"
+            rows.append(row)
+        return pd.DataFrame(rows).set_index("column") if rows else pd.DataFrame()
+
+    def stratified_sample(
+        self,
+        column: str,
+        per_stratum: int = 3,
+        seed: int = 0,
+        chunk_bytes: int = MAPPED_CHUNK_BYTES,
+        max_strata: int = MAX_TRACKED_DISTINCT,
+    ) -> pd.DataFrame:
+        """
+        Up to `per_stratum` random rows of every distinct value of `column` (e.g. a plan or a
+        country), drawn in one pass with a reservoir per value. Raises ValueError as soon as
+        the column has more than `max_strata` distinct values, such as an id or a timestamp.
+        """
+        rng = np.random.default_rng(seed)
+        reservoirs: Dict[Any, List[Tuple[float, Dict[str, Any]]]] = {}
+        for frame in self.iter_frames(chunk_bytes):
+            # Keeping the rows with the smallest random keys draws a uniform sample of each value
+            frame = frame.assign(_key=rng.random(len(frame)))
+            kept = frame.sort_values("_key").groupby(column, sort=False, dropna=False).head(per_stratum)
+            for record in kept.to_dict("records"):
+                value = record[column]
+                value = None if pd.isna(value) else value
+                if value not in reservoirs and len(reservoirs) >= max_strata:
+                    raise ValueError(f"{column!r} has more than {max_strata:,} distinct values, too many to sample each")
+                reservoir = reservoirs.setdefault(value, [])
+                reservoir.append((record.pop("_key"), record))
+                if len(reservoir) > per_stratum:
+                    reservoir.sort(key=lambda item: item[0])
+                    del reservoir[per_stratum:]
+        rows = [record for value in reservoirs for _, record in sorted(reservoirs[value], key=lambda item: item[0])]
+        return pd.DataFrame(rows, columns=self.header)
+
+
+def _format_size(size: int) -> str:
+    return f"{size / 1e6:,.1f} MB" if size >= 100_000 else f"{size / 1e3:,.1f} KB"
+
+
+def _shorten(line: str) -> str:
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS] + "…"
+
+
+def profile_file(path: str, rows: int = 5, chunk_bytes: int = MAPPED_CHUNK_BYTES) -> str:
+    """
+    Compact profile of a large export for a prompt: size, line count, column statistics
+    (CSV/TSV), and its first, last and sampled lines.
+    """
+    with MappedFile(path) as mapped:
+        lines = [f"File: {os.path.basename(path)} ({_format_size(mapped.size)}, {mapped.count_lines(chunk_bytes):,} data lines)"]
+        if mapped.header:
+            lines.append(f"Columns: {', '.join(map(str, mapped.header))}")
+            stats = mapped.column_stats(chunk_bytes)
+            if not stats.empty:
+                lines.append("")
+                lines.append("Column statistics:")
+                lines.append(stats.to_string(float_format=lambda value: f"{value:,.2f}", na_rep=""))
+        for title, sample in (("First lines", mapped.head(rows)), ("Last lines", mapped.tail(rows)), ("Sampled lines", mapped.sample(rows))):
+            lines.append("")
+            lines.append(f"{title}:")
+            lines.extend(_shorten(line) for line in sample)
+    return "\n".join(lines)
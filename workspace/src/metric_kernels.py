@@ -0,0 +1,196 @@
+"""
+Vectorized KPI kernels for startup metrics.
+
+Series kernels take monthly values as NumPy arrays, one month per element along the last
+axis, so a 2-D array computes the KPI of many startups at once. Activity kernels take
+customer-level rows as parallel arrays of integer customer codes, integer month
+ordinals and revenue, and run in a constant number of NumPy passes over the rows.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+def _as_float(values: npt.ArrayLike) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _divide(numerator: npt.ArrayLike, denominator: npt.ArrayLike) -> np.ndarray:
+    numerator, denominator = _as_float(numerator), _as_float(denominator)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1.0), np.nan)
+
+
+def period_growth(values: npt.ArrayLike, periods: int = 1) -> np.ndarray:
+    """Growth over `periods` months for every month (NaN for the first `periods` months): 1 is MoM, 12 is YoY."""
+    values = _as_float(values)
+    growth = np.full(values.shape, np.nan)
+    if values.shape[-1] > periods:
+        growth[..., periods:] = _divide(values[..., periods:], values[..., :-periods]) - 1
+    return growth
+
+
+def cmgr(values: npt.ArrayLike, months: Optional[int] = None) -> np.ndarray:
+    """Compound monthly growth rate over the last `months` months (the whole series by default)."""
+    values = _as_float(values)
+    months = min(months or values.shape[-1] - 1, values.shape[-1] - 1)
+    if months < 1:
+        return np.full(values.shape[:-1], np.nan)
+    first, last = values[..., -months - 1], values[..., -1]
+    ratio = _divide(last, first)
+    with np.errstate(invalid="ignore"):
+        return np.where(ratio > 0, ratio ** (1.0 / months) - 1, np.nan)
+
+
+def _window_differences(cumulative: np.ndarray, window: int) -> np.ndarray:
+    """Totals of every full trailing window, from cumulative sums along the last axis."""
+    totals = cumulative[..., window - 1:].copy()
+    totals[..., 1:] -= cumulative[..., :-window]
+    return totals
+
+
+def rolling_sum(values: npt.ArrayLike, window: int) -> np.ndarray:
+    """
+    Sum of every trailing `window` months: NaN until a full window is available, and for
+    the windows containing a missing month, but not after them.
+    """
+    values = _as_float(values)
+    totals = np.full(values.shape, np.nan)
+    if window <= values.shape[-1]:
+        missing = np.isnan(values)
+        # A plain cumulative sum would carry a NaN into every later window
+        sums = _window_differences(np.cumsum(np.where(missing, 0.0, values), axis=-1), window)
+        gaps = _window_differences(np.cumsum(missing, axis=-1), window)
+        totals[..., window - 1:] = np.where(gaps > 0, np.nan, sums)
+    return totals
+
+
+def rolling_mean(values: npt.ArrayLike, window: int) -> np.ndarray:
+    """Mean of every trailing `window` months (NaN until a full window is available)."""
+    return rolling_sum(values, window) / window
+
+
+def logo_churn(customers: npt.ArrayLike, churned: npt.ArrayLike) -> np.ndarray:
+    """Monthly logo churn: customers lost in a month over customers at the end of the previous month."""
+    rates = np.full(_as_float(customers).shape, np.nan)
+    rates[..., 1:] = _divide(_as_float(churned)[..., 1:], _as_float(customers)[..., :-1])
+    return rates
+
+
+def ltv(arpu: npt.ArrayLike, churn_rate: npt.ArrayLike, gross_margin: float = 1.0) -> np.ndarray:
+    """Customer lifetime value: monthly gross profit per customer over monthly churn."""
+    return _divide(_as_float(arpu) * gross_margin, churn_rate)
+
+
+def ltv_cac(arpu: npt.ArrayLike, churn_rate: npt.ArrayLike, cac: npt.ArrayLike, gross_margin: float = 1.0) -> np.ndarray:
+    """LTV to CAC ratio."""
+    return _divide(ltv(arpu, churn_rate, gross_margin), cac)
+
+
+def cac_payback(cac: npt.ArrayLike, arpu: npt.ArrayLike, gross_margin: float = 1.0) -> np.ndarray:
+    """Months of gross profit per customer needed to recover the acquisition cost."""
+    return _divide(cac, _as_float(arpu) * gross_margin)
+
+
+def burn_multiple(burn: npt.ArrayLike, mrr: npt.ArrayLike, window: int = 3) -> np.ndarray:
+    """Net burn over net new ARR of every trailing `window` months (NaN when ARR did not grow)."""
+    mrr = _as_float(mrr)
+    net_new_arr = np.full(mrr.shape, np.nan)
+    if mrr.shape[-1] > window:
+        net_new_arr[..., window:] = (mrr[..., window:] - mrr[..., :-window]) * 12
+    return _divide(rolling_sum(burn, window), net_new_arr)
+
+
+def aggregate_activity(customers: npt.ArrayLike, months: npt.ArrayLike, revenue: Optional[npt.ArrayLike] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sum the revenue of rows sharing a customer and month, and return the (customer,
+    month, revenue) arrays sorted by customer then month, as the other activity kernels expect.
+    """
+    customers = np.asarray(customers, dtype=np.int64)
+    months = np.asarray(months, dtype=np.int64)
+    revenue = np.ones(len(customers)) if revenue is None else _as_float(revenue)
+    if not len(customers):
+        return customers, months, revenue
+    first_month = months.min()
+    # One int64 key per row orders rows by customer, then month, in a single sort
+    keys = customers * (months.max() - first_month + 1) + (months - first_month)
+    order = np.argsort(keys)
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return customers[order][starts], months[order][starts], np.add.reduceat(revenue[order], starts)
+
+
+def _continuations(customers: np.ndarray, months: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """For sorted activity rows: whether each row is its customer's first, and whether the customer is active the next month."""
+    same_customer = customers[1:] == customers[:-1]
+    first = np.concatenate(([True], ~same_customer))
+    continues = np.concatenate((same_customer & (months[1:] == months[:-1] + 1), [False]))
+    return first, continues
+
+
+def monthly_activity(customers: npt.ArrayLike, months: npt.ArrayLike, revenue: npt.ArrayLike, start: int, size: int) -> Dict[str, np.ndarray]:
+    """
+    MRR, active, new and churned customers of `size` months from ordinal `start`, from
+    sorted activity rows. A customer active in a month and not in the next churned in the next.
+    """
+    months = np.asarray(months, dtype=np.int64)
+    first, continues = _continuations(np.asarray(customers), months)
+    offsets = months - start
+    last = start + size - 1
+    churned = offsets[~continues & (months < last)] + 1
+    return {
+        "mrr": np.bincount(offsets, weights=_as_float(revenue), minlength=size),
+        "customers": np.bincount(offsets, minlength=size).astype(np.float64),
+        "new_customers": np.bincount(offsets[first], minlength=size).astype(np.float64),
+        "churned_customers": np.bincount(churned, minlength=size).astype(np.float64),
+    }
+
+
+def revenue_retention(
+    customers: npt.ArrayLike, months: npt.ArrayLike, revenue: npt.ArrayLike, start: int, size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Monthly gross revenue churn and net revenue retention from sorted activity rows: for
+    customers paying the previous month, revenue lost and revenue kept (with expansion)
+    over what they paid then. Both are NaN for the first month.
+    """
+    months = np.asarray(months, dtype=np.int64)
+    revenue = _as_float(revenue)
+    _, continues = _continuations(np.asarray(customers), months)
+    next_revenue = np.zeros(len(revenue))
+    next_revenue[continues] = revenue[np.flatnonzero(continues) + 1]
+    paying = (revenue > 0) & (months < start + size - 1)
+    offsets = months[paying] - start + 1
+    base = np.bincount(offsets, weights=revenue[paying], minlength=size + 1)[:size]
+    lost = np.bincount(offsets, weights=np.clip(revenue - next_revenue, 0, None)[paying], minlength=size + 1)[:size]
+    kept = np.bincount(offsets, weights=next_revenue[paying], minlength=size + 1)[:size]
+    base[0] = np.nan
+    return _divide(lost, base), _divide(kept, base)
+
+
+def cohort_counts(customers: npt.ArrayLike, months: npt.ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Active customers of every monthly cohort by age, from sorted activity rows: returns the
+    cohort month ordinals and a (cohorts x ages) matrix whose column 0 is the cohort size.
+    """
+    customers = np.asarray(customers)
+    months = np.asarray(months, dtype=np.int64)
+    if not len(months):
+        return np.empty(0, dtype=np.int64), np.empty((0, 0))
+    first, _ = _continuations(customers, months)
+    # Rows are grouped by customer, so each row's cohort is the month of its group's first row
+    cohort = months[first][np.cumsum(first) - 1]
+    ages = months - cohort
+    cohort_months, cohort_index = np.unique(cohort, return_inverse=True)
+    width = int(ages.max()) + 1
+    counts = np.bincount(cohort_index * width + ages, minlength=len(cohort_months) * width)
+    return cohort_months, counts.reshape(len(cohort_months), width).astype(np.float64)
+
+
+def cohort_retention(cohort_months: npt.ArrayLike, counts: np.ndarray, last_month: int) -> np.ndarray:
+    """Share of each cohort still active at every age; NaN for ages a cohort has not reached by `last_month`."""
+    retention = _divide(counts, counts[:, :1])
+    observable = np.asarray(cohort_months)[:, None] + np.arange(counts.shape[1])[None, :] <= last_month
+    return np.where(observable, retention, np.nan)
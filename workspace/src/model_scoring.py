@@ -0,0 +1,92 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Popularity score = downloads * 0.7 + likes * 0.3, bucketed by these lower bounds (highest first)
+POPULARITY_WEIGHTS = (0.7, 0.3)
+POPULARITY_THRESHOLDS = (100000, 10000, 1000, 100)
+POPULARITY_LABELS = ("🔥 Very High", "🚀 High", "📈 Medium", "🌱 Growing", "🆕 New/Niche")
+
+# Tag keywords that mark a model as complex to implement
+HIGH_COMPLEXITY_KEYWORDS = ("large", "xl", "xxl", "billion", "multimodal")
+MEDIUM_COMPLEXITY_KEYWORDS = ("medium", "base", "transformer")
+
+# Recommendation tiers, best first, with their display text
+RECOMMENDATION_TIERS = ("strong_buy", "moderate_buy", "cautious", "high_risk")
+RECOMMENDATION_LABELS = {
+    "strong_buy": "🟢 STRONG BUY - Proven market demand and community support",
+    "moderate_buy": "🟡 MODERATE BUY - Good traction, monitor growth",
+    "cautious": "🟠 CAUTIOUS - Early stage, requires deeper analysis",
+    "high_risk": "🔴 HIGH RISK - Unproven technology, significant market risk",
+}
+
+SCORE_COLUMNS = [
+    "id", "downloads", "likes", "pipeline_tag", "library_name",
+    "popularity_score", "popularity", "complexity", "risk_level", "recommendation_tier", "recommendation",
+]
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> str:
+    return "|".join(sorted(keywords, key=len, reverse=True))
+
+
+def models_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Load Hub model records into columns, one row per model."""
+    return pd.DataFrame({
+        "id": [record.get("id", record.get("modelId", "Unknown")) for record in records],
+        "downloads": np.fromiter((record.get("downloads") or 0 for record in records), dtype=np.int64, count=len(records)),
+        "likes": np.fromiter((record.get("likes") or 0 for record in records), dtype=np.int64, count=len(records)),
+        "pipeline_tag": [record.get("pipeline_tag") or "" for record in records],
+        "library_name": [record.get("library_name") or "" for record in records],
+        # Tags are lowercased and joined once so every keyword test runs over a single string column
+        "tags_text": pd.Series(["\n".join(record.get("tags") or []).lower() for record in records], dtype=object),
+    })
+
+
+def score_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Compute popularity, complexity, risk and recommendation columns for a frame of models."""
+    downloads = frame["downloads"].to_numpy()
+    likes = frame["likes"].to_numpy()
+
+    popularity_score = downloads * POPULARITY_WEIGHTS[0] + likes * POPULARITY_WEIGHTS[1]
+    popularity_bucket = np.searchsorted(-np.asarray(POPULARITY_THRESHOLDS, dtype=np.float64), -popularity_score, side="right")
+
+    is_high = frame["tags_text"].str.contains(_keyword_pattern(HIGH_COMPLEXITY_KEYWORDS), regex=True).to_numpy(dtype=bool)
+    is_medium = frame["tags_text"].str.contains(_keyword_pattern(MEDIUM_COMPLEXITY_KEYWORDS), regex=True).to_numpy(dtype=bool)
+    complexity = np.select([is_high, is_medium], ["High", "Medium"], default="Low")
+
+    risk_level = np.select([downloads < 100, downloads < 1000], ["High", "Medium"], default="Low")
+
+    tier_index = np.select(
+        [(downloads > 50000) & (likes > 100), (downloads > 10000) & (likes > 50), downloads > 1000],
+        [0, 1, 2],
+        default=3,
+    )
+    tiers = np.asarray(RECOMMENDATION_TIERS, dtype=object)[tier_index]
+
+    return frame.drop(columns=["tags_text"]).assign(
+        popularity_score=popularity_score,
+        popularity=np.asarray(POPULARITY_LABELS, dtype=object)[popularity_bucket],
+        complexity=complexity,
+        risk_level=risk_level,
+        recommendation_tier=tiers,
+        recommendation=np.asarray([RECOMMENDATION_LABELS[tier] for tier in RECOMMENDATION_TIERS], dtype=object)[tier_index],
+        tier_index=tier_index,
+    )
+
+
+def rank_frame(scored: pd.DataFrame, limit: Optional[int] = None) -> pd.DataFrame:
+    """Order scored models from most to least investable: tier, then downloads, then likes."""
+    order = np.lexsort((-scored["likes"].to_numpy(), -scored["downloads"].to_numpy(), scored["tier_index"].to_numpy()))
+    if limit is not None:
+        order = order[:limit]
+    return scored.iloc[order].reset_index(drop=True)
+
+
+def score_models(records: List[Dict[str, Any]], rank: bool = False, limit: Optional[int] = None) -> pd.DataFrame:
+    """Score a page of Hub model records, optionally ranked, returning SCORE_COLUMNS."""
+    scored = score_frame(models_frame(records))
+    if rank:
+        scored = rank_frame(scored, limit)
+    return scored[SCORE_COLUMNS]
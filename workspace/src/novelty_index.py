@@ -0,0 +1,284 @@
+import os
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.paper_index import HF_PAPERS_DUMP_PATH, PaperIndex, get_paper_index
+from workspace.src.text_index import tokenize
+
+# Novelty = 1 - mean cosine similarity to the nearest prior papers, bucketed by these lower bounds
+NOVELTY_LEVELS = [
+    (0.75, "🚀 HIGHLY NOVEL - Little closely related prior work"),
+    (0.55, "⭐ NOVEL - Related work exists but the approach differs substantially"),
+    (0.35, "📈 INCREMENTAL - Close to existing papers"),
+    (0.0, "🔁 DERIVATIVE - Near-duplicate of prior work"),
+]
+
+
+def novelty_label(score: float) -> str:
+    for threshold, label in NOVELTY_LEVELS:
+        if score >= threshold:
+            return label
+    return NOVELTY_LEVELS[-1][1]
+
+
+class _BucketCodes(Dict[str, int]):
+    """Memoized signed bucket of each term: bucket + 1, negated for a negative sign."""
+
+    def __init__(self, n_features: int) -> None:
+        super().__init__()
+        self.n_features = n_features
+
+    def __missing__(self, term: str) -> int:
+        digest = zlib.crc32(term.encode("utf-8"))
+        code = digest % self.n_features + 1
+        code = code if digest & 0x80000000 else -code
+        self[term] = code
+        return code
+
+
+class HashedTfidfEmbedder:
+    """
+    Embeds texts as L2-normalized TF-IDF vectors of hashed unigrams and bigrams.
+
+    Terms are hashed into `n_features` signed buckets (the hashing trick), so no
+    vocabulary is stored and any text can be embedded. IDF weights are learned per bucket
+    by fit().
+    """
+
+    def __init__(self, n_features: int = 512, idf: Optional[np.ndarray] = None) -> None:
+        self.n_features = n_features
+        self.idf = idf if idf is not None else np.ones(n_features, dtype=np.float32)
+        self._codes = _BucketCodes(n_features)
+
+    def _raw(self, texts: Sequence[str]) -> np.ndarray:
+        """Signed, sublinear term counts per bucket, without IDF or normalization."""
+        codes = self._codes
+        lengths = []
+        flat: List[int] = []
+        for text in texts:
+            tokens = tokenize(text)
+            terms = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+            flat.extend([codes[term] for term in terms])
+            lengths.append(len(terms))
+        signed = np.asarray(flat, dtype=np.int64)
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        # One bincount over (row, bucket) cells for the whole batch
+        cells = rows * self.n_features + np.abs(signed) - 1
+        matrix = np.bincount(cells, weights=np.sign(signed), minlength=len(texts) * self.n_features)
+        matrix = matrix.reshape(len(texts), self.n_features).astype(np.float32)
+        return np.sign(matrix) * np.log1p(np.abs(matrix))
+
+    def _raw_chunks(self, texts: Sequence[str], chunk_size: int) -> Iterable[np.ndarray]:
+        for start in range(0, len(texts), chunk_size):
+            yield self._raw(texts[start:start + chunk_size])
+
+    def _normalize(self, raw: np.ndarray) -> np.ndarray:
+        vectors = raw * self.idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        normalized: np.ndarray = vectors / np.where(norms == 0, 1, norms)
+        return normalized
+
+    def fit_transform(self, texts: Sequence[str], chunk_size: int = 10000) -> np.ndarray:
+        """Learn IDF weights from texts and return their vectors."""
+        raw = np.concatenate(list(self._raw_chunks(texts, chunk_size))) if len(texts) else np.zeros((0, self.n_features), dtype=np.float32)
+        document_frequency = (raw != 0).sum(axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self._normalize(raw)
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        return self._normalize(self._raw(texts))
+
+
+class NearestNeighborIndex:
+    """
+    Approximate cosine nearest-neighbor search over unit vectors (an inverted file index).
+
+    Vectors are partitioned around k-means centroids; a query is only compared with the
+    vectors of its `n_probe` closest partitions. Small collections are searched exactly.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        centroids: Optional[np.ndarray] = None,
+        seed: int = 0,
+    ) -> None:
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.n_probe = n_probe
+        count = len(self.vectors)
+        n_lists = n_lists or (int(np.sqrt(count)) if count >= 5000 else 0)
+
+        self.centroids = centroids
+        if self.centroids is None and n_lists:
+            self.centroids = self._train_centroids(n_lists, seed)
+        self.lists: List[np.ndarray] = []
+        if self.centroids is not None:
+            assignments = self._nearest_centroids(self.vectors, 1)[:, 0]
+            order = np.argsort(assignments, kind="stable")
+            bounds = np.searchsorted(assignments[order], np.arange(len(self.centroids) + 1))
+            self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def _train_centroids(self, n_lists: int, seed: int, iterations: int = 10, sample_size: int = 50000) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        sample = self.vectors[rng.choice(len(self.vectors), min(sample_size, len(self.vectors)), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignments, kind="stable")
+            counts = np.bincount(assignments, minlength=n_lists)
+            sums = np.zeros_like(centroids)
+            present = counts > 0
+            sums[present] = np.add.reduceat(sample[order], np.concatenate([[0], np.cumsum(counts)[:-1]])[present], axis=0)
+            empty = ~present
+            # Empty partitions are reseeded with random sample vectors
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+        return centroids.astype(np.float32)
+
+    def _nearest_centroids(self, queries: np.ndarray, count: int) -> np.ndarray:
+        centroids = self.centroids
+        assert centroids is not None, "the index has no partitions"
+        similarities = queries @ centroids.T
+        count = min(count, len(centroids))
+        top = np.argpartition(-similarities, count - 1, axis=1)[:, :count]
+        return top
+
+    def search(self, queries: np.ndarray, k: int = 5, exclude: Optional[Sequence[Iterable[int]]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (similarities, ids) of the k nearest vectors to each query, best first. Missing
+        neighbors have id -1 and similarity -inf. `exclude` lists, per query, ids to skip.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        similarities = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        if not len(self.vectors):
+            return similarities, ids
+
+        probes = self._nearest_centroids(queries, self.n_probe) if self.lists else None
+        for row, query in enumerate(queries):
+            if probes is None:
+                candidates = np.arange(len(self.vectors))
+                scores = self.vectors @ query
+            else:
+                candidates = np.concatenate([self.lists[probe] for probe in probes[row]])
+                scores = self.vectors[candidates] @ query
+            if exclude is not None and exclude[row]:
+                scores = np.where(np.isin(candidates, list(exclude[row])), -np.inf, scores)
+            count = min(k, len(candidates))
+            if count == 0:
+                continue
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            similarities[row, :count] = scores[top]
+            ids[row, :count] = np.where(np.isfinite(scores[top]), candidates[top], -1)
+        return similarities, ids
+
+
+def _paper_text(paper: Dict[str, Any]) -> str:
+    return f"{paper.get('title', '')} {paper.get('summary', '')}"
+
+
+class NoveltyIndex:
+    """Scores how novel a paper is by its distance to the nearest papers of a corpus."""
+
+    def __init__(self, papers: List[Dict[str, Any]], embedder: HashedTfidfEmbedder, index: NearestNeighborIndex) -> None:
+        self.papers = papers
+        self.embedder = embedder
+        self.index = index
+        self._positions = {paper.get("arxiv_id"): position for position, paper in enumerate(papers)}
+
+    @classmethod
+    def build(cls, papers: List[Dict[str, Any]], n_features: int = 512, chunk_size: int = 10000) -> "NoveltyIndex":
+        embedder = HashedTfidfEmbedder(n_features)
+        vectors = embedder.fit_transform([_paper_text(paper) for paper in papers], chunk_size)
+        return cls(papers, embedder, NearestNeighborIndex(vectors))
+
+    @classmethod
+    def from_paper_index(cls, paper_index: PaperIndex, path: Optional[str] = None, signature: str = "") -> "NoveltyIndex":
+        """
+        Build the novelty index of a paper dump, or load the copy saved at `path` by a
+        previous build with the same `signature` (a description of the dump's version).
+        """
+        if path and os.path.exists(path):
+            with np.load(path, allow_pickle=False) as data:
+                if str(data["signature"]) == signature and len(data["vectors"]) == len(paper_index):
+                    embedder = HashedTfidfEmbedder(int(data["idf"].shape[0]), data["idf"])
+                    centroids = data["centroids"] if data["centroids"].size else None
+                    return cls(paper_index.papers, embedder, NearestNeighborIndex(data["vectors"], centroids=centroids))
+
+        started = time.perf_counter()
+        novelty_index = cls.build(paper_index.papers)
+        print(f"Built novelty index for {len(paper_index)} papers in {time.perf_counter() - started:.1f}s")
+        if path:
+            try:
+                centroids = novelty_index.index.centroids
+                np.savez(
+                    path,
+                    vectors=novelty_index.index.vectors,
+                    idf=novelty_index.embedder.idf,
+                    centroids=centroids if centroids is not None else np.zeros((0, 0), dtype=np.float32),
+                    signature=np.asarray(signature),
+                )
+            except OSError as e:
+                print(f"Could not save novelty index to {path}: {e}")
+        return novelty_index
+
+    def score_batch(self, texts: Sequence[str], k: int = 5, exclude_ids: Optional[Sequence[Optional[str]]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score a batch of texts. Returns (novelty scores, neighbor similarities, neighbor
+        positions in `papers`); `exclude_ids` gives, per text, an arXiv id not to compare with.
+        """
+        exclude = None
+        if exclude_ids is not None:
+            exclude = [[self._positions[paper_id]] if paper_id in self._positions else [] for paper_id in exclude_ids]
+        similarities, neighbors = self.index.search(self.embedder.transform(texts), k, exclude)
+        found = np.isfinite(similarities)
+        mean_similarity = np.where(found, similarities, 0).sum(axis=1) / np.maximum(found.sum(axis=1), 1)
+        novelty = np.clip(1 - mean_similarity, 0, 1)
+        novelty[~found.any(axis=1)] = 1.0
+        return novelty, similarities, neighbors
+
+    def score(self, title: str, abstract: str = "", k: int = 5, exclude_id: Optional[str] = None) -> Dict[str, Any]:
+        """Novelty score, label and nearest papers for one paper."""
+        novelty, similarities, neighbors = self.score_batch([f"{title} {abstract}"], k, [exclude_id])
+        nearest = [
+            (self.papers[position], float(similarity))
+            for position, similarity in zip(neighbors[0], similarities[0])
+            if position >= 0
+        ]
+        return {"score": float(novelty[0]), "label": novelty_label(float(novelty[0])), "neighbors": nearest}
+
+
+_novelty_index: Optional[NoveltyIndex] = None
+_novelty_index_source: Optional[PaperIndex] = None
+_novelty_index_lock = threading.Lock()
+
+
+def get_novelty_index() -> Optional[NoveltyIndex]:
+    """Return the novelty index of the configured paper dump, building it on first use, or None without a dump."""
+    global _novelty_index, _novelty_index_source
+    paper_index = get_paper_index()
+    if paper_index is None:
+        return None
+    with _novelty_index_lock:
+        if _novelty_index is None or _novelty_index_source is not paper_index:
+            path, signature = None, ""
+            if HF_PAPERS_DUMP_PATH and os.path.exists(HF_PAPERS_DUMP_PATH):
+                stat = os.stat(HF_PAPERS_DUMP_PATH)
+                path, signature = f"{HF_PAPERS_DUMP_PATH}.novelty.npz", f"{stat.st_size}:{stat.st_mtime}"
+            _novelty_index = NoveltyIndex.from_paper_index(paper_index, path, signature)
+            _novelty_index_source = paper_index
+        return _novelty_index
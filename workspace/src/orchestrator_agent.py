@@ -1,8 +1,10 @@
 # mypy: ignore-errors
 import sys
 import os
+import re
+import time
 from dotenv import load_dotenv
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Callable, Dict, Tuple
 
 # Load environment variables
 load_dotenv()
@@ -13,14 +15,66 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 # Import necessary components from smolagents
 from smolagents import CodeAgent, ToolCallingAgent  # type: ignore
-from smolagents.models import LiteLLMModel  # type: ignore
+from smolagents.models import LiteLLMModel, ChatMessageStreamDelta  # type: ignore
+from smolagents.memory import ActionStep, PlanningStep, FinalAnswerStep, ToolCall  # type: ignore
 from workspace.src.brainstorming import BrainstormingAgent  # type: ignore
 from workspace.src.data_analyst_agent import VCDataAnalystAgent  # type: ignore
+from workspace.src.portfolio_analysis import is_portfolio_source  # type: ignore
+from workspace.src.query_router import ROUTER_DIRECT_CONFIDENCE, Route, get_query_router  # type: ignore
 from workspace.src.technical_assistant import TechnicalAssistant  # type: ignore
 from workspace.src.legal_assistant import LegalAssistant  # type: ignore
+from workspace.src.huggingface_search import search_models, analyze_model_feasibility, compare_model_feasibility  # type: ignore
+from workspace.src.hf_papers_search import search_papers, analyze_paper_novelty  # type: ignore
+from workspace.src.legifrance_search import search_legal_texts, analyze_legal_compliance, search_jurisprudence  # type: ignore
+from workspace.src.orchestrator_pool import OrchestratorPool  # type: ignore
+from workspace.src.llm_cache import create_model  # type: ignore
+
+# Agents used when a request does not specify any
+DEFAULT_AGENTS = ["brainstorming", "hello", "data_analyst", "technical_assistant", "legal_assistant"]
+
+_METRICS_FILE_PATTERN = re.compile(r"\.(?:csv|tsv|json|jsonl|ndjson|xlsx|txt)$", re.IGNORECASE)
+
+# The metrics file, directory or glob pattern named in a request, if any
+def _metrics_path(user_input: str) -> Optional[str]:
+    for word in user_input.split():
+        word = word.lstrip("'\"`(").rstrip("'\"`.,;:!?)")
+        if _METRICS_FILE_PATTERN.search(word) or "*" in word or os.path.isdir(word):
+            return word
+    return None
+
+# Base class for managed agents so that their calls can be reported while streaming
+class ManagedAgentWrapper(ToolCallingAgent):
+    # Set by stream_orchestrator for the duration of a streamed run
+    event_sink: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    def __call__(self, task: str, **kwargs):
+        return self._reported(task, lambda: super(ManagedAgentWrapper, self).__call__(task, **kwargs))
+
+    # Run a task routed straight to this agent, reported like a call from the manager
+    def run_direct(self, task: str) -> str:
+        return self._reported(task, lambda: self.run(task))
+
+    def _reported(self, task: str, call: Callable[[], Any]):
+        if self.event_sink is None:
+            return call()
+
+        self.event_sink({"type": "agent_call", "agent": self.name, "task": task})
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            self.event_sink({"type": "agent_error", "agent": self.name, "error": str(e)})
+            raise
+        self.event_sink({
+            "type": "agent_result",
+            "agent": self.name,
+            "duration": time.perf_counter() - start,
+            "output": str(result),
+        })
+        return result
 
 # Create a wrapper for BrainstormingAgent to make it work as a managed agent
-class BrainstormingAgentWrapper(ToolCallingAgent):
+class BrainstormingAgentWrapper(ManagedAgentWrapper):
     def __init__(self, brainstorming_agent: BrainstormingAgent, model: LiteLLMModel, default_mode: str = "SCAMPER"):
         super().__init__(
             tools=[],  # No tools needed, we'll use the internal agent
@@ -41,7 +95,7 @@ class BrainstormingAgentWrapper(ToolCallingAgent):
         return self.brainstorming_agent.generate_ideas(mode, query)
 
 # Create a simple Hello agent
-class HelloAgent(ToolCallingAgent):
+class HelloAgent(ManagedAgentWrapper):
     def __init__(self, model: LiteLLMModel):
         super().__init__(
             tools=[],
@@ -56,13 +110,13 @@ class HelloAgent(ToolCallingAgent):
         return result
 
 # Create a wrapper for VCDataAnalystAgent to make it work as a managed agent
-class VCDataAnalystAgentWrapper(ToolCallingAgent):
+class VCDataAnalystAgentWrapper(ManagedAgentWrapper):
     def __init__(self, data_analyst_agent: VCDataAnalystAgent, model: LiteLLMModel):
         super().__init__(
             tools=[], # No tools needed, we'll use the internal agent
             model=model,
             name="data_analyst",
-            description="Analyzes startup data from a VC perspective, focusing on growth and churn."
+            description="Analyzes a startup metrics file (CSV, JSON, XLSX or TXT path) from a VC perspective, focusing on growth and churn. Given a directory or glob pattern of such files, analyzes the whole portfolio and returns a ranked report."
         )
         self.data_analyst_agent = data_analyst_agent
 
@@ -72,19 +126,18 @@ class VCDataAnalystAgentWrapper(ToolCallingAgent):
         if not file_path:
             return "Please provide a file path to analyze."
         
+        if is_portfolio_source(file_path):
+            return self.data_analyst_agent.analyze_portfolio(file_path) # type: ignore
+
         # Call the analyze method of the internal VCDataAnalystAgent
         result = self.data_analyst_agent.analyze(file_path) # type: ignore
         return result # type: ignore
 
 # Create a wrapper for TechnicalAssistant to make it work as a managed agent
-class TechnicalAssistantWrapper(ToolCallingAgent):
+class TechnicalAssistantWrapper(ManagedAgentWrapper):
     def __init__(self, technical_assistant: TechnicalAssistant, model: LiteLLMModel):
-        # Import the tools to make them available
-        from workspace.src.huggingface_search import search_models, analyze_model_feasibility
-        from workspace.src.hf_papers_search import search_papers, analyze_paper_novelty
-        
         super().__init__(
-            tools=[search_models, search_papers, analyze_model_feasibility, analyze_paper_novelty],  # Include the tools
+            tools=[search_models, search_papers, analyze_model_feasibility, compare_model_feasibility, analyze_paper_novelty],  # Include the tools
             model=model,
             name="technical_assistant",
             description="Analyzes AI projects for technical feasibility, novelty, and investment potential. Provides comprehensive analysis using HuggingFace models and papers."
@@ -92,29 +145,13 @@ class TechnicalAssistantWrapper(ToolCallingAgent):
         self.technical_assistant = technical_assistant
     
     def run(self, query: str) -> str:
-        # Determine what type of analysis to perform based on the query
-        query_lower = query.lower()
-        
-        # For research queries, directly use the agent to leverage tools
-        if "research" in query_lower or "latest" in query_lower or "developments" in query_lower:
-            # Research latest developments - this needs the tools
-            return self.technical_assistant.research_latest_developments(query)
-        elif "novelty" in query_lower or "novel" in query_lower or "technique" in query_lower:
-            # Technique novelty evaluation
-            return self.technical_assistant.evaluate_technique_novelty(query)
-        elif "project" in query_lower or "analyze" in query_lower or "investment" in query_lower:
-            # Full project analysis
-            return self.technical_assistant.analyze_ai_project(query)
-        else:
-            # Default to research if no clear indicator
-            return self.technical_assistant.research_latest_developments(query)
+        # The router picks the analysis (research, novelty or full project); research when unsure
+        method = get_query_router().method(self.name, query, default="research_latest_developments")
+        return getattr(self.technical_assistant, method)(query)
 
 # Create a wrapper for LegalAssistant to make it work as a managed agent
-class LegalAssistantWrapper(ToolCallingAgent):
+class LegalAssistantWrapper(ManagedAgentWrapper):
     def __init__(self, legal_assistant: LegalAssistant, model: LiteLLMModel):
-        # Import the tools to make them available
-        from workspace.src.legifrance_search import search_legal_texts, analyze_legal_compliance, search_jurisprudence
-        
         super().__init__(
             tools=[search_legal_texts, analyze_legal_compliance, search_jurisprudence],  # Include the tools
             model=model,
@@ -124,28 +161,11 @@ class LegalAssistantWrapper(ToolCallingAgent):
         self.legal_assistant = legal_assistant
     
     def run(self, query: str) -> str:
-        # Determine what type of analysis to perform based on the query
-        query_lower = query.lower()
-        
-        if "startup" in query_lower or "investment" in query_lower or "framework" in query_lower:
-            # Analyze startup legal framework
-            # This is a simplified call; in a real scenario, you'd parse startup_description and business_sector from query
-            return self.legal_assistant.analyze_startup_legal_framework(query)
-        elif "risk" in query_lower or "risks" in query_lower or "evaluate" in query_lower:
-            # Evaluate legal risks
-            # Simplified call; parse business_model and target_market from query
-            return self.legal_assistant.evaluate_legal_risks(query)
-        elif "regulation" in query_lower or "regulations" in query_lower or "sector" in query_lower:
-            # Research sector regulations
-            # Simplified call; parse sector from query
-            return self.legal_assistant.research_sector_regulations(query)
-        elif "structure" in query_lower or "legal structure" in query_lower:
-            # Analyze investment legal structure
-            # Simplified call; parse investment_type and amount from query
-            return self.legal_assistant.analyze_investment_legal_structure(query)
-        else:
-            # Default to general legal analysis if no clear indicator
-            return self.legal_assistant.analyze_startup_legal_framework(query)
+        # The router picks the analysis (framework, risks, sector regulations or investment
+        # structure); general legal framework when unsure. The whole query is passed as the
+        # method's first argument, which the assistant's model reads in context.
+        method = get_query_router().method(self.name, query, default="analyze_startup_legal_framework")
+        return getattr(self.legal_assistant, method)(query)
 
 
 # Initialize the orchestrator
@@ -156,14 +176,14 @@ def create_orchestrator(agents: Optional[List[str]] = None, brainstorming_method
         return None
     
     # Create the model
-    model = LiteLLMModel(model_id="anthropic/claude-3-5-sonnet-latest", api_key=ANTHROPIC_API_KEY)
+    model = create_model(ANTHROPIC_API_KEY, model_id="anthropic/claude-3-5-sonnet-latest")
     
     # Initialize managed agents
     managed_agents = []
     
     # If no agents specified, use all available agents
     if agents is None:
-        agents = ["brainstorming", "hello", "data_analyst", "technical_assistant", "legal_assistant"]
+        agents = DEFAULT_AGENTS
     
     # Create and add BrainstormingAgent if requested
     if "brainstorming" in agents:
@@ -220,24 +240,134 @@ def create_orchestrator(agents: Optional[List[str]] = None, brainstorming_method
         managed_agents=managed_agents,
         additional_authorized_imports=["time", "numpy", "pandas"],  # Add if needed
         max_steps=5,  # Increased max_steps to allow for more complex interactions
+        stream_outputs=True,  # Lets stream_orchestrator forward token deltas
     )
     
     return manager_agent
 
+# Process-wide pool of ready-to-run orchestrators, shared by the API and the CLI
+orchestrator_pool = OrchestratorPool(
+    create_orchestrator,
+    max_idle=int(os.getenv("ORCHESTRATOR_POOL_MAX_IDLE", "8")),
+    max_idle_per_key=int(os.getenv("ORCHESTRATOR_POOL_MAX_IDLE_PER_KEY", "2")),
+)
+
+# Pre-build orchestrators for the most common configurations
+def warm_up_orchestrators(configurations: Optional[List[tuple]] = None, per_key: int = 1) -> None:
+    if ANTHROPIC_API_KEY is None:
+        print("Skipping orchestrator warm-up: ANTHROPIC_API_KEY environment variable not set.")
+        return
+    if configurations is None:
+        configurations = [(DEFAULT_AGENTS, None)]
+    print(f"Warming up {len(configurations) * per_key} orchestrator(s)...")
+    orchestrator_pool.warm_up(configurations, per_key=per_key)
+
+# Managed agent and task for a request the router is confident about, to run without the
+# manager's planning steps; None when the request needs the manager (several agents
+# mentioned, low confidence, an agent not selected, or a data analyst request without a file path)
+def _direct_call(manager_agent: CodeAgent, user_input: str) -> Optional[Tuple[ManagedAgentWrapper, str, Route]]:
+    wrappers = manager_agent.managed_agents
+    # Scored against every agent, so a request for an agent left out is not forced onto another
+    route = get_query_router().route(user_input)
+    if route is None or route.agent not in wrappers or route.confidence < ROUTER_DIRECT_CONFIDENCE or len(route.mentioned_agents) > 1:
+        return None
+    task = user_input
+    if route.agent == "data_analyst":
+        # The data analyst takes a bare file path, directory or glob pattern
+        task = _metrics_path(user_input)
+        if task is None:
+            return None
+    return wrappers[route.agent], task, route
+
 # Entry point to run the manager agent
 def run_orchestrator(user_input: str, agents: Optional[List[str]] = None, brainstorming_method: Optional[str] = None) -> str:
-    print("Creating orchestrator...")
-    manager_agent = create_orchestrator(agents, brainstorming_method)
-    
-    if manager_agent is None:
-        return "Orchestrator could not be initialized due to missing API key or other error."
-    
-    print("Running manager agent...")
-    try:
-        response = manager_agent.run(user_input)
-        return response
-    except Exception as e:
-        return f"Error running manager agent: {e}"
+    if agents is None:
+        agents = DEFAULT_AGENTS
+    print("Checking out orchestrator...")
+    with orchestrator_pool.lease(agents, brainstorming_method) as manager_agent:
+        if manager_agent is None:
+            return "Orchestrator could not be initialized due to missing API key or other error."
+
+        try:
+            direct = _direct_call(manager_agent, user_input)
+            if direct is not None:
+                wrapper, task, route = direct
+                print(f"Routing directly to {wrapper.name} ({route.method}, confidence {route.confidence:.2f})...")
+                return wrapper.run_direct(task)
+            print("Running manager agent...")
+            response = manager_agent.run(user_input)
+            return response
+        except Exception as e:
+            return f"Error running manager agent: {e}"
+
+# Convert a step yielded by a streaming agent run into a JSON-friendly event
+def _step_to_event(step: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(step, ChatMessageStreamDelta):
+        if not step.content:
+            return None
+        return {"type": "delta", "content": step.content}
+    if isinstance(step, PlanningStep):
+        return {"type": "plan", "plan": step.plan}
+    if isinstance(step, ToolCall):
+        return {"type": "tool_call", "name": step.name, "arguments": step.arguments}
+    if isinstance(step, ActionStep):
+        return {
+            "type": "step",
+            "step_number": step.step_number,
+            "code_action": step.code_action,
+            "observations": step.observations,
+            "error": str(step.error) if step.error else None,
+            "duration": step.timing.duration if step.timing else None,
+            "token_usage": step.token_usage.dict() if step.token_usage else None,
+        }
+    if isinstance(step, FinalAnswerStep):
+        return {"type": "final_answer", "output": str(step.output)}
+    return None
+
+# Streaming entry point: reports every orchestrator step, managed-agent call and token delta
+# through `on_event` as soon as it happens. `should_stop` is polled between steps.
+def stream_orchestrator(
+    user_input: str,
+    agents: Optional[List[str]] = None,
+    brainstorming_method: Optional[str] = None,
+    on_event: Callable[[Dict[str, Any]], None] = print,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> Optional[str]:
+    if agents is None:
+        agents = DEFAULT_AGENTS
+    with orchestrator_pool.lease(agents, brainstorming_method) as manager_agent:
+        if manager_agent is None:
+            on_event({"type": "error", "error": "Orchestrator could not be initialized due to missing API key or other error."})
+            return None
+
+        wrappers = list(manager_agent.managed_agents.values())
+        for wrapper in wrappers:
+            wrapper.event_sink = on_event
+        final_answer = None
+        try:
+            direct = _direct_call(manager_agent, user_input)
+            if direct is not None:
+                wrapper, task, route = direct
+                on_event({"type": "route", "agent": wrapper.name, "method": route.method, "confidence": route.confidence})
+                final_answer = str(wrapper.run_direct(task))
+                on_event({"type": "final_answer", "output": final_answer})
+                return final_answer
+            for step in manager_agent.run(user_input, stream=True):
+                if should_stop():
+                    on_event({"type": "error", "error": "Run cancelled."})
+                    break
+                event = _step_to_event(step)
+                if event is None:
+                    continue
+                if event["type"] == "final_answer":
+                    final_answer = event["output"]
+                on_event(event)
+        except Exception as e:
+            on_event({"type": "error", "error": f"Error running manager agent: {e}"})
+        finally:
+            for wrapper in wrappers:
+                wrapper.event_sink = None
+        return final_answer
 
 # Example usage
 if __name__ == "__main__":
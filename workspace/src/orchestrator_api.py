@@ -1,14 +1,25 @@
 import sys
 import os
+import asyncio
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 import uvicorn
+from contextlib import asynccontextmanager
 
 # Add the project root to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from workspace.src.orchestrator_agent import run_orchestrator
+from workspace.src.orchestrator_agent import run_orchestrator, stream_orchestrator, warm_up_orchestrators
+
+# Worker pool limits, overridable from the environment
+MAX_CONCURRENT_RUNS = int(os.getenv("ORCHESTRATOR_MAX_CONCURRENCY", "4"))
+MAX_QUEUED_RUNS = int(os.getenv("ORCHESTRATOR_QUEUE_DEPTH", "16"))
+RUN_TIMEOUT_SECONDS = float(os.getenv("ORCHESTRATOR_RUN_TIMEOUT", "600"))
 
 # Define the request body model
 class PromptRequest(BaseModel):
@@ -17,7 +28,81 @@ class PromptRequest(BaseModel):
     brainstorming_method: Optional[str] = None
     is_follow_up: Optional[bool] = False
 
-app = FastAPI()
+
+class RunExecutor:
+    """
+    Runs blocking orchestrator calls on a bounded thread pool so the event loop stays free.
+
+    At most `max_workers` runs execute at once and at most `queue_depth` more wait for a
+    worker; requests beyond that are rejected with 429. A run that does not finish within
+    `timeout` seconds is answered with 503, and keeps its slot until the worker returns.
+    """
+
+    def __init__(self, max_workers: int, queue_depth: int, timeout: float) -> None:
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="orchestrator")
+        self._slots = threading.BoundedSemaphore(max_workers + queue_depth)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        future = self.submit(func, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail=self.timeout_message())
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """Admit a run and schedule it on a worker, raising 429/503 if it cannot be accepted."""
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=429,
+                detail="Orchestrator is saturated, please retry later.",
+                headers={"Retry-After": "5"},
+            )
+        with self._lock:
+            self._in_flight += 1
+
+        try:
+            future = self._executor.submit(func, *args)
+        except RuntimeError:
+            self._release()
+            raise HTTPException(status_code=503, detail="Orchestrator is shutting down.")
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def timeout_message(self) -> str:
+        return f"Orchestrator run did not complete within {self.timeout:.0f} seconds."
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "max_workers": self.max_workers,
+                "queue_depth": self.queue_depth,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+
+run_executor = RunExecutor(MAX_CONCURRENT_RUNS, MAX_QUEUED_RUNS, RUN_TIMEOUT_SECONDS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the default orchestrators once so the first requests don't pay for it
+    warm_up_orchestrators(per_key=int(os.getenv("ORCHESTRATOR_POOL_WARM_UP", "1")))
+    yield
+    run_executor.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 @app.post("/run")
 async def run_orchestrator_endpoint(request: PromptRequest):
@@ -25,16 +110,71 @@ async def run_orchestrator_endpoint(request: PromptRequest):
     Endpoint to run the orchestrator with a given prompt.
     """
     try:
-        response = run_orchestrator(
+        response = await run_executor.run(
+            run_orchestrator,
             request.prompt,
-            agents=request.agents,
-            brainstorming_method=request.brainstorming_method
+            request.agents,
+            request.brainstorming_method,
         )
         return {"response": response}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error running orchestrator: {e}")
 
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Serialize an orchestrator event as a server-sent event."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+@app.post("/run/stream")
+async def run_orchestrator_stream_endpoint(request: PromptRequest):
+    """
+    Endpoint streaming orchestrator steps, managed-agent calls and token deltas as server-sent events.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def emit(event: Optional[Dict[str, Any]]) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    future = run_executor.submit(
+        stream_orchestrator,
+        request.prompt,
+        request.agents,
+        request.brainstorming_method,
+        emit,
+        stop.is_set,
+    )
+    # A None event marks the end of the run, whether it succeeded or not
+    future.add_done_callback(lambda _: emit(None))
+
+    async def event_stream() -> AsyncIterator[str]:
+        deadline = loop.time() + run_executor.timeout
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), timeout=max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    yield _format_sse({"type": "error", "error": run_executor.timeout_message()})
+                    break
+                if event is None:
+                    if future.exception() is not None:
+                        yield _format_sse({"type": "error", "error": f"Error running orchestrator: {future.exception()}"})
+                    break
+                yield _format_sse(event)
+            yield _format_sse({"type": "done"})
+        finally:
+            # Stop the worker between steps if the client went away or the run timed out
+            stop.set()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     # This is for local development/testing.
     # In a production environment, you would typically run this with `uvicorn orchestrator_api:app --reload`
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+PoolKey = Tuple[Tuple[str, ...], str]
+
+
+def make_pool_key(agents: List[str], brainstorming_method: Optional[str]) -> PoolKey:
+    """Build the pool key for an (agent set, brainstorming method) pair."""
+    return tuple(sorted(set(agents))), brainstorming_method or "SCAMPER"
+
+
+def reset_orchestrator(manager_agent: Any) -> None:
+    """Clear run state from a manager agent and every agent it manages."""
+    pending = [manager_agent]
+    seen: Set[int] = set()
+    while pending:
+        agent = pending.pop()
+        if id(agent) in seen:
+            continue
+        seen.add(id(agent))
+
+        if getattr(agent, "memory", None) is not None:
+            agent.memory.reset()
+        if getattr(agent, "monitor", None) is not None:
+            agent.monitor.reset()
+        executor = getattr(agent, "python_executor", None)
+        if executor is not None and hasattr(executor, "state"):
+            # Drop variables left behind by the previous user's code actions
+            executor.state.clear()
+            executor.state["__name__"] = "__main__"
+
+        pending.extend(getattr(agent, "managed_agents", {}).values())
+        # Wrappers hold the real agent instance, which in turn holds a CodeAgent
+        for value in vars(agent).values():
+            inner = getattr(value, "agent", None)
+            if inner is not None and hasattr(inner, "memory"):
+                pending.append(inner)
+
+
+class OrchestratorPool:
+    """
+    Process-level pool of pre-built orchestrators keyed by (agent set, brainstorming method).
+
+    Orchestrators are checked out for exclusive use during a run and returned afterwards,
+    where they are reset and kept idle for the next request with the same key. The number
+    of idle orchestrators is capped globally and per key; the least recently used keys are
+    evicted first so the memory held by idle agents stays bounded.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Optional[List[str]], Optional[str]], Any],
+        max_idle: int = 8,
+        max_idle_per_key: int = 2,
+    ) -> None:
+        self.factory = factory
+        self.max_idle = max_idle
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: "OrderedDict[PoolKey, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, float] = {"hits": 0, "misses": 0, "evictions": 0, "build_seconds": 0.0}
+
+    def checkout(self, agents: List[str], brainstorming_method: Optional[str] = None) -> Any:
+        """Take an idle orchestrator for this key, or build a new one if none is available."""
+        key = make_pool_key(agents, brainstorming_method)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self._idle.move_to_end(key)
+                self._stats["hits"] += 1
+                orchestrator = idle.pop()
+                if not idle:
+                    del self._idle[key]
+                return orchestrator
+            self._stats["misses"] += 1
+
+        # Build outside the lock so other keys are not blocked by a slow construction
+        start = time.perf_counter()
+        orchestrator = self.factory(list(key[0]), key[1])
+        with self._lock:
+            self._stats["build_seconds"] += time.perf_counter() - start
+        return orchestrator
+
+    def checkin(self, agents: List[str], brainstorming_method: Optional[str], orchestrator: Any) -> None:
+        """Reset an orchestrator and keep it idle for reuse, evicting if the pool is full."""
+        if orchestrator is None:
+            return
+        try:
+            reset_orchestrator(orchestrator)
+        except Exception as e:
+            print(f"Discarding orchestrator that failed to reset: {e}")
+            return
+
+        key = make_pool_key(agents, brainstorming_method)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            self._idle.move_to_end(key)
+            if len(idle) >= self.max_idle_per_key:
+                self._stats["evictions"] += 1
+                return
+            idle.append(orchestrator)
+            self._evict_locked()
+
+    @contextmanager
+    def lease(self, agents: List[str], brainstorming_method: Optional[str] = None) -> Iterator[Any]:
+        """Check out an orchestrator for the duration of a `with` block."""
+        orchestrator = self.checkout(agents, brainstorming_method)
+        try:
+            yield orchestrator
+        finally:
+            self.checkin(agents, brainstorming_method, orchestrator)
+
+    def warm_up(self, configurations: List[Tuple[List[str], Optional[str]]], per_key: int = 1) -> None:
+        """Pre-build orchestrators for the given (agents, brainstorming method) configurations."""
+        for agents, brainstorming_method in configurations:
+            agent_names, method = make_pool_key(agents, brainstorming_method)
+            built = [self.factory(list(agent_names), method) for _ in range(per_key)]
+            for orchestrator in built:
+                self.checkin(agents, brainstorming_method, orchestrator)
+
+    def clear(self) -> None:
+        """Drop every idle orchestrator."""
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and the current idle size."""
+        with self._lock:
+            return {
+                **self._stats,
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "keys": len(self._idle),
+            }
+
+    def _evict_locked(self) -> None:
+        total = sum(len(idle) for idle in self._idle.values())
+        while total > self.max_idle and self._idle:
+            key, idle = next(iter(self._idle.items()))
+            idle.pop(0)
+            total -= 1
+            self._stats["evictions"] += 1
+            if not idle:
+                del self._idle[key]
@@ -0,0 +1,146 @@
+import gzip
+import json
+import os
+import re
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.text_index import BM25Index
+
+# Paper metadata dump (JSON lines, optionally gzipped) searched by the paper tools
+HF_PAPERS_DUMP_PATH = os.getenv("HF_PAPERS_DUMP_PATH", "")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _clean(text: Any) -> str:
+    return _WHITESPACE.sub(" ", str(text or "")).strip()
+
+
+def _parse_authors(authors: Any) -> List[str]:
+    if isinstance(authors, str):
+        return [name.strip() for name in re.split(r",|\band\b", authors) if name.strip()]
+    names = []
+    for author in authors or []:
+        if isinstance(author, dict):
+            names.append(_clean(author.get("name")))
+        elif isinstance(author, (list, tuple)):
+            # arXiv "authors_parsed" entries: [last name, first names, suffix]
+            names.append(_clean(" ".join(part for part in reversed(author[:2]) if part)))
+        else:
+            names.append(_clean(author))
+    return [name for name in names if name]
+
+
+def _parse_date(raw: Dict[str, Any]) -> str:
+    for field in ("publishedAt", "published", "published_at", "update_date"):
+        if raw.get(field):
+            return str(raw[field])
+    versions = raw.get("versions") or []
+    if versions and isinstance(versions[0], dict) and versions[0].get("created"):
+        try:
+            return parsedate_to_datetime(versions[0]["created"]).isoformat()
+        except (TypeError, ValueError):
+            pass
+    return "N/A"
+
+
+def normalize_paper(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a record from an arXiv metadata or Hugging Face papers dump to the fields the paper tools use."""
+    raw = raw.get("paper", raw)
+    authors = raw.get("authors_parsed") if not raw.get("authors") else raw.get("authors")
+    return {
+        "title": _clean(raw.get("title")) or "No title",
+        "authors": _parse_authors(authors),
+        "publishedAt": _parse_date(raw),
+        "arxiv_id": str(raw.get("arxiv_id") or raw.get("id") or "N/A"),
+        "summary": _clean(raw.get("summary") or raw.get("abstract")) or "No summary available",
+    }
+
+
+def load_papers(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream normalized papers from a JSON lines dump, or from a JSON array file."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        first = handle.read(1)
+        handle.seek(0)
+        if first == "[":
+            for raw in json.load(handle):
+                yield normalize_paper(raw)
+            return
+        for line in handle:
+            if line.strip():
+                yield normalize_paper(json.loads(line))
+
+
+def _document_text(paper: Dict[str, Any]) -> str:
+    # The title is repeated so that title matches outrank abstract-only matches
+    return " ".join([paper["title"], paper["title"], paper["summary"], " ".join(paper["authors"]), paper["arxiv_id"]])
+
+
+class PaperIndex:
+    """Papers from a metadata dump with a BM25 full-text index over titles, abstracts and authors."""
+
+    def __init__(self, papers: List[Dict[str, Any]], index: Optional[BM25Index] = None) -> None:
+        self.papers = papers
+        self.index = index or BM25Index.build(_document_text(paper) for paper in papers)
+
+    @classmethod
+    def from_dump(cls, path: str, index_path: Optional[str] = None) -> "PaperIndex":
+        """
+        Load a dump and its index. The index is saved next to the dump on first build and
+        reused while the dump's size and modification time are unchanged.
+        """
+        started = time.perf_counter()
+        papers = list(load_papers(path))
+        index_path = index_path or f"{path}.bm25.npz"
+        stat = os.stat(path)
+        signature = {"source_size": str(stat.st_size), "source_mtime": str(stat.st_mtime)}
+
+        index = None
+        if os.path.exists(index_path):
+            cached, metadata = BM25Index.load(index_path)
+            if metadata == signature and len(cached) == len(papers):
+                index = cached
+        if index is None:
+            index = BM25Index.build(_document_text(paper) for paper in papers)
+            try:
+                index.save(index_path, **signature)
+            except OSError as e:
+                print(f"Could not save paper index to {index_path}: {e}")
+        print(f"Loaded {len(papers)} papers in {time.perf_counter() - started:.1f}s")
+        return cls(papers, index)
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+        """Return up to `limit` (paper, BM25 score) pairs, best first."""
+        return [(self.papers[doc_id], score) for doc_id, score in self.index.search(query, limit)]
+
+    def find_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+        """Return the paper whose title matches exactly (ignoring case and spacing), if indexed."""
+        wanted = _clean(title).lower()
+        for paper, _ in self.search(title, limit=5):
+            if paper["title"].lower() == wanted:
+                return paper
+        return None
+
+
+_paper_index: Optional[PaperIndex] = None
+_paper_index_lock = threading.Lock()
+
+
+def get_paper_index() -> Optional[PaperIndex]:
+    """Return the process-wide paper index built from HF_PAPERS_DUMP_PATH, or None when no dump is configured."""
+    global _paper_index
+    with _paper_index_lock:
+        if _paper_index is None and HF_PAPERS_DUMP_PATH and os.path.exists(HF_PAPERS_DUMP_PATH):
+            _paper_index = PaperIndex.from_dump(HF_PAPERS_DUMP_PATH)
+        return _paper_index
@@ -0,0 +1,323 @@
+import argparse
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.startup_metrics import KPI_LABELS, SUPPORTED_EXTENSIONS, compute_kpis, read_metrics, summarize_metrics
+
+# Processes computing metrics (0 uses one per CPU), and limits on the model commentary calls
+ANALYST_MAX_WORKERS = int(os.getenv("ANALYST_MAX_WORKERS", "0"))
+ANALYST_MAX_CONCURRENT_CALLS = int(os.getenv("ANALYST_MAX_CONCURRENT_CALLS", "4"))
+ANALYST_CALLS_PER_MINUTE = float(os.getenv("ANALYST_CALLS_PER_MINUTE", "50"))
+
+# Ranking score weights; negative weights rank lower values higher. Growth is MoM MRR growth, or CMGR when missing
+RANKING_WEIGHTS = {"growth": 0.35, "nrr": 0.2, "ltv_cac": 0.15, "logo_churn": -0.15, "burn_multiple": -0.15}
+REPORT_COLUMNS = ("mrr", "mom_growth", "logo_churn", "nrr", "ltv_cac", "burn_multiple")
+
+REPORT_DIRNAME = "portfolio_report"
+# Result statuses: metrics computed (commentary pending or failed), commentary done, input unreadable
+COMPUTED, COMPLETE, FAILED = "computed", "complete", "failed"
+
+
+class RateLimiter:
+    """Spaces call starts so that at most `calls_per_minute` begin in any minute, across threads."""
+
+    def __init__(self, calls_per_minute: float) -> None:
+        self.interval = 60.0 / calls_per_minute if calls_per_minute > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def is_portfolio_source(source: str) -> bool:
+    """Whether a data analyst query names several metrics files: a directory or a glob pattern."""
+    return os.path.isdir(source) or glob.has_magic(source)
+
+
+def default_output_dir(source: str) -> str:
+    """Report directory of a source: inside the directory, or next to the files a glob matches."""
+    if os.path.isdir(source):
+        return os.path.join(source, REPORT_DIRNAME)
+    parts = re.split(r"[\\/]", source)
+    static = parts[:next(index for index, part in enumerate(parts) if glob.has_magic(part))]
+    return os.path.join(os.sep.join(static) or ".", REPORT_DIRNAME)
+
+
+def discover_metrics_files(source: str, exclude_dir: Optional[str] = None) -> List[str]:
+    """Metrics files of a directory (not recursive) or matched by a glob pattern, sorted."""
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source, recursive=True)
+    excluded = os.path.abspath(exclude_dir) + os.sep if exclude_dir else None
+    return sorted(
+        path for path in paths
+        if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS)
+        and not (excluded and os.path.abspath(path).startswith(excluded))
+    )
+
+
+def _source_signature(path: str) -> Dict[str, Any]:
+    stat = os.stat(path)
+    return {"file": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def compute_startup(path: str) -> Dict[str, Any]:
+    """Metrics, KPIs and prompt summary of one file. Runs in a worker process, so errors are returned, not raised."""
+    result: Dict[str, Any] = _source_signature(path)
+    try:
+        metrics = read_metrics(path)
+        kpis = compute_kpis(metrics)
+        result.update(
+            name=metrics.name,
+            # NaN is not valid JSON
+            kpis={name: (None if value is None or math.isnan(value) else value) for name, value in kpis.items()},
+            summary=summarize_metrics(metrics, kpis),
+            status=COMPUTED,
+        )
+    except Exception as e:
+        result.update(name=os.path.splitext(os.path.basename(path))[0], error=f"{type(e).__name__}: {e}", status=FAILED)
+    return result
+
+
+def _result_path(output_dir: str, path: str) -> str:
+    stem = re.sub(r"[^\w.-]+", "_", os.path.splitext(os.path.basename(path))[0])
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(output_dir, "startups", f"{stem}-{digest}.json")
+
+
+def _write_atomic(path: str, text: str) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary_path, path)
+
+
+def _load_result(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            result: Dict[str, Any] = json.load(handle)
+            return result
+    except (OSError, ValueError):
+        return None
+
+
+def rank_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Order startups by a weighted average of their percentile ranks on growth, NRR, LTV/CAC,
+    churn and burn multiple. KPIs a startup lacks are left out of its average; startups
+    whose metrics could not be read come last.
+    """
+    readable = [result for result in results if result.get("status") != FAILED]
+    if readable:
+        kpis = pd.DataFrame([result["kpis"] for result in readable], dtype=np.float64)
+        kpis = kpis.reindex(columns=sorted(set(kpis.columns) | set(RANKING_WEIGHTS) | {"mom_growth", "cmgr"}))
+        kpis["growth"] = kpis["mom_growth"].fillna(kpis["cmgr"])
+        percentiles = pd.DataFrame({name: kpis[name].rank(pct=True, ascending=weight > 0) for name, weight in RANKING_WEIGHTS.items()})
+        weights = pd.Series(RANKING_WEIGHTS).abs()
+        scores = (percentiles * weights).sum(axis=1) / (percentiles.notna() * weights).sum(axis=1).replace(0, np.nan)
+        for result, score in zip(readable, scores.fillna(0).to_numpy()):
+            result["score"] = round(float(score) * 100, 1)
+    readable.sort(key=lambda result: -result["score"])
+    return readable + [result for result in results if result.get("status") == FAILED]
+
+
+def _format_kpi(name: str, value: Optional[float]) -> str:
+    if value is None:
+        return "n/a"
+    if name in ("mom_growth", "logo_churn", "nrr"):
+        return f"{value:.1%}"
+    if name == "mrr":
+        return f"${value:,.0f}"
+    return f"{value:.2f}x"
+
+
+def format_portfolio_report(results: List[Dict[str, Any]], pending: int = 0) -> str:
+    """Markdown report of ranked results: a comparison table, then each startup's commentary."""
+    lines = [f"# Portfolio analysis ({len(results)} startups)"]
+    if pending:
+        lines.append(f"\n_In progress: {pending} startups not analyzed yet._")
+    lines.append("")
+    lines.append("| Rank | Startup | Score | " + " | ".join(KPI_LABELS[name] for name in REPORT_COLUMNS) + " |")
+    lines.append("|---" * (len(REPORT_COLUMNS) + 3) + "|")
+    for rank, result in enumerate(results, 1):
+        if result.get("status") == FAILED:
+            lines.append(f"| {rank} | {result['name']} | n/a | " + " | ".join("n/a" for _ in REPORT_COLUMNS) + " |")
+            continue
+        kpis = result["kpis"]
+        cells = " | ".join(_format_kpi(name, kpis.get(name)) for name in REPORT_COLUMNS)
+        lines.append(f"| {rank} | {result['name']} | {result.get('score', 0):.1f} | {cells} |")
+    for rank, result in enumerate(results, 1):
+        lines.append(f"\n## {rank}. {result['name']}")
+        lines.append(f"_Source: {result['file']}_\n")
+        if result.get("status") == FAILED:
+            lines.append(f"Could not read metrics: {result['error']}")
+        elif result.get("commentary"):
+            lines.append(result["commentary"])
+        else:
+            if result.get("error"):
+                lines.append(f"_Commentary failed: {result['error']}_\n")
+            lines.append(f"```\n{result['summary']}\n```")
+    return "\n".join(lines)
+
+
+class _PortfolioRun:
+    """State of one batch run: results by file, persisted as they change, and the combined report."""
+
+    def __init__(self, output_dir: str, total: int, report_interval: float) -> None:
+        self.output_dir = output_dir
+        self.total = total
+        self.report_interval = report_interval
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+        os.makedirs(os.path.join(output_dir, "startups"), exist_ok=True)
+
+    def store(self, result: Dict[str, Any]) -> None:
+        """Persist one startup's result, then refresh the combined report at most every `report_interval` seconds."""
+        _write_atomic(_result_path(self.output_dir, result["file"]), json.dumps(result, ensure_ascii=False, indent=2))
+        with self._lock:
+            self.results[result["file"]] = result
+            if time.monotonic() - self._last_report >= self.report_interval:
+                self._write_report()
+
+    def finish(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._write_report()
+
+    def _write_report(self) -> List[Dict[str, Any]]:
+        ranked = rank_results([dict(result) for result in self.results.values()])
+        _write_atomic(os.path.join(self.output_dir, "portfolio_report.md"), format_portfolio_report(ranked, self.total - len(ranked)))
+        _write_atomic(
+            os.path.join(self.output_dir, "portfolio_report.json"),
+            json.dumps([{key: value for key, value in result.items() if key != "summary"} for result in ranked], ensure_ascii=False, indent=2),
+        )
+        self._last_report = time.monotonic()
+        return ranked
+
+
+def analyze_portfolio(
+    source: str,
+    commentary: Optional[Callable[[str], str]] = None,
+    output_dir: Optional[str] = None,
+    max_workers: int = ANALYST_MAX_WORKERS,
+    max_concurrent_calls: int = ANALYST_MAX_CONCURRENT_CALLS,
+    calls_per_minute: float = ANALYST_CALLS_PER_MINUTE,
+    report_interval: float = 5.0,
+) -> List[Dict[str, Any]]:
+    """
+    Analyze every metrics file of a directory or glob and return the results, best ranked first.
+
+    Metrics are computed in a process pool; as each startup's metrics arrive, its summary
+    is sent to `commentary` (typically a model call) on a thread pool of
+    `max_concurrent_calls`, with call starts limited to `calls_per_minute`. Each result is
+    written to `<output_dir>/startups/` as soon as it changes, and the ranked
+    portfolio_report.md/.json are refreshed as results arrive. A rerun after a crash
+    reuses finished results of unchanged files and only redoes the missing work.
+    """
+    output_dir = output_dir or default_output_dir(source)
+    paths = discover_metrics_files(source, exclude_dir=output_dir)
+    if not paths:
+        raise ValueError(f"No metrics files ({', '.join(SUPPORTED_EXTENSIONS)}) found in {source}")
+    run = _PortfolioRun(output_dir, len(paths), report_interval)
+    started = time.perf_counter()
+
+    to_compute, to_comment = [], []
+    for path in paths:
+        previous = _load_result(_result_path(output_dir, path))
+        if previous and {key: previous.get(key) for key in ("file", "size", "mtime")} == _source_signature(path):
+            run.results[previous["file"]] = previous
+            if previous["status"] == COMPUTED and commentary is not None:
+                to_comment.append(previous)
+        else:
+            to_compute.append(path)
+    if len(paths) > len(to_compute):
+        print(f"Reusing {len(paths) - len(to_compute)} of {len(paths)} startup results from {output_dir}")
+
+    limiter = RateLimiter(calls_per_minute)
+    comment: Optional[Callable[[Dict[str, Any]], None]] = None
+    if commentary is not None:
+        write_commentary = commentary
+
+        def comment_on(result: Dict[str, Any]) -> None:
+            limiter.wait()
+            try:
+                text = write_commentary(result["summary"])
+                result = dict(result, commentary=str(text), status=COMPLETE)
+                result.pop("error", None)
+            except Exception as e:
+                # Kept as computed, so the next run retries the commentary
+                result = dict(result, error=f"{type(e).__name__}: {e}")
+            run.store(result)
+
+        comment = comment_on
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrent_calls), thread_name_prefix="analyst") as callers:
+        calls: List[Future[None]] = [callers.submit(comment, result) for result in to_comment if comment is not None]
+        workers = max_workers or os.cpu_count() or 1
+        if to_compute:
+            # A process pool only pays off when several files can be computed at once
+            if workers > 1 and len(to_compute) > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(to_compute))) as pool:
+                    computed = as_completed([pool.submit(compute_startup, path) for path in to_compute])
+                    calls += _dispatch((future.result() for future in computed), run, comment, callers)
+            else:
+                calls += _dispatch(map(compute_startup, to_compute), run, comment, callers)
+        for call in calls:
+            call.result()
+
+    ranked = run.finish()
+    print(f"Analyzed {len(paths)} startups in {time.perf_counter() - started:.1f}s; report in {output_dir}")
+    return ranked
+
+
+def _dispatch(
+    results: Iterable[Dict[str, Any]],
+    run: _PortfolioRun,
+    comment: Optional[Callable[[Dict[str, Any]], None]],
+    callers: ThreadPoolExecutor,
+) -> List[Future[None]]:
+    calls: List[Future[None]] = []
+    for result in results:
+        run.store(result)
+        if comment is not None and result["status"] == COMPUTED:
+            calls.append(callers.submit(comment, result))
+    return calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compute and rank the metrics of a portfolio of startups, without model commentary.")
+    parser.add_argument("source", help="Directory or glob pattern of metrics files")
+    parser.add_argument("--output", help=f"Report directory (default: {REPORT_DIRNAME} next to the files)")
+    parser.add_argument("--workers", type=int, default=ANALYST_MAX_WORKERS, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+    ranked = analyze_portfolio(args.source, output_dir=args.output, max_workers=args.workers)
+    for rank, result in enumerate(ranked[:10], 1):
+        print(f"{rank}. {result['name']} ({result.get('score', 'n/a')})")
+
+
+if __name__ == "__main__":
+    main()
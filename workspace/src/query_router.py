@@ -0,0 +1,199 @@
+import json
+import os
+import re
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.keyword_matcher import KeywordMatcher
+
+# Declarative table of routes (agent and method), with their keywords and labeled example prompts
+QUERY_ROUTES_PATH = os.getenv(
+    "QUERY_ROUTES_PATH",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'query_routes.json'),
+)
+
+# Below this probability among an agent's methods, the agent's default method is used
+MIN_METHOD_CONFIDENCE = 0.4
+# Confidence above which a request can go straight to its agent, without an LLM planning
+# step (set above 1 to always plan). Held-out prompts of the table's routes score 0.9 and
+# more, cross-domain prompts sharing a word with a route ("technical risks", "seed funding") 0.7 at most
+ROUTER_DIRECT_CONFIDENCE = float(os.getenv("ROUTER_DIRECT_CONFIDENCE", "0.85"))
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _terms(text: str) -> List[str]:
+    """Lowercase words and word pairs of a text, French accents included."""
+    words = _TOKEN_PATTERN.findall(text.lower())
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    exp = np.exp(scores - scores.max(axis=-1, keepdims=True))
+    probabilities: np.ndarray = exp / exp.sum(axis=-1, keepdims=True)
+    return probabilities
+
+
+class Route:
+    """Where a query goes: an agent and one of its methods, with the router's confidence in each."""
+
+    def __init__(self, agent: str, method: str, confidence: float, method_confidence: float, mentioned_agents: Tuple[str, ...]) -> None:
+        self.agent = agent
+        self.method = method
+        # Probability that the query is for this agent, among the agents considered
+        self.confidence = confidence
+        # Probability of the method, among the methods of the agent
+        self.method_confidence = method_confidence
+        # Agents whose keywords appear in the query; several means a multi-step request
+        self.mentioned_agents = mentioned_agents
+
+    def __repr__(self) -> str:
+        return f"Route({self.agent}.{self.method}, confidence={self.confidence:.2f}, method_confidence={self.method_confidence:.2f})"
+
+
+class QueryRouter:
+    """
+    Local intent router choosing the agent and method that should handle a query.
+
+    The keywords of every route are compiled into one KeywordMatcher, and the labeled
+    examples of the table train a small multinomial logistic regression over TF-IDF
+    weights of words and word pairs plus one keyword-match feature per route. Every example
+    is also trained on with its keyword features cleared, so the words of a query carry its
+    route and a lone keyword does not make the router confident. Routing a query is one
+    keyword scan and a sum over the weights of its terms, a few microseconds, with
+    probabilities the callers can compare to a confidence threshold.
+    """
+
+    def __init__(self, table: Dict[str, Any], iterations: int = 300, learning_rate: float = 2.0, l2: float = 1e-3) -> None:
+        self.routes: List[Tuple[str, str]] = [(route["agent"], route["method"]) for route in table["routes"]]
+        self.agents = list(dict.fromkeys(agent for agent, _ in self.routes))
+        categories: Dict[str, Iterable[str]] = {}
+        for index, route in enumerate(table["routes"]):
+            categories[str(index)] = route.get("keywords", [])
+            # Short keywords ("hi", "arr") only count as whole words
+            categories[f"{index}:words"] = route.get("words", [])
+        self._matcher = KeywordMatcher(categories, whole_word_categories=[f"{index}:words" for index in range(len(self.routes))])
+
+        examples = [(text, label) for label, route in enumerate(table["routes"]) for text in route["examples"]]
+        documents = [_terms(text) for text, _ in examples]
+        self.vocabulary: Dict[str, int] = {}
+        for terms in documents:
+            for term in terms:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+        document_frequencies = np.zeros(len(self.vocabulary))
+        for terms in documents:
+            document_frequencies[[self.vocabulary[term] for term in set(terms)]] += 1
+        self.idf = np.log((1 + len(documents)) / (1 + document_frequencies)) + 1
+
+        features = np.vstack([self._features(text) for text, _ in examples])
+        labels = np.array([label for _, label in examples])
+        # Keyword dropout: the same examples without their keyword hits
+        dropped = features.copy()
+        dropped[:, len(self.vocabulary):] = 0
+        features, labels = np.vstack([features, dropped]), np.concatenate([labels, labels])
+        self.weights, self.bias = self._train(features, labels, iterations, learning_rate, l2)
+
+    @classmethod
+    def from_file(cls, path: str = QUERY_ROUTES_PATH) -> "QueryRouter":
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle))
+
+    def _keyword_hits(self, text: str) -> np.ndarray:
+        """Whether the keywords of each route appear in a text."""
+        counts = self._matcher.counts(text)
+        return np.array([counts[str(index)] + counts[f"{index}:words"] > 0 for index in range(len(self.routes))], dtype=np.float64)
+
+    def _encode(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Vocabulary ids of the known terms of a text and their L2-normalized TF-IDF weights."""
+        counts: Dict[int, int] = {}
+        for term in _terms(text):
+            index = self.vocabulary.get(term)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+        ids = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        tfidf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts)) * self.idf[ids]
+        norm = np.linalg.norm(tfidf)
+        return ids, tfidf / norm if norm else tfidf
+
+    def _features(self, text: str) -> np.ndarray:
+        """Dense TF-IDF weights of a text followed by its keyword hits, as the model is trained on."""
+        ids, tfidf = self._encode(text)
+        features = np.zeros(len(self.vocabulary) + len(self.routes))
+        features[ids] = tfidf
+        features[len(self.vocabulary):] = self._keyword_hits(text)
+        return features
+
+    def _train(self, features: np.ndarray, labels: np.ndarray, iterations: int, learning_rate: float, l2: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Full-batch gradient descent on the regularized cross-entropy; deterministic from zero weights."""
+        targets = np.eye(len(self.routes))[labels]
+        weights = np.zeros((features.shape[1], len(self.routes)))
+        bias = np.zeros(len(self.routes))
+        for _ in range(iterations):
+            error = (_softmax(features @ weights + bias) - targets) / len(labels)
+            weights -= learning_rate * (features.T @ error + l2 * weights)
+            bias -= learning_rate * error.sum(axis=0)
+        return weights, bias
+
+    def probabilities(self, query: str) -> np.ndarray:
+        """Probability of every route of the table for a query."""
+        return self._probabilities(query, self._keyword_hits(query))
+
+    def _probabilities(self, query: str, hits: np.ndarray) -> np.ndarray:
+        # Only the rows of the query's own terms are read, not the whole weight matrix
+        ids, tfidf = self._encode(query)
+        return _softmax(tfidf @ self.weights[ids] + hits @ self.weights[len(self.vocabulary):] + self.bias)
+
+    def route(self, query: str, agents: Optional[Iterable[str]] = None) -> Optional[Route]:
+        """
+        Most likely route of a query, among the routes of `agents` (all of them by default).
+        None when none of the table's routes belongs to those agents.
+        """
+        hits = self._keyword_hits(query)
+        # A handful of routes: plain Python is faster than NumPy calls from here on
+        probabilities = self._probabilities(query, hits).tolist()
+        allowed = None if agents is None else set(agents)
+        agent_probabilities: Dict[str, float] = {}
+        best: Dict[str, int] = {}
+        for index, (agent, _) in enumerate(self.routes):
+            if allowed is not None and agent not in allowed:
+                continue
+            agent_probabilities[agent] = agent_probabilities.get(agent, 0.0) + probabilities[index]
+            if agent not in best or probabilities[index] > probabilities[best[agent]]:
+                best[agent] = index
+        if not agent_probabilities:
+            return None
+        agent = max(agent_probabilities, key=agent_probabilities.__getitem__)
+        mentioned = tuple(dict.fromkeys(self.routes[index][0] for index, hit in enumerate(hits.tolist()) if hit))
+        return Route(
+            agent,
+            self.routes[best[agent]][1],
+            agent_probabilities[agent] / sum(agent_probabilities.values()),
+            probabilities[best[agent]] / agent_probabilities[agent],
+            mentioned,
+        )
+
+    def method(self, agent: str, query: str, default: str) -> str:
+        """Method of `agent` that should handle a query, or `default` when the router is unsure."""
+        route = self.route(query, agents=[agent])
+        if route is None or route.method_confidence < MIN_METHOD_CONFIDENCE:
+            return default
+        return route.method
+
+
+_query_router: Optional[QueryRouter] = None
+_query_router_lock = threading.Lock()
+
+
+def get_query_router() -> QueryRouter:
+    """Return the process-wide router, trained from QUERY_ROUTES_PATH on first use."""
+    global _query_router
+    with _query_router_lock:
+        if _query_router is None:
+            _query_router = QueryRouter.from_file(QUERY_ROUTES_PATH)
+        return _query_router
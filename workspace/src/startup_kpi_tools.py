@@ -0,0 +1,207 @@
+import sys
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from smolagents import tool
+from workspace.src import metric_kernels
+from workspace.src.mapped_file import LINE_FORMATS, MappedFile, profile_file
+from workspace.src.startup_metrics import cohort_retention, read_metrics, summarize_metrics
+
+# Distinct values stratified_sample draws rows for; more would not fit in a prompt
+MAX_SAMPLED_VALUES = 100
+
+
+def _to_array(values: List[Optional[float]]) -> np.ndarray:
+    """Series given by the agent as a NumPy array, with NaN for its missing (None) values."""
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def _to_list(values: np.ndarray) -> List[Optional[float]]:
+    """Kernel output as a JSON-friendly list, with None where the KPI is undefined."""
+    return [None if np.isnan(value) else float(value) for value in values]
+
+
+def _to_number(value: np.ndarray) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+@tool
+def compute_startup_kpis(file_path: str) -> str:
+    """
+    Compute a startup's KPIs from its metrics file (CSV, JSON, XLSX or TXT): MRR growth (MoM, YoY, CMGR),
+    logo and revenue churn, net revenue retention, cohort retention, ARPU, CAC, LTV/CAC, payback,
+    burn multiple and runway. Returns a summary with the KPIs and the latest monthly figures.
+
+    Args:
+        file_path: Path of the startup's metrics file
+    """
+    try:
+        return summarize_metrics(read_metrics(file_path))
+    except Exception as e:
+        return f"Could not compute KPIs from {file_path}: {e}"
+
+
+@tool
+def cohort_retention_table(file_path: str) -> str:
+    """
+    Build the cohort retention matrix of a customer-level metrics file (one row per customer and
+    invoice or month): for each monthly cohort, the share of its customers still active after
+    0, 1, 2... months.
+
+    Args:
+        file_path: Path of the customer-level metrics file
+    """
+    try:
+        metrics = read_metrics(file_path)
+    except Exception as e:
+        return f"Could not read {file_path}: {e}"
+    if metrics.customer_revenue is None:
+        return "Cohort retention needs customer-level data (a customer id, a date and an amount per row)."
+    table: str = cohort_retention(metrics.customer_revenue).to_string(float_format=lambda value: f"{value:.0%}", na_rep="")
+    return table
+
+
+@tool
+def growth_rates(values: List[Optional[float]], periods: int = 1) -> List[Optional[float]]:
+    """
+    Growth rate of every month of a monthly series (e.g. MRR), as fractions: 0.1 is 10%.
+    Months without enough history, or growing from zero, are None.
+
+    Args:
+        values: Monthly values, oldest first
+        periods: Months compared: 1 for month over month, 12 for year over year (default: 1)
+    """
+    return _to_list(metric_kernels.period_growth(_to_array(values), periods))
+
+
+@tool
+def compound_monthly_growth_rate(values: List[Optional[float]], months: int = 0) -> Optional[float]:
+    """
+    Compound monthly growth rate (CMGR) of a monthly series, as a fraction, or None when it
+    cannot be computed.
+
+    Args:
+        values: Monthly values, oldest first
+        months: Number of trailing months to measure over (default: 0, the whole series)
+    """
+    return _to_number(metric_kernels.cmgr(_to_array(values), months or None))
+
+
+@tool
+def churn_rates(customers: List[Optional[float]], churned: List[Optional[float]]) -> List[Optional[float]]:
+    """
+    Monthly logo churn: customers lost in a month over customers at the end of the previous month.
+    The first month is None.
+
+    Args:
+        customers: Customers at the end of every month, oldest first
+        churned: Customers lost during every month, same months as customers
+    """
+    return _to_list(metric_kernels.logo_churn(_to_array(customers), _to_array(churned)))
+
+
+@tool
+def rolling_average(values: List[Optional[float]], window: int = 3) -> List[Optional[float]]:
+    """
+    Trailing moving average of a monthly series. Months before a full window are None.
+
+    Args:
+        values: Monthly values, oldest first
+        window: Number of months averaged (default: 3)
+    """
+    return _to_list(metric_kernels.rolling_mean(_to_array(values), window))
+
+
+@tool
+def burn_multiples(burn: List[Optional[float]], mrr: List[Optional[float]], window: int = 3) -> List[Optional[float]]:
+    """
+    Burn multiple of every trailing window: net burn over net new ARR. Lower is better; None
+    when ARR did not grow or the history is too short.
+
+    Args:
+        burn: Net burn of every month, oldest first
+        mrr: MRR of every month, same months as burn
+        window: Number of months per window (default: 3, a quarter)
+    """
+    return _to_list(metric_kernels.burn_multiple(_to_array(burn), _to_array(mrr), window))
+
+
+@tool
+def unit_economics(arpu: float, monthly_churn: float, cac: float, gross_margin: float = 1.0) -> Dict[str, Optional[float]]:
+    """
+    Customer lifetime value, LTV/CAC ratio and CAC payback in months.
+
+    Args:
+        arpu: Monthly revenue per customer
+        monthly_churn: Monthly logo churn, as a fraction (0.05 for 5%)
+        cac: Customer acquisition cost
+        gross_margin: Gross margin, as a fraction (default: 1.0, revenue-based LTV)
+    """
+    result: Dict[str, Optional[float]] = {
+        "ltv": _to_number(metric_kernels.ltv(arpu, monthly_churn, gross_margin)),
+        "ltv_cac": _to_number(metric_kernels.ltv_cac(arpu, monthly_churn, cac, gross_margin)),
+        "payback_months": _to_number(metric_kernels.cac_payback(cac, arpu, gross_margin)),
+    }
+    return result
+
+
+@tool
+def profile_data_file(file_path: str, rows: int = 5) -> str:
+    """
+    Profile a large CSV, TSV, JSON lines or text file without loading it: size, line count,
+    statistics of every column (CSV/TSV), and its first, last and evenly sampled lines.
+
+    Args:
+        file_path: Path of the data file
+        rows: Number of lines shown for each of the head, tail and sample (default: 5)
+    """
+    if os.path.splitext(file_path)[1].lower() not in LINE_FORMATS:
+        return f"Profiling needs a line-based file ({', '.join(LINE_FORMATS)})."
+    try:
+        return profile_file(file_path, rows)
+    except Exception as e:
+        return f"Could not profile {file_path}: {e}"
+
+
+@tool
+def stratified_sample(file_path: str, column: str, per_value: int = 3) -> str:
+    """
+    Random rows of a large CSV or TSV file for every distinct value of a column (e.g. a plan,
+    a country or a status), drawn in a single pass over the file. Columns with more than
+    100 distinct values, such as ids, cannot be sampled this way.
+
+    Args:
+        file_path: Path of the CSV or TSV file
+        column: Column whose values define the strata
+        per_value: Number of rows drawn for each value (default: 3)
+    """
+    try:
+        with MappedFile(file_path) as mapped:
+            if not mapped.header or column not in mapped.header:
+                return f"{file_path} has no column {column!r}; columns: {', '.join(map(str, mapped.header or []))}"
+            sample: str = mapped.stratified_sample(column, per_value, max_strata=MAX_SAMPLED_VALUES).to_string(index=False)
+            return sample
+    except ValueError as e:
+        return f"Could not sample {file_path}: {e}. Use profile_data_file to see the distinct values of its columns."
+    except Exception as e:
+        return f"Could not sample {file_path}: {e}"
+
+
+# Tools given to the data analyst agent
+STARTUP_KPI_TOOLS = [
+    compute_startup_kpis,
+    cohort_retention_table,
+    growth_rates,
+    compound_monthly_growth_rate,
+    churn_rates,
+    rolling_average,
+    burn_multiples,
+    unit_economics,
+    profile_data_file,
+    stratified_sample,
+]
@@ -0,0 +1,522 @@
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.mapped_file import LINE_FORMATS, MappedFile, profile_file
+from workspace.src.metric_kernels import (
+    aggregate_activity,
+    burn_multiple,
+    cac_payback,
+    cmgr,
+    cohort_counts,
+    cohort_retention as cohort_retention_matrix,
+    logo_churn,
+    ltv,
+    monthly_activity,
+    period_growth,
+    revenue_retention,
+)
+
+# Rows read at a time from tabular exports, so memory depends on the chunk size, not the file size
+METRICS_CHUNK_ROWS = int(os.getenv("METRICS_CHUNK_ROWS", "100000"))
+SUPPORTED_EXTENSIONS = (".csv", ".tsv", ".json", ".jsonl", ".ndjson", ".xlsx", ".txt")
+# Free-text lines quoted in the summary; longer text exports are profiled instead
+MAX_NOTES = 20
+
+# Canonical metric names and the normalized column or label names they are recognized from
+METRIC_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "month": ("month", "date", "period", "mois", "periode", "invoice_date", "billing_month"),
+    "customer_id": ("customer_id", "customer", "client_id", "client", "account_id", "account", "subscription_id"),
+    "mrr": ("mrr", "monthly_recurring_revenue", "recurring_revenue", "revenue", "amount", "revenu", "chiffre_d_affaires"),
+    "customers": ("customers", "active_customers", "paying_customers", "clients", "users", "active_users"),
+    "new_customers": ("new_customers", "new_customers_acquired", "customers_acquired", "new_users", "nouveaux_clients"),
+    "churned_customers": ("churned_customers", "lost_customers", "churned_users", "churned"),
+    "churn_rate": ("churn_rate", "churn", "churn_rate_customer", "customer_churn", "logo_churn"),
+    "cac": ("cac", "customer_acquisition_cost"),
+    "marketing_spend": ("marketing_spend", "sales_and_marketing", "s_m_spend", "acquisition_spend"),
+    "burn": ("burn", "net_burn", "cash_burn", "burn_rate"),
+    "cash": ("cash", "cash_balance", "treasury", "tresorerie"),
+    "arpu": ("arpu", "average_revenue_per_user"),
+    "ltv": ("ltv", "cltv", "clv", "customer_lifetime_value", "lifetime_value"),
+}
+# Monthly metrics that are rates or averages rather than amounts, so rows of the same month are averaged
+RATE_METRICS = frozenset(["churn_rate", "cac", "arpu", "ltv"])
+SERIES_METRICS = tuple(name for name in METRIC_ALIASES if name not in ("month", "customer_id"))
+
+_ALIAS_LOOKUP = {alias: name for name, aliases in METRIC_ALIASES.items() for alias in aliases}
+_NUMBER = re.compile(r"(-?\d[\d\s,.]*)\s*([kKmM%]?)")
+_DAY_FIRST_DATE = r"\s*\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}"
+
+
+def normalize_name(name: Any) -> str:
+    """Normalize a column or label name, e.g. "Monthly Recurring Revenue (MRR)" -> "monthly_recurring_revenue"."""
+    name = re.sub(r"\(.*?\)", "", str(name).lower())
+    return re.sub(r"[^a-z0-9]+", "_", name).strip("_")
+
+
+def _canonical(name: Any) -> Optional[str]:
+    return _ALIAS_LOOKUP.get(normalize_name(name))
+
+
+def parse_number(text: str) -> Optional[float]:
+    """Parse a figure such as "$50,000", "5%", "1.2M" or "12 500 €"; percentages are returned as fractions."""
+    match = _NUMBER.search(text)
+    if not match:
+        return None
+    digits, suffix = match.group(1).replace(" ", "").replace(" ", ""), match.group(2).lower()
+    if "," in digits and "." not in digits and len(digits.split(",")[-1]) != 3:
+        # Decimal comma, as in "4,5 %"
+        digits = digits.replace(",", ".")
+    try:
+        value = float(digits.replace(",", ""))
+    except ValueError:
+        return None
+    return value * {"k": 1e3, "m": 1e6, "%": 0.01}.get(suffix, 1.0)
+
+
+def _numeric(column: pd.Series, decimal_comma: bool = False) -> pd.Series:
+    """
+    Numbers of a column of figures. With `decimal_comma` (French exports) the comma is the
+    decimal mark and dots only group thousands, unless every comma of the column groups
+    thousands the US way; otherwise a comma is read as parse_number reads it: a decimal
+    mark unless three digits follow it.
+    """
+    if pd.api.types.is_numeric_dtype(column):
+        return column.astype(np.float64)
+    if not decimal_comma:
+        values = pd.to_numeric(column, errors="coerce")
+        if values.notna().sum() == (column.astype(str).str.strip() != "").sum():
+            # Plain numbers: skip the cleanup of currency symbols, separators and percentages
+            return values.astype(np.float64)
+    text = column.astype(str).str.strip()
+    percent = text.str.endswith("%")
+    cleaned = text.str.replace(r"[^\d.,\-]", "", regex=True)
+    commas = cleaned[cleaned.str.contains(",", regex=False)]
+    if decimal_comma and len(commas) and commas.str.fullmatch(r"-?\d{1,3}(?:,\d{3})+(?:\.\d+)?").all():
+        # Every comma groups thousands the US way ("$22,000"), whatever the separator
+        decimal_comma = False
+    if decimal_comma:
+        cleaned = cleaned.str.replace(r"\.(?=\d{3}(?:\D|$))", "", regex=True).str.replace(",", ".", regex=False)
+    else:
+        # Same rule as parse_number: "4,5" and "1000,50" have a decimal comma, "1,000" a thousands one
+        decimal = cleaned.str.fullmatch(r"[^.]*,(?:\d{0,2}|\d{4,})")
+        cleaned = cleaned.where(~decimal, cleaned.str.replace(",", ".", regex=False)).str.replace(",", "", regex=False)
+    values = pd.to_numeric(cleaned, errors="coerce")
+    return values.where(~percent, values / 100)
+
+
+class StartupMetrics:
+    """
+    Typed metrics of one startup: a monthly series of canonical metrics, revenue per
+    customer and month when the export is customer-level (integer customer codes and
+    month ordinals, sorted by customer then month, as the activity kernels take them),
+    and single reported figures (from text exports) keyed by canonical name.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        monthly: pd.DataFrame,
+        customer_revenue: Optional[pd.DataFrame] = None,
+        reported: Optional[Dict[str, float]] = None,
+        notes: Optional[List[str]] = None,
+        rows_read: int = 0,
+        profile: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.monthly = monthly
+        self.customer_revenue = customer_revenue
+        self.reported = reported or {}
+        self.notes = notes or []
+        self.rows_read = rows_read
+        # Profile of the raw file, when it could not be reduced to metrics
+        self.profile = profile
+
+
+def _iter_mapped(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Frames of a CSV, TSV or JSON lines export, parsed from slices of its memory map."""
+    with MappedFile(path) as mapped:
+        yield from mapped.iter_frames(mapped.rows_to_bytes(chunk_rows))
+
+
+def _iter_json(path: str, chunk_rows: int) -> Iterator[Any]:
+    with open(path, encoding="utf-8") as handle:
+        first = handle.read(1)
+        while first.isspace():
+            first = handle.read(1)
+    if first not in "[{":
+        yield from pd.read_json(path, lines=True, chunksize=chunk_rows, dtype=False)
+        return
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    if isinstance(data, dict):
+        records = next((value for value in data.values() if isinstance(value, list) and value and isinstance(value[0], dict)), None)
+        if records is None and any(isinstance(value, list) for value in data.values()):
+            # Column-oriented: {"month": [...], "mrr": [...]}
+            records = pd.DataFrame(data)
+        scalars = {key: value for key, value in data.items() if not isinstance(value, (list, dict))}
+        if scalars:
+            yield scalars
+        data = records if records is not None else []
+    frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+def _iter_xlsx(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(cell) if cell is not None else "" for cell in next(rows, ())]
+        chunk: List[Tuple[Any, ...]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def _iter_text(path: str) -> Iterator[Dict[str, str]]:
+    """Stream "Label: value" lines of a text export, as {label: value} dicts."""
+    with MappedFile(path) as mapped:
+        for chunk in mapped.iter_chunks():
+            for line in str(chunk, "utf-8", errors="replace").lstrip("\ufeff").splitlines():
+                label, separator, value = line.strip().lstrip("-•* ").partition(":")
+                if separator and value.strip():
+                    yield {label.strip(): value.strip()}
+                elif line.strip():
+                    yield {"": line.strip()}
+
+
+def _reported_metric(label: str) -> Optional[str]:
+    """Canonical metric a free-text label refers to, e.g. "Churn Rate (Customer)" -> "churn_rate"."""
+    normalized = normalize_name(label)
+    if normalized in _ALIAS_LOOKUP:
+        return _ALIAS_LOOKUP[normalized]
+    acronym = re.search(r"\(([A-Za-z]+)\)", label)
+    if acronym and acronym.group(1).lower() in _ALIAS_LOOKUP:
+        return _ALIAS_LOOKUP[acronym.group(1).lower()]
+    for alias, name in sorted(_ALIAS_LOOKUP.items(), key=lambda item: -len(item[0])):
+        if len(alias) > 3 and alias in normalized and name not in ("month", "customer_id"):
+            return name
+    return None
+
+
+def _to_month(column: pd.Series, dayfirst: bool = False) -> pd.Series:
+    """
+    Month ordinals (months since January 1970, as pandas monthly periods count them) of a
+    date column; `dayfirst` reads "01/03/2024" as March 1, as French exports write it.
+    """
+    text = column.astype(str)
+    # Only dates starting with the day ("01/03/2024"); pandas would also swap ISO ones
+    dayfirst = dayfirst and bool(text.str.match(_DAY_FIRST_DATE).any())
+    # The format is inferred from the first date, which parses the column in one vectorized pass
+    dates = pd.to_datetime(text, errors="coerce", dayfirst=dayfirst)
+    if dates.isna().mean() > 0.5:
+        dates = pd.to_datetime(text, errors="coerce", format="mixed", dayfirst=dayfirst)
+    return (dates.dt.year - 1970) * 12 + dates.dt.month - 1
+
+
+def _period_index(ordinals: np.ndarray, name: str) -> pd.PeriodIndex:
+    return pd.PeriodIndex.from_ordinals(np.asarray(ordinals, dtype=np.int64), freq="M", name=name)
+
+
+def read_metrics(path: str, chunk_rows: int = METRICS_CHUNK_ROWS) -> StartupMetrics:
+    """
+    Stream a metrics export (CSV, JSON, JSON lines, XLSX or text) into typed metrics.
+
+    Tabular exports are read in chunks of `chunk_rows`; each chunk is reduced to the
+    recognized metric columns and aggregated per month (and per customer for
+    customer-level exports) before the next one is read, so only the aggregates are kept.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported metrics file type {extension!r}; expected one of {', '.join(SUPPORTED_EXTENSIONS)}")
+    name = os.path.splitext(os.path.basename(path))[0]
+    reported: Dict[str, float] = {}
+    notes: List[str] = []
+    monthly_parts: List[pd.DataFrame] = []
+    customer_parts: List[pd.DataFrame] = []
+    rows_read = 0
+    omitted_notes = 0
+    # Semicolon-separated exports come from French spreadsheets: "1 234,50" and day-first dates
+    french = False
+
+    if extension == ".txt":
+        chunks: Iterator[Any] = _iter_text(path)
+    elif extension == ".xlsx":
+        chunks = _iter_xlsx(path, chunk_rows)
+    elif extension == ".json":
+        chunks = _iter_json(path, chunk_rows)
+    else:
+        with MappedFile(path) as mapped:
+            french = mapped.separator == ";"
+        chunks = _iter_mapped(path, chunk_rows)
+
+    for chunk in chunks:
+        if isinstance(chunk, dict):
+            # A reported figure or a note
+            for label, value in chunk.items():
+                metric = _reported_metric(label) if label else None
+                number = parse_number(str(value)) if metric else None
+                if metric is not None and number is not None:
+                    if metric == "churn_rate" and number > 1:
+                        number /= 100
+                    reported[metric] = number
+                elif normalize_name(label) in ("startup_name", "company", "company_name", "startup", "name"):
+                    name = str(value)
+                elif len(notes) >= MAX_NOTES:
+                    omitted_notes += 1
+                elif label or value:
+                    notes.append(f"{label}: {value}" if label else str(value))
+            continue
+
+        rows_read += len(chunk)
+        columns = {}
+        for column in chunk.columns:
+            canonical = _canonical(column)
+            if canonical is not None and canonical not in columns:
+                columns[canonical] = chunk[column]
+        if "month" not in columns:
+            continue
+        frame = pd.DataFrame({"month": _to_month(columns.pop("month"), dayfirst=french)})
+        customer_ids = columns.pop("customer_id", None)
+        if customer_ids is not None:
+            frame["customer_id"] = customer_ids.astype(str)
+        for metric, column in columns.items():
+            frame[metric] = _numeric(column, decimal_comma=french)
+        frame = frame.dropna(subset=["month"]).astype({"month": np.int64})
+        if "churn_rate" in frame and frame["churn_rate"].max() > 1:
+            frame["churn_rate"] = frame["churn_rate"] / 100
+        if customer_ids is not None and "mrr" in frame:
+            customer_parts.append(frame.groupby(["customer_id", "month"], sort=False)["mrr"].sum().reset_index())
+        else:
+            monthly_parts.append(_aggregate_months(frame.drop(columns="customer_id", errors="ignore")))
+
+    customer_revenue = None
+    if customer_parts:
+        revenue = pd.concat(customer_parts)
+        customers, months, mrr = aggregate_activity(pd.factorize(revenue["customer_id"])[0], revenue["month"], revenue["mrr"])
+        customer_revenue = pd.DataFrame({"customer": customers, "month": months, "mrr": mrr})
+        monthly = _monthly_from_customers(customer_revenue)
+    elif monthly_parts:
+        monthly = _aggregate_months(pd.concat(monthly_parts))
+        monthly.index = _period_index(monthly.index.to_numpy(), "month")
+    else:
+        monthly = pd.DataFrame(columns=list(SERIES_METRICS), index=_period_index(np.array([], dtype=np.int64), "month"))
+
+    profile = None
+    if extension in LINE_FORMATS and (omitted_notes or (monthly.empty and not reported)):
+        # Nothing recognized, or too much free text to quote: describe the file from samples instead
+        if omitted_notes:
+            notes.append(f"... {omitted_notes:,} more lines not shown")
+        profile = profile_file(path)
+    return StartupMetrics(name, monthly, customer_revenue, reported, notes, rows_read, profile)
+
+
+def _aggregate_months(frame: pd.DataFrame) -> pd.DataFrame:
+    if frame.index.name == "month":
+        frame = frame.reset_index()
+    columns = [column for column in frame.columns if column != "month"]
+    grouped = frame.groupby("month")
+    # min_count=1: a month whose cells are all blank stays missing instead of summing to 0
+    sums = grouped[[column for column in columns if column not in RATE_METRICS]].sum(min_count=1)
+    means = grouped[[column for column in columns if column in RATE_METRICS]].mean()
+    return pd.concat([sums, means], axis=1)[columns].sort_index()
+
+
+def _activity(customer_revenue: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int, int]:
+    months = customer_revenue["month"].to_numpy()
+    start = int(months.min())
+    return customer_revenue["customer"].to_numpy(), months, customer_revenue["mrr"].to_numpy(), start, int(months.max()) - start + 1
+
+
+def _monthly_from_customers(customer_revenue: pd.DataFrame) -> pd.DataFrame:
+    """Monthly MRR, customers, new and churned customers from revenue per customer and month."""
+    customers, months, revenue, start, size = _activity(customer_revenue)
+    return pd.DataFrame(
+        monthly_activity(customers, months, revenue, start, size),
+        index=_period_index(np.arange(start, start + size), "month"),
+    )
+
+
+def cohort_retention(customer_revenue: pd.DataFrame) -> pd.DataFrame:
+    """Share of each monthly cohort still active after 0, 1, 2... months (rows: cohorts, columns: age)."""
+    customers, months, _, start, size = _activity(customer_revenue)
+    cohort_months, counts = cohort_counts(customers, months)
+    return pd.DataFrame(
+        cohort_retention_matrix(cohort_months, counts, start + size - 1),
+        index=_period_index(cohort_months, "cohort"),
+        columns=pd.RangeIndex(counts.shape[1], name="age"),
+    )
+
+
+def _mean_last(values: np.ndarray, count: int = 3) -> Optional[float]:
+    values = values[~np.isnan(values)][-count:]
+    return float(values.mean()) if len(values) else None
+
+
+def _latest(values: np.ndarray) -> Optional[float]:
+    """Last known value of a monthly series, skipping blank months."""
+    values = values[~np.isnan(values)]
+    return float(values[-1]) if len(values) else None
+
+
+def _scalar(value: np.ndarray) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def compute_kpis(metrics: StartupMetrics) -> Dict[str, Optional[float]]:
+    """
+    VC KPIs computed from the metrics: MRR growth (MoM, YoY, CMGR), logo and revenue
+    churn, net revenue retention, unit economics (ARPU, CAC, LTV, LTV/CAC, payback),
+    burn multiple and runway. Monthly rates average the last three months. Figures that
+    cannot be computed from a series fall back to the reported ones, or None.
+    """
+    monthly = metrics.monthly
+    reported = metrics.reported
+    kpis: Dict[str, Optional[float]] = {"months": float(len(monthly))}
+
+    def column(name: str) -> Optional[np.ndarray]:
+        return monthly[name].to_numpy(dtype=np.float64) if name in monthly and monthly[name].notna().any() else None
+
+    mrr = column("mrr")
+    customers = column("customers")
+    kpis["mrr"] = _latest(mrr) if mrr is not None else reported.get("mrr")
+    kpis["arr"] = kpis["mrr"] * 12 if kpis["mrr"] is not None else None
+    kpis["mom_growth"] = kpis["yoy_growth"] = kpis["cmgr"] = None
+    if mrr is not None and len(mrr) > 1:
+        kpis["mom_growth"] = _mean_last(period_growth(mrr))
+        kpis["yoy_growth"] = _scalar(period_growth(mrr, 12)[-1])
+        kpis["cmgr"] = _scalar(cmgr(mrr))
+
+    churn = None
+    churned = column("churned_customers")
+    if churned is not None and customers is not None:
+        churn = _mean_last(logo_churn(customers, churned))
+    churn_rate = column("churn_rate")
+    if churn is None and churn_rate is not None:
+        churn = _mean_last(churn_rate)
+    kpis["logo_churn"] = churn if churn is not None else reported.get("churn_rate")
+
+    kpis["revenue_churn"] = kpis["nrr"] = None
+    if metrics.customer_revenue is not None:
+        gross_churn, nrr = revenue_retention(*_activity(metrics.customer_revenue))
+        kpis["revenue_churn"], kpis["nrr"] = _mean_last(gross_churn), _mean_last(nrr)
+
+    kpis["customers"] = _latest(customers) if customers is not None else reported.get("customers")
+    arpu = reported.get("arpu")
+    if kpis["mrr"] is not None and kpis["customers"]:
+        arpu = kpis["mrr"] / kpis["customers"]
+    kpis["arpu"] = arpu
+
+    cac = reported.get("cac")
+    spend, new, cac_series = column("marketing_spend"), column("new_customers"), column("cac")
+    if spend is not None and new is not None and new[-3:].sum() > 0:
+        cac = float(spend[-3:].sum() / new[-3:].sum())
+    elif cac_series is not None:
+        cac = _mean_last(cac_series)
+    kpis["cac"] = cac
+
+    lifetime_value = reported.get("ltv")
+    if lifetime_value is None and arpu is not None and kpis["logo_churn"] is not None:
+        lifetime_value = _scalar(ltv(arpu, kpis["logo_churn"]))
+    kpis["ltv"] = lifetime_value
+    kpis["ltv_cac"] = lifetime_value / cac if lifetime_value is not None and cac else None
+    kpis["payback_months"] = _scalar(cac_payback(cac, arpu)) if cac is not None and arpu is not None else None
+
+    burn, cash = column("burn"), column("cash")
+    kpis["burn_multiple"] = kpis["runway_months"] = None
+    if burn is not None and mrr is not None:
+        kpis["burn_multiple"] = _scalar(burn_multiple(burn, mrr)[-1])
+    latest_burn, latest_cash = (_latest(burn) if burn is not None else None), (_latest(cash) if cash is not None else None)
+    if latest_burn is not None and latest_cash is not None and latest_burn > 0:
+        kpis["runway_months"] = latest_cash / latest_burn
+
+    if metrics.customer_revenue is not None:
+        retention = cohort_retention(metrics.customer_revenue)
+        for age in (1, 3, 6):
+            kpis[f"retention_m{age}"] = _scalar(retention[age].mean()) if age in retention else None
+    return kpis
+
+
+def _format_value(name: str, value: Optional[float]) -> str:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return "n/a"
+    if name in ("mom_growth", "yoy_growth", "cmgr", "logo_churn", "revenue_churn", "nrr") or name.startswith("retention_"):
+        return f"{value:.1%}"
+    if name in ("mrr", "arr", "arpu", "cac", "ltv"):
+        return f"${value:,.0f}"
+    if name in ("ltv_cac", "burn_multiple"):
+        return f"{value:.2f}x"
+    if name in ("payback_months", "runway_months"):
+        return f"{value:.1f} months"
+    return f"{value:,.0f}"
+
+
+KPI_LABELS = {
+    "mrr": "MRR (latest)",
+    "arr": "ARR run rate",
+    "mom_growth": "MoM MRR growth (avg last 3 months)",
+    "yoy_growth": "YoY MRR growth",
+    "cmgr": "CMGR over the period",
+    "customers": "Customers (latest)",
+    "logo_churn": "Monthly logo churn",
+    "revenue_churn": "Monthly gross revenue churn",
+    "nrr": "Monthly net revenue retention",
+    "retention_m1": "Cohort retention after 1 month",
+    "retention_m3": "Cohort retention after 3 months",
+    "retention_m6": "Cohort retention after 6 months",
+    "arpu": "ARPU (monthly)",
+    "cac": "CAC",
+    "ltv": "LTV (revenue / churn)",
+    "ltv_cac": "LTV / CAC",
+    "payback_months": "CAC payback",
+    "burn_multiple": "Burn multiple (last quarter)",
+    "runway_months": "Runway",
+}
+
+
+def summarize_metrics(metrics: StartupMetrics, kpis: Optional[Dict[str, Optional[float]]] = None, recent_months: int = 6) -> str:
+    """Compact text summary of computed KPIs and recent monthly figures, sized for an LLM prompt."""
+    kpis = kpis or compute_kpis(metrics)
+    lines = [f"Startup: {metrics.name}"]
+    if len(metrics.monthly):
+        lines.append(
+            f"Period: {metrics.monthly.index[0]} to {metrics.monthly.index[-1]} "
+            f"({len(metrics.monthly)} months, {metrics.rows_read} rows ingested)"
+        )
+    lines.append("")
+    lines.append("Computed KPIs:")
+    lines.extend(f"- {label}: {_format_value(name, kpis.get(name))}" for name, label in KPI_LABELS.items() if kpis.get(name) is not None)
+    missing = [label for name, label in KPI_LABELS.items() if kpis.get(name) is None]
+    if missing:
+        lines.append(f"- Not computable from the data: {', '.join(missing)}")
+
+    if len(metrics.monthly):
+        recent = metrics.monthly.tail(recent_months).dropna(axis=1, how="all")
+        lines.append("")
+        lines.append(f"Last {len(recent)} months:")
+        lines.append(recent.to_string(float_format=lambda value: f"{value:,.2f}"))
+    if metrics.notes:
+        lines.append("")
+        lines.append("Other information:")
+        lines.extend(f"- {note}" for note in metrics.notes)
+    if metrics.profile:
+        lines.append("")
+        lines.append("Data profile:")
+        lines.append(metrics.profile)
+    return "\n".join(lines)
@@ -15,20 +15,20 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 # Add the project root to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from workspace.src.huggingface_search import search_models, analyze_model_feasibility
+from workspace.src.huggingface_search import search_models, analyze_model_feasibility, compare_model_feasibility
 from workspace.src.hf_papers_search import search_papers, analyze_paper_novelty
 from smolagents import CodeAgent
-from smolagents.models import LiteLLMModel
+from workspace.src.llm_cache import create_model
 
 
 class TechnicalAssistant:
     def __init__(self, api_key):
         # Initialize the tools explicitly
-        self.tools = [search_models, search_papers, analyze_model_feasibility, analyze_paper_novelty]
+        self.tools = [search_models, search_papers, analyze_model_feasibility, compare_model_feasibility, analyze_paper_novelty]
         
         self.agent = CodeAgent(
             tools=self.tools,
-            model=LiteLLMModel(model_id="anthropic/claude-3-5-sonnet-latest", api_key=api_key),
+            model=create_model(api_key, model_id="anthropic/claude-3-5-sonnet-latest"),
             add_base_tools=True,  # Changed to True to include base tools
             additional_authorized_imports=["requests", "json", "datetime", "re"],  # Add necessary imports
         )
@@ -53,6 +53,7 @@ class TechnicalAssistant:
         7. Investment recommendation (High/Medium/Low potential)
         
         Use the available tools to search for relevant models and papers to support your analysis.
+        When several candidate models are involved, compare them in one call with compare_model_feasibility.
         Provide specific evidence and citations from your research.
         """
         
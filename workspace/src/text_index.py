@@ -0,0 +1,166 @@
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+ENGLISH_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were which with we our".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens of a text, without English stopwords."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in ENGLISH_STOPWORDS]
+
+
+class BM25Index:
+    """
+    Inverted index over a fixed collection of documents, ranked with Okapi BM25.
+
+    Postings are stored in compressed sparse row form: the documents containing term t
+    are `doc_ids[offsets[t]:offsets[t + 1]]`, with matching `term_frequencies`. A query
+    accumulates the BM25 contribution of each of its terms into one score array with
+    NumPy, so its cost grows with the posting lists it touches, not with the collection.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        term_frequencies: np.ndarray,
+        doc_lengths: np.ndarray,
+        tokenizer: Callable[[str], List[str]] = tokenize,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ) -> None:
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.term_frequencies = term_frequencies
+        self.doc_lengths = doc_lengths
+        self.tokenizer = tokenizer
+        self.k1 = k1
+        self.b = b
+
+        document_count = len(doc_lengths)
+        document_frequencies = np.diff(offsets).astype(np.float64)
+        self.idf = np.log1p((document_count - document_frequencies + 0.5) / (document_frequencies + 0.5))
+        average_length = doc_lengths.mean() if document_count else 0.0
+        length_norm = k1 * (1 - b + b * doc_lengths / average_length) if document_count else np.empty(0)
+        # BM25 weight of every posting, computed once so that a query only sums slices
+        term_ids = np.repeat(np.arange(len(vocabulary)), np.diff(offsets))
+        self.weights = (
+            self.idf[term_ids] * term_frequencies * (k1 + 1) / (term_frequencies + length_norm[doc_ids])
+        ).astype(np.float32)
+
+    @classmethod
+    def build(cls, documents: Iterable[str], tokenizer: Callable[[str], List[str]] = tokenize, **kwargs: float) -> "BM25Index":
+        """Tokenize and index documents; document ids are their positions in the iterable."""
+        vocabulary: Dict[str, int] = {}
+        term_column: List[int] = []
+        doc_column: List[int] = []
+        frequency_column: List[int] = []
+        doc_lengths: List[int] = []
+        for doc_id, text in enumerate(documents):
+            tokens = tokenizer(text)
+            doc_lengths.append(len(tokens))
+            counts: Dict[int, int] = {}
+            for token in tokens:
+                term_id = vocabulary.setdefault(token, len(vocabulary))
+                counts[term_id] = counts.get(term_id, 0) + 1
+            term_column.extend(counts.keys())
+            doc_column.extend([doc_id] * len(counts))
+            frequency_column.extend(counts.values())
+
+        terms = np.asarray(term_column, dtype=np.int64)
+        # A stable sort keeps each posting list in increasing document order
+        order = np.argsort(terms, kind="stable")
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocabulary)), out=offsets[1:])
+        return cls(
+            vocabulary,
+            offsets,
+            np.asarray(doc_column, dtype=np.int32)[order],
+            np.asarray(frequency_column, dtype=np.float32)[order],
+            np.asarray(doc_lengths, dtype=np.float32),
+            tokenizer=tokenizer,
+            **kwargs,
+        )
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for a query."""
+        scores = np.zeros(len(self), dtype=np.float64)
+        for term_id in self._query_terms(query, distinct=False):
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            # Posting lists hold each document once, so the fancy-indexed add is safe
+            scores[self.doc_ids[start:end]] += self.weights[start:end]
+        return scores
+
+    def term_matches(self, query: str) -> np.ndarray:
+        """Number of distinct query terms every document contains."""
+        matches = np.zeros(len(self), dtype=np.int32)
+        for term_id in self._query_terms(query, distinct=True):
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            matches[self.doc_ids[start:end]] += 1
+        return matches
+
+    def _query_terms(self, query: str, distinct: bool) -> List[int]:
+        tokens = self.tokenizer(query)
+        if distinct:
+            tokens = list(dict.fromkeys(tokens))
+        return [self.vocabulary[token] for token in tokens if token in self.vocabulary]
+
+    def search(self, query: str, limit: int = 10, candidates: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Return up to `limit` (document id, score) pairs with a positive score, best first.
+
+        `candidates`, a boolean mask over documents, restricts the results to a subset.
+        """
+        if limit <= 0:
+            return []
+        scores = self.scores(query)
+        if candidates is not None:
+            scores[~candidates] = 0.0
+        matching = np.flatnonzero(scores > 0)
+        if limit < len(matching):
+            matching = matching[np.argpartition(-scores[matching], limit - 1)[:limit]]
+        matching = matching[np.argsort(-scores[matching], kind="stable")]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in matching]
+
+    def save(self, path: str, **metadata: str) -> None:
+        """Write the index to an .npz file, with optional string metadata."""
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        np.savez(
+            path,
+            terms=np.asarray(terms, dtype=str),
+            offsets=self.offsets,
+            doc_ids=self.doc_ids,
+            term_frequencies=self.term_frequencies,
+            doc_lengths=self.doc_lengths,
+            parameters=np.asarray([self.k1, self.b]),
+            metadata=np.asarray([f"{key}={value}" for key, value in metadata.items()], dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path: str, tokenizer: Callable[[str], List[str]] = tokenize) -> Tuple["BM25Index", Dict[str, str]]:
+        """Read an index written by save(); returns (index, metadata)."""
+        with np.load(path, allow_pickle=False) as data:
+            vocabulary = {term: term_id for term_id, term in enumerate(data["terms"].tolist())}
+            k1, b = data["parameters"].tolist()
+            metadata = dict(entry.split("=", 1) for entry in data["metadata"].tolist())
+            index = cls(
+                vocabulary,
+                data["offsets"],
+                data["doc_ids"],
+                data["term_frequencies"],
+                data["doc_lengths"],
+                tokenizer=tokenizer,
+                k1=k1,
+                b=b,
+            )
+        return index, metadata
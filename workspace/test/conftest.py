@@ -0,0 +1,271 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+SAMPLE_MODELS = [
+    {
+        "id": "google-bert/bert-base-uncased",
+        "downloads": 5000000,
+        "likes": 2000,
+        "pipeline_tag": "fill-mask",
+        "library_name": "transformers",
+        "tags": ["transformers", "bert", "fill-mask", "base"],
+        "createdAt": "2022-03-02T23:29:04.000Z",
+        "lastModified": "2024-02-19T11:06:12.000Z",
+    },
+    {
+        "id": "openai/whisper-large-v3",
+        "downloads": 400000,
+        "likes": 3500,
+        "pipeline_tag": "automatic-speech-recognition",
+        "library_name": "transformers",
+        "tags": ["transformers", "whisper", "audio", "large"],
+        "createdAt": "2023-11-07T18:41:14.000Z",
+        "lastModified": "2024-08-12T10:20:10.000Z",
+    },
+    {
+        "id": "someone/tiny-experiment",
+        "downloads": 42,
+        "likes": 1,
+        "pipeline_tag": "text-classification",
+        "library_name": "",
+        "tags": ["text-classification"],
+        "createdAt": "2024-05-01T00:00:00.000Z",
+        "lastModified": "2024-05-01T00:00:00.000Z",
+    },
+]
+
+
+class HubStandIn(ThreadingHTTPServer):
+    """Minimal local imitation of the Hugging Face Hub models API."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), HubStandInHandler)
+        self.models = list(SAMPLE_MODELS)
+        self.requests = []
+        self.client_ports = set()
+        # Status codes answered, one per request, before serving normally
+        self.failures = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api"
+
+
+class HubStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        with server.lock:
+            server.requests.append(self.path)
+            server.client_ports.add(self.client_address[1])
+            failure = server.failures.pop(0) if server.failures else None
+        if failure is not None:
+            self._send(failure, {"error": "stand-in failure"}, {"Retry-After": "0"})
+            return
+
+        query = parse_qs(parsed.query)
+        if parsed.path == "/api/models":
+            search = query.get("search", [""])[0].lower()
+            limit = int(query.get("limit", ["1000"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+            matches = [model for model in server.models if search in model["id"].lower()]
+            page = matches[offset:offset + limit]
+            headers = {}
+            if offset + limit < len(matches):
+                headers["Link"] = f'<{server.url}/models?{self._next_query(query, offset + limit)}>; rel="next"'
+            self._send(200, page, headers)
+        elif parsed.path.startswith("/api/models/"):
+            model_id = parsed.path[len("/api/models/"):]
+            model = next((model for model in server.models if model["id"] == model_id), None)
+            if model is None:
+                self._send(404, {"error": "Repository not found"})
+            else:
+                self._send(200, model, {"ETag": f'"{model_id}-{model["downloads"]}"'}, if_none_match=True)
+        else:
+            self._send(404, {"error": "not found"})
+
+    def _next_query(self, query, offset):
+        params = {key: values[0] for key, values in query.items()}
+        params["offset"] = str(offset)
+        return "&".join(f"{key}={value}" for key, value in params.items())
+
+    def _send(self, status, payload, headers=None, if_none_match=False):
+        headers = headers or {}
+        if if_none_match and headers.get("ETag") and self.headers.get("If-None-Match") == headers["ETag"]:
+            status, body = 304, b""
+        else:
+            body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def sample_models():
+    """Hub model records as the models API returns them."""
+    return [dict(model) for model in SAMPLE_MODELS]
+
+
+@pytest.fixture
+def hub_server():
+    server = HubStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+SAMPLE_LEGAL_RESULTS = [
+    {
+        "fond": "CODE_ETAT",
+        "nature": "CODE",
+        "titles": [{"id": "LEGITEXT000005634379", "cid": "LEGITEXT000005634379", "title": "Code de commerce", "legalStatus": "VIGUEUR"}],
+        "sections": [{
+            "title": "Chapitre V : Des sociétés anonymes",
+            "extracts": [{
+                "id": "LEGIARTI000006224012",
+                "num": "L225-1",
+                "legalStatus": "VIGUEUR",
+                "dateVersion": 1702598400000,
+                "values": ["La <mark>société anonyme</mark> est la société dont le capital est divisé en actions."],
+            }],
+        }],
+    },
+    {
+        "fond": "LODA_ETAT",
+        "nature": "LOI",
+        "titles": [{"id": "JORFTEXT000038496102", "title": "LOI n° 2019-486 du 22 mai 2019 relative à la croissance et la transformation des entreprises", "legalStatus": "VIGUEUR"}],
+        "datePublication": "2019-05-23",
+        "text": "Plan d'action pour la croissance et la transformation des entreprises, société anonyme simplifiée.",
+    },
+    {
+        "fond": "JURI",
+        "origin": "JURI",
+        "titles": [{"id": "JURITEXT000047318823", "title": "Cour de cassation, civile, Chambre commerciale, 15 mars 2023, 21-20.456"}],
+        "dateDecision": "2023-03-15",
+        "text": "La responsabilité du dirigeant de société anonyme peut être engagée pour faute de gestion.",
+    },
+    {
+        "fond": "CETAT",
+        "origin": "CETAT",
+        "titles": [{"id": "CETATEXT000048912345", "title": "Conseil d'État, 6ème chambre, 12 janvier 2024, 468234"}],
+        "dateDecision": 1705017600000,
+        "text": "Agrément préalable des sociétés de technologie financière.",
+    },
+]
+
+
+class PisteStandIn(ThreadingHTTPServer):
+    """Minimal local imitation of the PISTE OAuth endpoint and the Légifrance search API."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), PisteStandInHandler)
+        self.results = list(SAMPLE_LEGAL_RESULTS)
+        self.token_requests = 0
+        self.search_requests = []
+        self.expires_in = 3600
+        self.valid_tokens = set()
+        # Seconds each search takes, to observe how many run at once
+        self.search_delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/lf"
+
+    @property
+    def oauth_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/oauth/token"
+
+
+class PisteStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        if self.path == "/oauth/token":
+            form = parse_qs(body.decode("utf-8"))
+            if form.get("grant_type") != ["client_credentials"] or form.get("client_secret") != ["secret"]:
+                self._send(401, {"error": "invalid_client"})
+                return
+            with server.lock:
+                server.token_requests += 1
+                token = f"token-{server.token_requests}"
+                server.valid_tokens.add(token)
+            self._send(200, {"access_token": token, "token_type": "Bearer", "expires_in": server.expires_in})
+            return
+
+        token = self.headers.get("Authorization", "")[len("Bearer "):]
+        if token not in server.valid_tokens:
+            self._send(401, {"error": "invalid_token"})
+            return
+        if self.path != "/lf/search":
+            self._send(404, {"error": "not found"})
+            return
+
+        payload = json.loads(body)
+        with server.lock:
+            server.search_requests.append(payload)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if server.search_delay:
+                time.sleep(server.search_delay)
+            search = payload["recherche"]
+            words = search["champs"][0]["criteres"][0]["valeur"].lower().split()
+            natures = [value for facet in search.get("filtres", []) if facet["facette"] == "NATURE" for value in facet["valeurs"]]
+            matches = [
+                result for result in server.results
+                if payload["fond"] in ("ALL", result["fond"])
+                and (not natures or result.get("nature") in natures)
+                and any(word in json.dumps(result, ensure_ascii=False).lower() for word in words)
+            ]
+            page = matches[:search["pageSize"]]
+            self._send(200, {"results": page, "totalResultNumber": len(matches)})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def piste_server():
+    server = PisteStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
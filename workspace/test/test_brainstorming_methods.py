@@ -0,0 +1,106 @@
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("smolagents")
+from workspace.src.brainstorming_methods import bmm, sb, sc, _run_in_parallel
+
+
+class FakeAgent:
+    """
+    Thread-safe stand-in for an agent: numbered bullets, a short delay per call. With
+    `together`, per-idea calls wait on a barrier, so they only return if that many overlap.
+    """
+
+    def __init__(self, delay=0.05, together=None):
+        self.delay = delay
+        self.barrier = threading.Barrier(together) if together else None
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    def run(self, prompt):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        if self.barrier is not None and "10 initial ideas" not in prompt:
+            self.barrier.wait(timeout=10)
+        with self.lock:
+            self.in_flight -= 1
+        if "10 initial ideas" in prompt:
+            return "\n".join(f"- idea {i}" for i in range(10))
+        topic = prompt.strip().splitlines()[-2]
+        return f"- expansion of {topic}"
+
+
+def test_run_in_parallel_preserves_order():
+    assert _run_in_parallel(lambda x: x * 2, [3, 1, 2], max_in_flight=3) == [6, 2, 4]
+
+
+def test_per_idea_calls_run_concurrently_in_order():
+    # The ten per-idea calls can only return once all of them are in flight together
+    agent = FakeAgent(delay=0, together=10)
+    output = bmm("social apps", agent, max_in_flight=10)
+
+    assert agent.calls == 11
+    assert agent.max_in_flight == 10
+    positions = [output.index(f"**Idea {i + 1}:** idea {i}") for i in range(10)]
+    assert positions == sorted(positions)
+
+
+def test_max_in_flight_one_is_sequential():
+    agent = FakeAgent(delay=0)
+    sc("social apps", agent, max_in_flight=1)
+    assert agent.calls == 11
+    assert agent.max_in_flight == 1
+
+
+class FakeStarburstingAgent(FakeAgent):
+    def __init__(self, batched_output):
+        super().__init__(delay=0)
+        self.batched_output = batched_output
+
+    def run(self, prompt):
+        super().run(prompt)
+        if "List of 6 bullet questions" in prompt:
+            return "\n".join(f"- question {i}?" for i in range(6))
+        if "JSON array of answers" in prompt:
+            return self.batched_output
+        question = prompt.split("Question:", 1)[1].splitlines()[0]
+        return f"single answer to {question}"
+
+
+@pytest.mark.parametrize("mode", ["sequential", "concurrent"])
+def test_starbursting_answers_each_parsed_question(mode):
+    agent = FakeStarburstingAgent(batched_output="")
+    output = sb("food banks", agent, answer_mode=mode)
+    assert agent.calls == 7
+    for i in range(6):
+        assert f"**Question {i + 1}:** question {i}?" in output
+        assert f"**Answer:** single answer to question {i}?" in output
+
+
+def test_starbursting_batched_mode_uses_one_call_and_fills_gaps():
+    batched = 'Here you go: [' + ", ".join(
+        f'{{"question_number": {i + 1}, "answer": "batched answer {i}"}}' for i in range(5)
+    ) + ']'
+    agent = FakeStarburstingAgent(batched_output=batched)
+    output = sb("food banks", agent, answer_mode="batched")
+
+    # One call for the questions, one batched call, one fallback for the missing sixth answer
+    assert agent.calls == 3
+    assert "**Answer:** batched answer 4" in output
+    assert "**Answer:** single answer to question 5?" in output
+
+
+def test_starbursting_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        sb("food banks", FakeStarburstingAgent(batched_output=""), answer_mode="parallel")
@@ -0,0 +1,26 @@
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("litellm")
+from workspace.src.completion_engine import CompletionEngine, TrackedLiteLLMModel
+
+
+def test_completion_engine_makes_one_tracked_call_per_prompt():
+    # litellm answers with mock_response without any network call
+    model = TrackedLiteLLMModel(model_id="anthropic/claude-3-5-sonnet-latest", api_key="test", mock_response="- an idea")
+    engine = CompletionEngine(model)
+
+    assert engine.run("Give me an idea") == "- an idea"
+    assert engine.run("Give me another idea") == "- an idea"
+
+    usage = model.usage()
+    assert usage["calls"] == 2
+    assert usage["input_tokens"] > 0
+    assert usage["output_tokens"] > 0
+
+    model.reset_usage()
+    assert model.usage()["calls"] == 0
@@ -0,0 +1,50 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.compliance_rules import ComplianceRules, LEGAL_COMPLIANCE_RULES_PATH
+
+rules = ComplianceRules.from_file(LEGAL_COMPLIANCE_RULES_PATH)
+
+
+def test_single_sector_matches_previous_rendering():
+    analysis = rules.analyze("Application de paiement mobile", "SAS")
+    assert analysis["sectors"] == "Services financiers et paiement"
+    assert analysis["regulatory_obligations"] == """
+• Agrément ACPR (Autorité de Contrôle Prudentiel et de Résolution)
+• Respect des directives DSP2 et MiFID II
+• Déclaration auprès de TRACFIN (lutte anti-blanchiment)
+• Obligations de reporting prudentiel
+• Respect des ratios de solvabilité"""
+    assert analysis["tax_obligations"].startswith("\n• Impôt sur les sociétés (IS) - Taux standard ou réduit")
+    assert rules.analyze("Conseil en stratégie", "SARL")["licenses_required"].startswith(
+        "\n• Immatriculation au RCS (Registre du Commerce et des Sociétés)"
+    )
+    assert rules.analyze("Conseil en stratégie", "SARL")["tax_obligations"].startswith("\n• Obligations fiscales selon la forme juridique")
+
+
+def test_matches_several_sectors_and_short_words():
+    assert rules.match("Plateforme d'IA pour le diagnostic médical et le paiement des soins") == ("finance", "ai", "health")
+    # "ia" only counts as a word, not inside "spécialisé" or "social"
+    assert rules.match("Réseau social spécialisé") == ()
+    assert rules.match("Transformation digitale des PME") == ()
+    assert rules.match("Organisme de formation en ligne") == ("education",)
+    # "prêt" alone would also match "prêt-à-porter"
+    assert rules.match("Boutique en ligne de prêt-à-porter") == ("ecommerce",)
+    assert rules.match("Plateforme de prêt entre particuliers") == ("finance",)
+
+    analysis = rules.analyze("IA médicale et données de santé", "SAS")
+    obligations = analysis["regulatory_obligations"]
+    assert "AI Act" in obligations and "Règlement MDR" in obligations
+    assert obligations.count("\n•") == len(set(obligations.split("\n•")) - {""})
+
+
+def test_sections_are_cached():
+    rules.analyze("Néobanque pour PME", "SAS")
+    hits = rules.sections.cache_info().hits
+    for _ in range(1000):
+        analysis = rules.analyze("Banque en ligne pour PME", "sas")
+    assert rules.sections.cache_info().hits == hits + 1000
+    analysis["sectors"] = "changed"
+    assert rules.analyze("Banque en ligne pour PME", "SAS")["sectors"] == "Services financiers et paiement"
@@ -0,0 +1,87 @@
+import sys
+import os
+import asyncio
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("smolagents")
+from workspace.src import hub_client, hub_metadata_cache
+from workspace.src.hub_client import AsyncHubClient, HubClient
+from workspace.src.huggingface_search import analyze_model_feasibility, compare_model_feasibility, search_models
+
+
+@pytest.fixture
+def client(hub_server, monkeypatch):
+    client = HubClient(base_url=hub_server.url, backoff_factor=0)
+    monkeypatch.setattr(hub_client, "_hub_client", client)
+    monkeypatch.setattr(hub_metadata_cache, "_metadata_cache", hub_metadata_cache.ModelMetadataCache(":memory:", client=client))
+    yield client
+    client.close()
+
+
+def test_tools_reuse_pooled_connections(client, hub_server):
+    assert "google-bert/bert-base-uncased" in search_models(query="bert", limit=5)
+    assert "FEASIBILITY ANALYSIS FOR: openai/whisper-large-v3" in analyze_model_feasibility(model_id="openai/whisper-large-v3")
+    assert "FEASIBILITY ANALYSIS" in analyze_model_feasibility(model_id="google-bert/bert-base-uncased")
+
+    assert len(hub_server.requests) == 3
+    # Keep-alive: every request went over the same connection
+    assert len(hub_server.client_ports) == 1
+
+
+def test_retries_transient_errors(client, hub_server):
+    hub_server.failures = [503, 429]
+    response = client.get("/models/openai/whisper-large-v3")
+    assert response.status_code == 200
+    assert len(hub_server.requests) == 3
+
+
+def test_gives_up_after_max_retries(hub_server):
+    client = HubClient(base_url=hub_server.url, max_retries=1, backoff_factor=0)
+    hub_server.failures = [503, 503, 503]
+    assert client.get("/models").status_code == 503
+    assert len(hub_server.requests) == 2
+
+
+def test_rate_limit_reset_accepts_delays_and_epoch_times():
+    assert hub_client.retry_after_seconds({"Retry-After": "7"}) == 7.0
+    reset = hub_client.retry_after_seconds({"X-RateLimit-Reset": str(time.time() + 12)})
+    assert 10 < reset <= 12
+    # A reset time already passed means no wait
+    assert hub_client.retry_after_seconds({"X-RateLimit-Reset": str(time.time() - 5)}) == 0.0
+
+
+def test_retry_after_zero_does_not_block(hub_server):
+    client = HubClient(base_url=hub_server.url, max_retries=0, backoff_factor=0)
+    hub_server.failures = [429]
+    assert client.get("/models").status_code == 429
+    # The stand-in server answers "Retry-After: 0": later requests go out at once
+    assert client._blocked_until <= time.monotonic()
+    client.close()
+
+
+def test_async_client_retries_and_fetches_concurrently(hub_server):
+    hub_server.failures = [502]
+
+    async def fetch_all():
+        async with AsyncHubClient(base_url=hub_server.url, backoff_factor=0) as client:
+            responses = await asyncio.gather(*(client.get(f"/models/{model['id']}") for model in hub_server.models))
+            return [response.json()["id"] for response in responses]
+
+    ids = asyncio.run(fetch_all())
+    assert ids == [model["id"] for model in hub_server.models]
+
+
+def test_compare_model_feasibility_ranks_models(client, hub_server):
+    table = compare_model_feasibility(model_ids=[
+        "someone/tiny-experiment", "openai/whisper-large-v3", "google-bert/bert-base-uncased", "missing/model",
+    ])
+    rows = [line for line in table.splitlines() if line.startswith("| ") and line[2].isdigit()]
+    assert [row.split(" | ")[1] for row in rows] == [
+        "google-bert/bert-base-uncased", "openai/whisper-large-v3", "someone/tiny-experiment",
+    ]
+    assert "missing/model" in table.split("COULD NOT BE ANALYZED")[1]
+    assert len(hub_server.requests) == 4
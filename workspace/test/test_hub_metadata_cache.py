@@ -0,0 +1,64 @@
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("requests")
+from workspace.src.hub_client import HubClient
+from workspace.src.hub_metadata_cache import ModelMetadataCache
+
+MODEL_ID = "openai/whisper-large-v3"
+
+
+@pytest.fixture
+def client(hub_server):
+    client = HubClient(base_url=hub_server.url, max_retries=0)
+    yield client
+    client.close()
+
+
+def test_recent_model_is_served_without_network(client, hub_server):
+    cache = ModelMetadataCache(":memory:", client=client)
+    first, _ = cache.get_model(MODEL_ID)
+    second, error = cache.get_model(MODEL_ID)
+
+    assert error is None
+    assert second == first
+    assert second["downloads"] == 400000
+    assert len(hub_server.requests) == 1
+
+
+def test_stale_model_is_revalidated_with_etag(client, hub_server):
+    cache = ModelMetadataCache(":memory:", ttl_seconds=0, client=client)
+    cache.get_model(MODEL_ID)
+    record, _ = cache.get_model(MODEL_ID)
+
+    assert record["id"] == MODEL_ID
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_search_listing_then_analysis_fetches_full_record_once(client, hub_server):
+    cache = ModelMetadataCache(":memory:", client=client)
+    records, _ = cache.search_models("whisper", 5)
+    assert [record["id"] for record in records] == [MODEL_ID]
+
+    cache.get_model(MODEL_ID)
+    cache.get_model(MODEL_ID)
+    cache.search_models("whisper", 5)
+    assert len(hub_server.requests) == 2
+
+
+def test_offline_runs_use_persisted_records(tmp_path, client, hub_server):
+    path = str(tmp_path / "models.sqlite")
+    ModelMetadataCache(path, client=client).get_model(MODEL_ID)
+
+    offline_client = HubClient(base_url="http://127.0.0.1:9/api", max_retries=0, timeout=0.5)
+    record, error = ModelMetadataCache(path, ttl_seconds=0, client=offline_client).get_model(MODEL_ID)
+    assert error is None
+    assert record["likes"] == 3500
+
+    record, error = ModelMetadataCache(path, client=offline_client).get_model("unknown/model")
+    assert record is None
+    assert error
@@ -0,0 +1,70 @@
+import sys
+import os
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("smolagents")
+from workspace.src import hub_client, hub_metadata_cache, hub_snapshot
+from workspace.src.hub_client import HubClient
+from workspace.src.hub_snapshot import ModelSnapshot, ingest_models_snapshot
+from workspace.src.huggingface_search import search_models
+
+
+@pytest.fixture
+def snapshot_path(hub_server, tmp_path):
+    client = HubClient(base_url=hub_server.url, backoff_factor=0)
+    path = str(tmp_path / "models.parquet")
+    assert ingest_models_snapshot(path, client=client, page_size=2) == 3
+    client.close()
+    return path
+
+
+def test_ingest_follows_pagination(hub_server, snapshot_path):
+    # Two pages of two and one models, the second reached through the Link header
+    assert len(hub_server.requests) == 2
+    assert "offset=2" in hub_server.requests[1]
+    assert len(ModelSnapshot(snapshot_path)) == 3
+    assert not os.path.exists(snapshot_path + ".tmp")
+
+
+def test_snapshot_search_and_screening(snapshot_path):
+    snapshot = ModelSnapshot(snapshot_path)
+    assert [model["id"] for model in snapshot.search("bert")] == ["google-bert/bert-base-uncased"]
+    assert [model["id"] for model in snapshot.search("tag:transformers", limit=1)] == ["google-bert/bert-base-uncased"]
+    assert [model["id"] for model in snapshot.search("whisper large")] == ["openai/whisper-large-v3"]
+    assert snapshot.search("whisper bert") == []
+
+    screened = snapshot.screen()
+    assert list(screened["id"]) == ["google-bert/bert-base-uncased", "openai/whisper-large-v3", "someone/tiny-experiment"]
+    assert list(screened["complexity"]) == ["Medium", "High", "Low"]
+
+
+def test_search_models_answers_from_snapshot(hub_server, snapshot_path, monkeypatch):
+    monkeypatch.setattr(hub_snapshot, "HF_MODELS_SNAPSHOT_PATH", snapshot_path)
+    monkeypatch.setattr(hub_snapshot, "_model_snapshot", None)
+    requests_before = len(hub_server.requests)
+
+    result = search_models(query="whisper", limit=5)
+    assert "openai/whisper-large-v3" in result
+    assert len(hub_server.requests) == requests_before
+
+
+def test_stale_snapshot_falls_back_to_the_hub(hub_server, snapshot_path, monkeypatch):
+    client = HubClient(base_url=hub_server.url, backoff_factor=0)
+    monkeypatch.setattr(hub_client, "_hub_client", client)
+    monkeypatch.setattr(hub_metadata_cache, "_metadata_cache", hub_metadata_cache.ModelMetadataCache(":memory:", client=client))
+    monkeypatch.setattr(hub_snapshot, "HF_MODELS_SNAPSHOT_PATH", snapshot_path)
+    monkeypatch.setattr(hub_snapshot, "_model_snapshot", None)
+    week_ago = time.time() - 8 * 24 * 3600
+    os.utime(snapshot_path, (week_ago, week_ago))
+    assert hub_snapshot.get_model_snapshot() is None
+
+    requests_before = len(hub_server.requests)
+    assert "openai/whisper-large-v3" in search_models(query="whisper", limit=5)
+    assert len(hub_server.requests) == requests_before + 1
+
+    monkeypatch.setattr(hub_snapshot, "HF_MODELS_SNAPSHOT_MAX_AGE_HOURS", 0)
+    assert hub_snapshot.get_model_snapshot() is not None
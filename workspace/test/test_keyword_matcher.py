@@ -0,0 +1,61 @@
+import sys
+import os
+import random
+import re
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("numpy")
+from workspace.src.keyword_matcher import KeywordMatcher
+
+
+def test_substring_matches_equal_in_checks():
+    rng = random.Random(1)
+    for _ in range(2000):
+        keywords = list({"".join(rng.choices("abc-", k=rng.randint(1, 5))) for _ in range(8)})
+        text = "".join(rng.choices("abc- ", k=40))
+        found = KeywordMatcher({"first": keywords[:4], "second": keywords[4:]}).find(text)
+        assert set(found["first"]) == {keyword for keyword in keywords[:4] if keyword in text}
+        assert set(found["second"]) == {keyword for keyword in keywords[4:] if keyword in text}
+
+
+def test_whole_word_categories_respect_boundaries():
+    matcher = KeywordMatcher(
+        {"terms": ["ai", "vision", "computer vision", "fine-tuning"], "hints": ["new", "vision"]},
+        whole_word_categories=["terms"],
+    )
+    text = "Renewed AI fine-tuning for computer vision; maintained vision models"
+    found = matcher.find(text)
+    assert found["terms"] == ["ai", "fine-tuning", "computer vision", "vision"]
+    assert found["hints"] == ["new", "vision"]
+    assert matcher.counts("Said the brain") == {"terms": 0, "hints": 0}
+
+
+def test_count_matrix_matches_counts():
+    matcher = KeywordMatcher({"a": ["model", "algorithm"], "b": ["outperform", "performance"]})
+    texts = ["An algorithmodel that outperforms", "", "Performance of the model"]
+    matrix = matcher.count_matrix(texts)
+    assert matrix.shape == (3, 2)
+    assert matrix.tolist() == [list(matcher.counts(text).values()) for text in texts]
+    assert matrix.tolist() == [[2, 1], [0, 0], [1, 1]]
+
+
+def test_paper_analysis_matches_per_keyword_scans():
+    pytest.importorskip("smolagents")
+    from workspace.src.hf_papers_search import (
+        PAPER_INDICATORS, _analyze_paper_innovation, _extract_key_terms, _indicator_counts, analyze_papers_innovation,
+    )
+
+    text = ("A novel transformer architecture for zero-shot computer vision that outperforms prior state-of-the-art "
+            "methods with improved efficiency, enabling practical real-world deployment in industry.")
+    legacy_terms = re.findall(r'\b(?:transformer|computer vision|vision|zero-shot|efficiency)\b', text.lower())
+    assert set(_extract_key_terms(text)) == set(legacy_terms)
+
+    counts = _indicator_counts(text)
+    for category, keywords in PAPER_INDICATORS.items():
+        assert counts[category] == sum(1 for keyword in keywords if keyword in text.lower())
+
+    papers = [{"title": "A new survey", "summary": text}, {"title": "Plain title", "summary": ""}]
+    assert analyze_papers_innovation(papers) == [_analyze_paper_innovation(paper) for paper in papers]
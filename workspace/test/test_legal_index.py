@@ -0,0 +1,103 @@
+import sys
+import os
+import datetime
+import json
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src import legal_index
+from workspace.src.legal_index import LegalIndex, fold_accents, legal_tokenize
+
+ARTICLES = [
+    {"id": "LEGIARTI000006224012", "title": "Code de commerce", "num": "L225-1", "text_type": "code", "fond": "LEGI",
+     "status": "VIGUEUR", "date_debut": "2023-12-15", "date_fin": "2999-01-01",
+     "text": "La société anonyme est la société dont le capital est divisé en actions."},
+    {"id": "LEGIARTI000006224011", "title": "Code de commerce", "num": "L225-1", "text_type": "code", "fond": "LEGI",
+     "status": "MODIFIE", "date_debut": "2001-01-01", "date_fin": "2023-12-15",
+     "text": "La société anonyme est la société dont le capital est divisé en actions et qui est constituée entre sept associés."},
+    {"id": "LEGIARTI000038496200", "title": "LOI n° 2019-486 du 22 mai 2019 (PACTE)", "num": "1", "text_type": "loi", "fond": "LEGI",
+     "status": "VIGUEUR", "date_debut": "2019-05-23", "date_fin": "2999-01-01",
+     "text": "Croissance et transformation des entreprises, société par actions simplifiée."},
+    {"id": "LEGIARTI000033441234", "title": "Code du travail", "num": "L1221-1", "text_type": "code", "fond": "LEGI",
+     "status": "VIGUEUR", "date_debut": "2008-05-01", "date_fin": "2999-01-01",
+     "text": "Le contrat de travail est soumis aux règles du droit commun."},
+    {"id": "JURITEXT000047318823", "title": "Cour de cassation, civile, Chambre commerciale, 15 mars 2023, 21-20.456",
+     "text_type": "jurisprudence", "fond": "CASS", "date": "2023-03-15",
+     "text": "La responsabilité du dirigeant de société anonyme peut être engagée pour faute de gestion."},
+]
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    path = tmp_path / "legi.jsonl"
+    path.write_text("\n".join(json.dumps(article, ensure_ascii=False) for article in ARTICLES), encoding="utf-8")
+    return str(path)
+
+
+def test_filters_by_status_and_type(corpus_path):
+    index = LegalIndex.from_corpus(corpus_path)
+    ids = [article["id"] for article, _ in index.search("société anonyme", limit=10)]
+    # The superseded version and the decision are excluded
+    assert ids[0] == "LEGIARTI000006224012"
+    assert "LEGIARTI000006224011" not in ids and "JURITEXT000047318823" not in ids
+
+    all_versions = [article["id"] for article, _ in index.search("société anonyme", limit=10, in_force_only=False)]
+    assert "LEGIARTI000006224011" in all_versions
+    assert [article["id"] for article, _ in index.search("société", text_type="loi")] == ["LEGIARTI000038496200"]
+    assert [article["id"] for article, _ in index.search_jurisprudence("dirigeant")] == ["JURITEXT000047318823"]
+
+
+def test_in_force_follows_the_current_date(corpus_path, monkeypatch):
+    index = LegalIndex.from_corpus(corpus_path)
+    assert index.in_force("2020-01-01").tolist() == [True, False, True, True, False]
+    assert [article["id"] for article, _ in index.search("société anonyme")] == ["LEGIARTI000006224012", "LEGIARTI000038496200"]
+
+    # A long-running process sees articles expire once their end date has passed
+    monkeypatch.setattr(legal_index, "date", type("FutureDate", (), {"today": staticmethod(lambda: datetime.date(2999, 6, 1))}))
+    assert index.search("société anonyme") == []
+
+
+def test_index_is_saved_and_reused(corpus_path, monkeypatch):
+    LegalIndex.from_corpus(corpus_path)
+    assert os.path.exists(f"{corpus_path}.bm25.npz")
+    monkeypatch.setattr(legal_index.BM25Index, "build", classmethod(lambda cls, *args, **kwargs: pytest.fail("index rebuilt")))
+    assert len(LegalIndex.from_corpus(corpus_path)) == len(ARTICLES)
+
+
+def test_tools_search_local_corpus(corpus_path, monkeypatch):
+    pytest.importorskip("smolagents")
+    from workspace.src.legifrance_search import search_jurisprudence, search_legal_texts
+
+    monkeypatch.setattr(legal_index, "LEGIFRANCE_CORPUS_PATH", corpus_path)
+    monkeypatch.setattr(legal_index, "_legal_index", None)
+    result = search_legal_texts(query="contrat de travail", text_type="code")
+    assert "Code du travail" in result and "Article L1221-1" in result and "En vigueur" in result
+    assert "Chambre commerciale" in search_jurisprudence(legal_domain="droit des sociétés", keywords="dirigeant")
+
+
+def test_french_analyzer_conflates_forms():
+    assert legal_tokenize("Les SOCIÉTÉS anonymes d'économie mixte") == legal_tokenize("société anonyme économie mixte")
+    assert legal_tokenize("l'entreprise et le salarié") == ["entrepris", "salari"]
+    assert fold_accents("Œuvre générée à l’été") == "oeuvre generee a l'ete"
+
+
+def test_accent_free_query_finds_articles(corpus_path):
+    index = LegalIndex.from_corpus(corpus_path)
+    assert index.search("SOCIETES ANONYMES", limit=1)[0][0]["id"] == "LEGIARTI000006224012"
+    assert index.search("regle contrats", limit=1)[0][0]["num"] == "L1221-1"
+
+
+def test_relevance_ranks_candidate_batch():
+    pytest.importorskip("smolagents")
+    from workspace.src.legifrance_search import _calculate_legal_relevance_score, _rank_legal_texts
+
+    candidates = [{"title": f"Texte {index}", "summary": "Dispositions diverses relatives aux marchés publics."} for index in range(2000)]
+    candidates[1500] = {"title": "Code du travail", "summary": "Le contrat de travail du salarié est conclu par écrit."}
+    candidates[700] = {"title": "Code du travail", "summary": "Durée du travail."}
+    ranked = _rank_legal_texts(candidates, "contrats de travail des salariés")
+    assert [text["title"] for text in ranked[:2]] == ["Code du travail", "Code du travail"]
+    assert ranked[0]["summary"].startswith("Le contrat") and ranked[0]["relevance"] == "🔥 Très pertinent"
+    assert ranked[1]["relevance"] == "🔍 Faiblement pertinent"
+    assert _calculate_legal_relevance_score("Les sociétés anonymes", "société anonyme") == "🔥 Très pertinent"
@@ -0,0 +1,125 @@
+import sys
+import os
+import io
+import json
+import tarfile
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src import legal_ingest
+from workspace.src.legal_index import LegalIndex, load_articles
+from workspace.src.legal_ingest import ingest_legal_archive, parse_legal_xml
+
+ARTICLE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<ARTICLE>
+<META>
+<META_COMMUN><ID>{id}</ID><ORIGINE>LEGI</ORIGINE><NATURE>Article</NATURE></META_COMMUN>
+<META_SPEC><META_ARTICLE><NUM>{num}</NUM><ETAT>VIGUEUR</ETAT><DATE_DEBUT>2016-07-01</DATE_DEBUT><DATE_FIN>2999-01-01</DATE_FIN></META_ARTICLE></META_SPEC>
+</META>
+<CONTEXTE><TEXTE cid="LEGITEXT000005634379" nature="CODE"><TITRE_TXT c_titre_court="Code de commerce" id_txt="LEGITEXT000005634379">Code de commerce</TITRE_TXT></TEXTE></CONTEXTE>
+<VERSIONS><VERSION etat="VIGUEUR"><LIEN_ART id="{id}" num="{num}"/></VERSION></VERSIONS>
+<NOTA><CONTENU/></NOTA>
+<BLOC_TEXTUEL><CONTENU><p>{text}</p><br/>Alinéa suivant.</CONTENU></BLOC_TEXTUEL>
+</ARTICLE>"""
+
+DECISION_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<TEXTE_JURI_JUDI>
+<META>
+<META_COMMUN><ID>JURITEXT000047318823</ID><ORIGINE>JURI</ORIGINE><NATURE>ARRET</NATURE></META_COMMUN>
+<META_SPEC><META_JURI><TITRE>Cour de cassation, civile, Chambre commerciale, 15 mars 2023, 21-20.456</TITRE>
+<DATE_DEC>2023-03-15</DATE_DEC><JURIDICTION>Cour de cassation</JURIDICTION></META_JURI></META_SPEC>
+</META>
+<TEXTE><BLOC_TEXTUEL><CONTENU>Texte intégral de l'arrêt.</CONTENU></BLOC_TEXTUEL>
+<SOMMAIRE><ANA ID="1">Responsabilité du dirigeant pour faute de gestion.</ANA></SOMMAIRE></TEXTE>
+</TEXTE_JURI_JUDI>"""
+
+STRUCTURE_XML = """<?xml version="1.0" encoding="UTF-8"?><TEXTELR><META/></TEXTELR>"""
+
+
+def write_archive(path, documents):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, content in documents:
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = str(tmp_path / "Freemium_legi_global.tar.gz")
+    documents = [("legi/texte/struct/LEGITEXT000005634379.xml", STRUCTURE_XML)]
+    for index in range(5):
+        article_id = f"LEGIARTI00000622401{index}"
+        documents.append((f"legi/article/{article_id}.xml", ARTICLE_XML.format(id=article_id, num=f"L225-{index}", text=f"Article {index} sur la société anonyme.")))
+    documents.append(("cass/JURITEXT000047318823.xml", DECISION_XML))
+    write_archive(path, documents)
+    return path
+
+
+def test_parses_articles_and_decisions():
+    article = parse_legal_xml(ARTICLE_XML.format(id="LEGIARTI1", num="L225-1", text="Texte").encode("utf-8"))
+    assert article == {
+        "id": "LEGIARTI1", "title": "Code de commerce", "num": "L225-1", "text_type": "code", "fond": "LEGI",
+        "status": "VIGUEUR", "date_debut": "2016-07-01", "date_fin": "2999-01-01", "text": "Texte Alinéa suivant.",
+    }
+    decision = parse_legal_xml(DECISION_XML.encode("utf-8"))
+    assert decision["fond"] == "Cour de cassation" and decision["text"].startswith("Responsabilité du dirigeant")
+    assert parse_legal_xml(STRUCTURE_XML.encode("utf-8")) is None
+
+
+def test_ingests_archive_into_searchable_corpus(archive_path, tmp_path):
+    corpus_path = str(tmp_path / "corpus.jsonl")
+    assert ingest_legal_archive(archive_path, corpus_path, batch_size=2) == 6
+    # A second run finds the archive complete
+    assert ingest_legal_archive(archive_path, corpus_path) == 0
+
+    index = LegalIndex.from_corpus(corpus_path)
+    assert len(index) == 6
+    assert index.search("société anonyme", text_type="code")[0][0]["title"] == "Code de commerce"
+    assert index.search_jurisprudence("dirigeant")[0][0]["id"] == "JURITEXT000047318823"
+
+
+def test_resumes_after_interruption(archive_path, tmp_path, monkeypatch):
+    corpus_path = str(tmp_path / "corpus.jsonl")
+    parse = legal_ingest.parse_legal_xml
+    parsed = []
+
+    def interrupted_parse(source):
+        if len(parsed) == 4:
+            raise KeyboardInterrupt
+        parsed.append(source)
+        return parse(source)
+
+    monkeypatch.setattr(legal_ingest, "parse_legal_xml", interrupted_parse)
+    with pytest.raises(KeyboardInterrupt):
+        ingest_legal_archive(archive_path, corpus_path, batch_size=3)
+    # A record written after the last checkpoint is dropped on resume
+    with open(corpus_path, "a", encoding="utf-8") as corpus:
+        corpus.write('{"id": "partial"')
+
+    monkeypatch.setattr(legal_ingest, "parse_legal_xml", parse)
+    assert ingest_legal_archive(archive_path, corpus_path, batch_size=3) == 3
+    ids = [article["id"] for article in load_articles(corpus_path)]
+    assert len(ids) == len(set(ids)) == 6
+    with open(f"{corpus_path}.checkpoint.json", encoding="utf-8") as handle:
+        assert json.load(handle)["Freemium_legi_global.tar.gz"]["complete"]
+
+
+def test_later_archive_supersedes_earlier_versions(archive_path, tmp_path):
+    corpus_path = str(tmp_path / "corpus.jsonl")
+    ingest_legal_archive(archive_path, corpus_path)
+    # An incremental archive published later: the first article was modified and is no longer in force
+    article_id = "LEGIARTI000006224010"
+    modified = ARTICLE_XML.format(id=article_id, num="L225-0", text="Ancienne version sur la société anonyme.")
+    modified = modified.replace("<ETAT>VIGUEUR</ETAT>", "<ETAT>MODIFIE</ETAT>").replace("2999-01-01", "2024-01-01")
+    update_path = str(tmp_path / "LEGI_20240102-000000.tar.gz")
+    write_archive(update_path, [(f"legi/article/{article_id}.xml", modified)])
+    assert ingest_legal_archive(update_path, corpus_path) == 1
+
+    index = LegalIndex.from_corpus(corpus_path)
+    assert len(index) == 6
+    assert [article["status"] for article in index.articles if article["id"] == article_id] == ["MODIFIE"]
+    assert article_id not in [article["id"] for article, _ in index.search("société anonyme", limit=10)]
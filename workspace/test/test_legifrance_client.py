@@ -0,0 +1,80 @@
+import sys
+import os
+import threading
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("smolagents")
+from workspace.src import legifrance_client
+from workspace.src.legifrance_client import LegifranceAuthError, LegifranceClient
+from workspace.src.legifrance_search import analyze_legal_compliance, search_jurisprudence, search_legal_texts
+
+
+def make_client(piste_server, **kwargs):
+    kwargs.setdefault("client_secret", "secret")
+    return LegifranceClient(base_url=piste_server.url, oauth_url=piste_server.oauth_url, client_id="app", backoff_factor=0, **kwargs)
+
+
+@pytest.fixture
+def client(piste_server, monkeypatch):
+    client = make_client(piste_server)
+    monkeypatch.setattr(legifrance_client, "_legifrance_client", client)
+    yield client
+    client.close()
+
+
+def test_token_is_cached_across_calls(client, piste_server):
+    assert "Article L225-1" in search_legal_texts(query="société anonyme", text_type="code")
+    assert "En vigueur" in search_legal_texts(query="société anonyme", text_type="code")
+    assert "2019-486" in search_legal_texts(query="croissance", text_type="loi")
+    assert piste_server.token_requests == 1
+    assert len(piste_server.search_requests) == 3
+    assert piste_server.search_requests[2]["recherche"]["filtres"] == [{"facette": "NATURE", "valeurs": ["LOI"]}]
+
+
+def test_token_refreshed_before_expiry(client, piste_server):
+    # Expires within the refresh margin, so every request needs a new token
+    piste_server.expires_in = 30
+    client.post("/search", {"fond": "ALL", "recherche": {"champs": [{"criteres": [{"valeur": "société"}]}], "pageSize": 5}})
+    client.post("/search", {"fond": "ALL", "recherche": {"champs": [{"criteres": [{"valeur": "société"}]}], "pageSize": 5}})
+    assert piste_server.token_requests == 2
+
+
+def test_revoked_token_is_replaced(client, piste_server):
+    client.access_token()
+    piste_server.valid_tokens.clear()
+    response = client.post("/search", {"fond": "ALL", "recherche": {"champs": [{"criteres": [{"valeur": "société"}]}], "pageSize": 5}})
+    assert response.status_code == 200
+    assert piste_server.token_requests == 2
+
+
+def test_bad_credentials_raise(piste_server):
+    with pytest.raises(LegifranceAuthError):
+        make_client(piste_server, client_secret="wrong").access_token()
+
+
+def test_concurrent_requests_stay_within_limit(piste_server):
+    client = make_client(piste_server, max_concurrent_requests=2)
+    piste_server.search_delay = 0.05
+    payload = {"fond": "ALL", "recherche": {"champs": [{"criteres": [{"valeur": "société"}]}], "pageSize": 5}}
+    threads = [threading.Thread(target=client.post, args=("/search", payload)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(piste_server.search_requests) == 6
+    assert piste_server.max_in_flight == 2
+
+
+def test_jurisprudence_and_compliance_use_api(client, piste_server):
+    result = search_jurisprudence(legal_domain="société", keywords="", limit=5)
+    assert "Chambre commerciale" in result and "Conseil d'État" in result
+    assert "2024-01-12" in result
+    assert "📚 TEXTES DE RÉFÉRENCE" in analyze_legal_compliance(business_activity="société anonyme", company_type="SA")
+
+
+def test_falls_back_without_credentials(monkeypatch):
+    monkeypatch.setattr(legifrance_client, "_legifrance_client", LegifranceClient(client_id=None, client_secret=None))
+    assert "Réponse simulée" in search_legal_texts(query="société anonyme")
@@ -0,0 +1,52 @@
+import sys
+import os
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("litellm")
+from workspace.src.completion_engine import CompletionEngine
+from workspace.src.llm_cache import CachedLiteLLMModel, ResponseCache
+
+
+def test_cache_hits_misses_and_ttl(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl_seconds=10)
+    key = ResponseCache.make_key({"model_id": "m", "messages": ["hi"]})
+
+    assert cache.get(key) is None
+    cache.set(key, {"role": "assistant", "content": "hello"})
+    assert cache.get(key) == {"role": "assistant", "content": "hello"}
+
+    now = time.time()
+    monkeypatch.setattr("workspace.src.llm_cache.time.time", lambda: now + 11)
+    assert cache.get(key) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["entries"] == 0
+
+
+def test_cache_evicts_least_recently_used_beyond_size_limit(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=150)
+    for name in ("a", "b", "c"):
+        cache.set(name, {"content": name * 50})
+        cache.get("a")
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_cached_model_answers_repeated_prompts_without_api_call(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    model = CachedLiteLLMModel(model_id="anthropic/claude-3-5-sonnet-latest", api_key="test", cache=cache, mock_response="- an idea")
+    engine = CompletionEngine(model)
+
+    assert engine.run("Give me an idea") == "- an idea"
+    assert engine.run("Give me an idea") == "- an idea"
+    engine.run("Give me another idea")
+
+    assert model.usage()["calls"] == 2
+    assert cache.stats()["hits"] == 1
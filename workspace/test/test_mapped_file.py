@@ -0,0 +1,70 @@
+import sys
+import os
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.mapped_file import MappedFile, profile_file
+from workspace.src.startup_metrics import read_metrics, summarize_metrics
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_head_tail_sample_and_count(tmp_path):
+    path = _write(tmp_path, "events.csv", "id,value\n" + "".join(f"{i:03d},{i * 2:04d}\n" for i in range(1000)))
+    with MappedFile(path) as mapped:
+        assert mapped.header == ["id", "value"]
+        assert mapped.count_lines(chunk_bytes=100) == 1000
+        assert mapped.head(2) == ["000,0000", "001,0002"]
+        assert mapped.tail(2) == ["998,1996", "999,1998"]
+        sample = mapped.sample(10)
+        # Lines are the same length, so each tenth of the bytes is a tenth of the lines
+        assert [int(line.split(",")[0]) // 100 for line in sample] == list(range(10))
+        assert mapped.parse(sample)["value"].tolist() == [2 * int(line.split(",")[0]) for line in sample]
+
+
+def test_chunks_keep_quoted_lines_whole(tmp_path):
+    rows = "".join(f'{i},"note {i}\nsecond line, with comma"\n' for i in range(200))
+    path = _write(tmp_path, "notes.csv", "id,note\n" + rows)
+    with MappedFile(path) as mapped:
+        frames = list(mapped.iter_frames(chunk_bytes=64))
+    assert len(frames) > 1
+    frame = pd.concat(frames)
+    assert frame["id"].tolist() == list(range(200))
+    assert frame["note"].str.endswith("second line, with comma").all()
+
+
+def test_column_stats_and_stratified_sample(tmp_path):
+    rows = "".join(f"{['free', 'pro', 'team'][i % 3]},{i},{'' if i % 10 == 0 else 'x'}\n" for i in range(3000))
+    path = _write(tmp_path, "customers.csv", "plan,mrr,tag\n" + rows)
+    with MappedFile(path) as mapped:
+        stats = mapped.column_stats(chunk_bytes=1000)
+        assert stats.loc["mrr", "type"] == "number"
+        assert (stats.loc["mrr", "min"], stats.loc["mrr", "max"], stats.loc["mrr", "mean"]) == (0, 2999, 1499.5)
+        assert stats.loc["plan", "distinct"] == "3" and stats.loc["tag", "missing"] == 300
+        sample = mapped.stratified_sample("plan", per_stratum=4, chunk_bytes=1000)
+        # One stratum per row: refused instead of keeping every row
+        with pytest.raises(ValueError, match="more than 100 distinct values"):
+            mapped.stratified_sample("mrr", chunk_bytes=1000, max_strata=100)
+    assert sample["plan"].value_counts().to_dict() == {"free": 4, "pro": 4, "team": 4}
+    assert (sample["mrr"] % 3 == sample["plan"].map({"free": 0, "pro": 1, "team": 2})).all()
+
+
+def test_unrecognized_file_is_profiled(tmp_path):
+    path = _write(tmp_path, "logs.csv", "level,latency\n" + "".join(f"INFO,{i}\n" for i in range(100)))
+    metrics = read_metrics(path)
+    assert metrics.monthly.empty and metrics.profile == profile_file(path)
+    summary = summarize_metrics(metrics)
+    assert "Data profile:" in summary and "100 data lines" in summary and "INFO,99" in summary
+
+    text = _write(tmp_path, "memo.txt", "MRR: 12K\n" + "".join(f"line {i}\n" for i in range(50)))
+    metrics = read_metrics(text)
+    assert metrics.reported["mrr"] == 12000
+    assert len(metrics.notes) == 21 and metrics.notes[-1] == "... 30 more lines not shown"
+    assert metrics.profile is not None
@@ -0,0 +1,79 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src import metric_kernels as kernels
+
+
+def test_series_kernels():
+    mrr = np.array([100.0, 110.0, 121.0, 0.0, 50.0])
+    assert kernels.period_growth(mrr)[1:4] == pytest.approx([0.1, 0.1, -1.0])
+    # Growth from zero is undefined
+    assert np.isnan(kernels.period_growth(mrr)[[0, 4]]).all()
+    assert kernels.cmgr(mrr[:3]) == pytest.approx(0.1)
+    assert kernels.rolling_mean(mrr, 2)[1:].tolist() == [105.0, 115.5, 60.5, 25.0]
+    assert kernels.logo_churn([100, 90, 90], [0, 10, 9])[1:] == pytest.approx([0.1, 0.1])
+    assert kernels.burn_multiple([10, 10, 10, 10], [100, 110, 120, 130]).tolist()[-1] == pytest.approx(30 / 360)
+    # A missing month only blanks the windows that contain it
+    assert np.isnan(kernels.rolling_sum([1, np.nan, 1, 1, 1, 1], 2)).tolist() == [True, True, True, False, False, False]
+    assert kernels.burn_multiple([10, None, 10, 10, 10, 10], [100, 110, 120, 130, 140, 150]).tolist()[-1] == pytest.approx(30 / 360)
+    assert kernels.ltv_cac(500, 0.05, 400, gross_margin=0.8) == pytest.approx(20.0)
+
+
+def test_series_kernels_batch_startups():
+    rng = np.random.default_rng(0)
+    mrr = rng.uniform(1000, 2000, size=(50, 24))
+    batch = kernels.period_growth(mrr, 12)
+    assert np.allclose(batch[7], kernels.period_growth(mrr[7], 12), equal_nan=True)
+    assert kernels.cmgr(mrr, 6) == pytest.approx([kernels.cmgr(row, 6) for row in mrr])
+    assert np.allclose(kernels.rolling_sum(mrr, 3)[:, 2:], pd.DataFrame(mrr.T).rolling(3).sum().to_numpy().T[:, 2:])
+
+
+def test_activity_kernels_match_reference():
+    rng = np.random.default_rng(1)
+    customers = rng.integers(0, 300, 5000)
+    months = rng.integers(600, 618, 5000)
+    revenue = rng.uniform(10, 100, 5000)
+    customers, months, revenue = kernels.aggregate_activity(customers, months, revenue)
+    start, size = 600, 18
+
+    # Dense customer x month reference
+    dense = np.zeros((300, size))
+    np.add.at(dense, (customers, months - start), revenue)
+    active = dense > 0
+    flows = kernels.monthly_activity(customers, months, revenue, start, size)
+    assert flows["mrr"] == pytest.approx(dense.sum(axis=0))
+    assert flows["customers"].tolist() == active.sum(axis=0).tolist()
+    assert flows["churned_customers"][1:].tolist() == (active[:, :-1] & ~active[:, 1:]).sum(axis=0).tolist()
+    first_month = np.where(active.any(axis=1), active.argmax(axis=1), -1)
+    assert flows["new_customers"].tolist() == np.bincount(first_month[first_month >= 0], minlength=size).tolist()
+
+    gross_churn, nrr = kernels.revenue_retention(customers, months, revenue, start, size)
+    previous, current = dense[:, :-1], dense[:, 1:]
+    base = previous.sum(axis=0)
+    assert gross_churn[1:] == pytest.approx(np.clip(previous - current, 0, None).sum(axis=0) / base)
+    assert nrr[1:] == pytest.approx(np.where(previous > 0, current, 0).sum(axis=0) / base)
+
+    cohort_months, counts = kernels.cohort_counts(customers, months)
+    cohort = first_month + start
+    for row, cohort_month in enumerate(cohort_months):
+        members = active[cohort == cohort_month]
+        offset = cohort_month - start
+        assert counts[row, :size - offset].tolist() == members[:, offset:].sum(axis=0).tolist()
+    retention = kernels.cohort_retention(cohort_months, counts, start + size - 1)
+    unreached = cohort_months[:, None] + np.arange(counts.shape[1]) > start + size - 1
+    assert (np.isnan(retention) == unreached).all() and (retention[:, 0] == 1).all()
+
+
+def test_kpi_tools():
+    pytest.importorskip("smolagents")
+    from workspace.src.startup_kpi_tools import STARTUP_KPI_TOOLS, growth_rates, unit_economics
+
+    assert growth_rates(values=[100, 110, 0, 10], periods=1) == [None, pytest.approx(0.1), -1.0, None]
+    assert unit_economics(arpu=500, monthly_churn=0.05, cac=400) == {"ltv": 10000.0, "ltv_cac": 25.0, "payback_months": 0.8}
+    assert len({tool.name for tool in STARTUP_KPI_TOOLS}) == len(STARTUP_KPI_TOOLS)
@@ -0,0 +1,76 @@
+import sys
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src import metric_kernels as kernels
+
+ROWS = 2_000_000
+# Throughput every kernel must sustain, in input rows per second
+MIN_ROWS_PER_SECOND = 1_000_000
+START, MONTHS = 600, 36
+
+
+@pytest.fixture(scope="module")
+def invoices():
+    """Invoice-level rows: 2M invoices of 100k customers over three years."""
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 100_000, ROWS), rng.integers(START, START + MONTHS, ROWS), rng.uniform(10, 500, ROWS)
+
+
+@pytest.fixture(scope="module")
+def activity(invoices):
+    return kernels.aggregate_activity(*invoices)
+
+
+@pytest.fixture(scope="module")
+def portfolio_series():
+    """Monthly MRR of 50k startups over three years, one row per startup."""
+    return np.random.default_rng(1).uniform(1_000, 100_000, size=(50_000, MONTHS))
+
+
+def _check_throughput(benchmark, rows):
+    benchmark.extra_info["rows"] = rows
+    if not benchmark.disabled:
+        assert rows / benchmark.stats.stats.mean >= MIN_ROWS_PER_SECOND
+
+
+def test_aggregate_activity(benchmark, invoices):
+    customers, _, _ = benchmark(kernels.aggregate_activity, *invoices)
+    assert len(customers) <= ROWS
+    _check_throughput(benchmark, ROWS)
+
+
+def test_monthly_activity(benchmark, activity):
+    flows = benchmark(kernels.monthly_activity, *activity, START, MONTHS)
+    assert flows["customers"].sum() == len(activity[0])
+    _check_throughput(benchmark, len(activity[0]))
+
+
+def test_revenue_retention(benchmark, activity):
+    gross_churn, nrr = benchmark(kernels.revenue_retention, *activity, START, MONTHS)
+    assert np.isnan(nrr[0]) and (nrr[1:] > 0).all()
+    _check_throughput(benchmark, len(activity[0]))
+
+
+def test_cohort_counts(benchmark, activity):
+    cohort_months, counts = benchmark(kernels.cohort_counts, activity[0], activity[1])
+    assert counts[:, 0].sum() == len(np.unique(activity[0]))
+    _check_throughput(benchmark, len(activity[0]))
+
+
+@pytest.mark.parametrize("kernel", ["period_growth", "cmgr", "rolling_mean", "burn_multiple"])
+def test_series_kernels(benchmark, portfolio_series, kernel):
+    args = {
+        "period_growth": (portfolio_series, 12),
+        "cmgr": (portfolio_series,),
+        "rolling_mean": (portfolio_series, 3),
+        "burn_multiple": (portfolio_series * 0.5, portfolio_series),
+    }[kernel]
+    benchmark(getattr(kernels, kernel), *args)
+    _check_throughput(benchmark, portfolio_series.size)
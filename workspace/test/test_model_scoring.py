@@ -0,0 +1,57 @@
+import sys
+import os
+import random
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("pandas")
+from workspace.src.model_scoring import score_models
+
+
+def test_scores_sample_models(sample_models):
+    scored = score_models(sample_models).set_index("id")
+    bert = scored.loc["google-bert/bert-base-uncased"]
+    assert (bert["popularity"], bert["complexity"], bert["risk_level"], bert["recommendation_tier"]) == (
+        "🔥 Very High", "Medium", "Low", "strong_buy",
+    )
+    assert scored.loc["openai/whisper-large-v3", "complexity"] == "High"
+    tiny = scored.loc["someone/tiny-experiment"]
+    assert (tiny["popularity"], tiny["complexity"], tiny["risk_level"], tiny["recommendation_tier"]) == (
+        "🆕 New/Niche", "Low", "High", "high_risk",
+    )
+
+
+def test_threshold_boundaries_are_exclusive():
+    scored = score_models([
+        {"id": "a", "downloads": 100000, "likes": 0},
+        {"id": "b", "downloads": 50001, "likes": 101},
+        {"id": "c", "downloads": 50000, "likes": 101},
+        {"id": "d", "downloads": 1000, "likes": 0},
+    ])
+    assert list(scored["popularity"]) == ["🚀 High", "🚀 High", "🚀 High", "🌱 Growing"]
+    assert list(scored["recommendation_tier"]) == ["cautious", "strong_buy", "moderate_buy", "high_risk"]
+    assert list(scored["risk_level"]) == ["Low", "Low", "Low", "Low"]
+
+
+def test_ranks_by_tier_then_adoption(sample_models):
+    ranked = score_models(list(reversed(sample_models)), rank=True, limit=2)
+    assert list(ranked["id"]) == ["google-bert/bert-base-uncased", "openai/whisper-large-v3"]
+    assert score_models([]).empty
+
+
+def test_ranks_thousands_of_models():
+    rng = random.Random(0)
+    records = [
+        {
+            "id": f"org/model-{i}",
+            "downloads": rng.randrange(0, 10_000_000),
+            "likes": rng.randrange(0, 5_000),
+            "tags": rng.sample(["transformers", "large", "base", "audio", "vision", "xl"], 3),
+        }
+        for i in range(20_000)
+    ]
+    ranked = score_models(records, rank=True)
+    assert len(ranked) == len(records)
+    assert ranked["downloads"].iloc[0] >= ranked[ranked["recommendation_tier"] == "strong_buy"]["downloads"].max()
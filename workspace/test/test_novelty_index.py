@@ -0,0 +1,99 @@
+import sys
+import os
+import random
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+np = pytest.importorskip("numpy")
+from workspace.src.novelty_index import HashedTfidfEmbedder, NearestNeighborIndex, NoveltyIndex
+
+
+def synthetic_papers(count, seed=0):
+    rng = random.Random(seed)
+    topics = [[f"topic{t}term{i}" for i in range(40)] for t in range(100)]
+    common = [f"word{i}" for i in range(2000)]
+    papers = []
+    for number in range(count):
+        topic = topics[rng.randrange(len(topics))]
+        papers.append({
+            "title": " ".join(rng.choices(topic, k=6)),
+            "summary": " ".join(rng.choices(topic, k=40) + rng.choices(common, k=60)),
+            "arxiv_id": f"paper-{number}",
+            "publishedAt": "2024-01-01",
+            "authors": [],
+        })
+    return papers
+
+
+def test_embedder_ranks_related_texts_closer():
+    embedder = HashedTfidfEmbedder(256)
+    vectors = embedder.fit_transform([
+        "diffusion models for image synthesis",
+        "latent diffusion models generate high resolution images",
+        "reinforcement learning for robot control",
+    ])
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+    assert not embedder.transform([""]).any()
+
+
+def test_partitioned_search_matches_exact_search():
+    vectors = NoveltyIndex.build(synthetic_papers(6000)).index.vectors
+    approximate = NearestNeighborIndex(vectors)
+    assert approximate.lists
+    queries = vectors[:100]
+    _, ids = approximate.search(queries, k=5, exclude=[[row] for row in range(100)])
+    exact = queries @ vectors.T
+    exact[np.arange(100), np.arange(100)] = -np.inf
+    expected = np.argsort(-exact, axis=1)[:, :5]
+    recall = np.mean([len(set(ids[row]) & set(expected[row])) / 5 for row in range(100)])
+    assert recall >= 0.9
+
+
+def test_scores_a_batch_of_abstracts_against_a_few_partitions():
+    papers = synthetic_papers(6000)
+    novelty_index = NoveltyIndex.build(papers)
+    queries = synthetic_papers(1000, seed=1)
+    texts = [f"{paper['title']} {paper['summary']}" for paper in queries]
+
+    novelty, similarities, neighbors = novelty_index.score_batch(texts, k=5)
+    assert novelty.shape == (1000,) and neighbors.shape == (1000, 5)
+    assert (neighbors >= 0).all()
+    for row in range(3):
+        assert novelty_index.score(queries[row]["title"], queries[row]["summary"])["score"] == pytest.approx(novelty[row])
+
+    # Each query is only compared with the vectors of its n_probe closest partitions
+    index = novelty_index.index
+    probes = index._nearest_centroids(novelty_index.embedder.transform(texts), index.n_probe)
+    probed = [sum(len(index.lists[probe]) for probe in row) for row in probes]
+    assert max(probed) < len(index) / 2
+
+    unrelated = novelty_index.score("Quantum error correction with topological qubits")
+    related = novelty_index.score(papers[0]["title"], papers[0]["summary"], exclude_id="paper-0")
+    assert unrelated["score"] > related["score"]
+    assert all(neighbor["arxiv_id"] != "paper-0" for neighbor, _ in related["neighbors"])
+
+
+def test_analyze_paper_novelty_lists_nearest_prior_work(monkeypatch):
+    pytest.importorskip("smolagents")
+    from workspace.src import novelty_index, paper_index
+    from workspace.src.hf_papers_search import analyze_paper_novelty
+    from workspace.src.paper_index import PaperIndex
+
+    papers = synthetic_papers(200)
+    monkeypatch.setattr(paper_index, "_paper_index", PaperIndex(papers))
+    monkeypatch.setattr(novelty_index, "_novelty_index", None)
+
+    result = analyze_paper_novelty(paper_title=papers[0]["title"])
+    assert "NEAREST PRIOR WORK" in result
+    assert "Novelty Score:" in result
+    assert "(paper-0," not in result
+
+    # A paper outside the dump, without abstract, is compared on its title alone
+    scored = []
+    original_score = novelty_index.NoveltyIndex.score
+    monkeypatch.setattr(novelty_index.NoveltyIndex, "score", lambda self, title, abstract="", **kwargs: scored.append(abstract) or original_score(self, title, abstract, **kwargs))
+    assert "NEAREST PRIOR WORK" in analyze_paper_novelty(paper_title="An unindexed paper title")
+    assert scored == [""]
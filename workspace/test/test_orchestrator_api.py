@@ -0,0 +1,71 @@
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from workspace.src import orchestrator_api
+from workspace.src.orchestrator_api import RunExecutor, app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    release = threading.Event()
+
+    def fake_run_orchestrator(prompt, agents=None, brainstorming_method=None):
+        if prompt == "block":
+            release.wait(5)
+        return f"done: {prompt}"
+
+    monkeypatch.setattr(orchestrator_api, "run_orchestrator", fake_run_orchestrator)
+    monkeypatch.setattr(orchestrator_api, "run_executor", RunExecutor(max_workers=1, queue_depth=0, timeout=0.2))
+    yield TestClient(app), release
+    release.set()
+
+
+def test_run_returns_response(client):
+    test_client, _ = client
+    response = test_client.post("/run", json={"prompt": "hi"})
+    assert response.status_code == 200
+    assert response.json() == {"response": "done: hi"}
+
+
+def test_run_times_out_with_503_and_rejects_when_saturated(client):
+    test_client, release = client
+    response = test_client.post("/run", json={"prompt": "block"})
+    assert response.status_code == 503
+
+    # The timed-out run still occupies the only worker slot
+    response = test_client.post("/run", json={"prompt": "hi"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "5"
+
+    release.set()
+    deadline = time.time() + 5
+    while orchestrator_api.run_executor.stats()["in_flight"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert test_client.post("/run", json={"prompt": "hi"}).status_code == 200
+
+
+def test_run_stream_emits_server_sent_events(client, monkeypatch):
+    test_client, _ = client
+
+    def fake_stream_orchestrator(prompt, agents, brainstorming_method, on_event, should_stop):
+        on_event({"type": "agent_call", "agent": "brainstorming", "task": prompt})
+        on_event({"type": "delta", "content": "Hel"})
+        on_event({"type": "final_answer", "output": "Hello"})
+        return "Hello"
+
+    monkeypatch.setattr(orchestrator_api, "stream_orchestrator", fake_stream_orchestrator)
+    response = test_client.post("/run/stream", json={"prompt": "hi"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    event_types = [line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert event_types == ["agent_call", "delta", "final_answer", "done"]
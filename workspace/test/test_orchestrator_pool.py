@@ -0,0 +1,69 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.orchestrator_pool import OrchestratorPool, make_pool_key
+
+
+class FakeMemory:
+    def __init__(self):
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+
+class FakeOrchestrator:
+    def __init__(self, agents, method):
+        self.agents = agents
+        self.method = method
+        self.memory = FakeMemory()
+        self.managed_agents = {}
+
+
+def make_pool(**kwargs):
+    built = []
+
+    def factory(agents, method):
+        orchestrator = FakeOrchestrator(agents, method)
+        built.append(orchestrator)
+        return orchestrator
+
+    return OrchestratorPool(factory, **kwargs), built
+
+
+def test_key_ignores_agent_order_and_defaults_method():
+    assert make_pool_key(["legal_assistant", "brainstorming"], None) == make_pool_key(["brainstorming", "legal_assistant"], "SCAMPER")
+
+
+def test_checked_in_orchestrator_is_reset_and_reused():
+    pool, built = make_pool()
+    with pool.lease(["hello"], "SCAMPER") as first:
+        pass
+    with pool.lease(["hello"], "SCAMPER") as second:
+        pass
+
+    assert first is second
+    assert len(built) == 1
+    assert first.memory.resets == 2
+    assert pool.stats()["hits"] == 1
+
+
+def test_concurrent_checkouts_get_distinct_orchestrators():
+    pool, built = make_pool()
+    first = pool.checkout(["hello"])
+    second = pool.checkout(["hello"])
+    assert first is not second
+    assert len(built) == 2
+
+
+def test_idle_orchestrators_are_bounded_lru():
+    pool, built = make_pool(max_idle=2, max_idle_per_key=1)
+    pool.warm_up([(["hello"], None), (["brainstorming"], None), (["legal_assistant"], None)])
+
+    stats = pool.stats()
+    assert stats["idle"] == 2
+    assert stats["evictions"] == 1
+    # The least recently returned key was evicted first
+    assert pool.checkout(["hello"]) is not built[0]
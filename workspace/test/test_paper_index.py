@@ -0,0 +1,105 @@
+import sys
+import os
+import json
+import random
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+pytest.importorskip("numpy")
+from workspace.src.paper_index import PaperIndex, load_papers, normalize_paper
+from workspace.src.text_index import BM25Index
+
+ARXIV_RECORDS = [
+    {
+        "id": "1706.03762",
+        "title": "Attention Is All You Need",
+        "abstract": "  The dominant sequence transduction models are based on complex recurrent networks.\n We propose the Transformer, based solely on attention mechanisms.",
+        "authors": "Ashish Vaswani, Noam Shazeer and Niki Parmar",
+        "versions": [{"version": "v1", "created": "Mon, 12 Jun 2017 17:57:34 GMT"}],
+    },
+    {
+        "id": "1810.04805",
+        "title": "BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding",
+        "abstract": "We introduce BERT, a new language representation model built on the Transformer encoder.",
+        "authors_parsed": [["Devlin", "Jacob", ""], ["Chang", "Ming-Wei", ""]],
+        "update_date": "2019-05-24",
+    },
+    {
+        "paper": {
+            "id": "2112.10752",
+            "title": "High-Resolution Image Synthesis with Latent Diffusion Models",
+            "summary": "Diffusion models achieve state-of-the-art synthesis results on image data.",
+            "authors": [{"name": "Robin Rombach"}, {"name": "Andreas Blattmann"}],
+            "publishedAt": "2021-12-20T00:00:00.000Z",
+        }
+    },
+]
+
+
+@pytest.fixture
+def dump_path(tmp_path):
+    path = tmp_path / "papers.jsonl"
+    path.write_text("\n".join(json.dumps(record) for record in ARXIV_RECORDS) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_normalizes_arxiv_and_hf_records():
+    attention, bert, diffusion = (normalize_paper(record) for record in ARXIV_RECORDS)
+    assert attention["authors"] == ["Ashish Vaswani", "Noam Shazeer", "Niki Parmar"]
+    assert attention["publishedAt"].startswith("2017-06-12T17:57:34")
+    assert attention["summary"].startswith("The dominant sequence")
+    assert bert["authors"] == ["Jacob Devlin", "Ming-Wei Chang"]
+    assert diffusion["arxiv_id"] == "2112.10752"
+
+
+def test_bm25_ranks_by_term_rarity_and_frequency():
+    index = BM25Index.build([
+        "transformer attention transformer",
+        "attention models",
+        "diffusion models for images",
+    ])
+    assert [doc for doc, _ in index.search("transformer attention")] == [0, 1]
+    assert [doc for doc, _ in index.search("models", limit=1)] in ([1], [2])
+    assert index.search("unknown words") == []
+
+
+def test_index_is_saved_and_reused(dump_path):
+    papers = PaperIndex.from_dump(dump_path)
+    assert os.path.exists(dump_path + ".bm25.npz")
+    reloaded = PaperIndex.from_dump(dump_path)
+    assert reloaded.index.vocabulary == papers.index.vocabulary
+
+    assert reloaded.search("transformer language")[0][0]["arxiv_id"] == "1810.04805"
+    assert reloaded.search("attention")[0][0]["title"] == "Attention Is All You Need"
+    assert reloaded.find_by_title("attention is all  you need")["arxiv_id"] == "1706.03762"
+    assert len(list(load_papers(dump_path))) == 3
+
+
+def test_search_papers_tool_uses_index(dump_path, monkeypatch):
+    pytest.importorskip("smolagents")
+    from workspace.src import paper_index
+    from workspace.src.hf_papers_search import analyze_paper_novelty, search_papers
+
+    monkeypatch.setattr(paper_index, "_paper_index", PaperIndex.from_dump(dump_path))
+    result = search_papers(query="diffusion image synthesis", limit=2)
+    assert "High-Resolution Image Synthesis" in result
+    assert "Attention Is All You Need" not in result
+    assert "ArXiv ID: 1706.03762" in analyze_paper_novelty(paper_title="Attention Is All You Need")
+
+
+def test_partial_ranking_matches_a_full_sort_on_a_large_corpus():
+    rng = random.Random(0)
+    vocabulary = [f"term{i}" for i in range(5000)]
+    documents = [" ".join(rng.choices(vocabulary, k=120)) for _ in range(20_000)]
+    index = BM25Index.build(documents)
+
+    query = "term1 term42 term4000"
+    scores = index.scores(query)
+    # Only documents sharing a posting list with the query get a score
+    assert ((scores > 0) == (index.term_matches(query) > 0)).all()
+    results = index.search(query, limit=10)
+    # Compare scores rather than ids: documents tie on the 10th score
+    assert [score for _, score in results] == sorted(scores, reverse=True)[:10]
+    assert all(scores[doc_id] == score for doc_id, score in results)
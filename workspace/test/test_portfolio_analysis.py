@@ -0,0 +1,92 @@
+import sys
+import os
+import json
+import threading
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.portfolio_analysis import RateLimiter, analyze_portfolio, default_output_dir, is_portfolio_source
+
+
+def _write_startup(directory, name, growth, churned):
+    months = pd.period_range("2024-01", periods=6, freq="M").astype(str)
+    mrr = [10000 * (1 + growth) ** index for index in range(6)]
+    pd.DataFrame({
+        "month": months,
+        "mrr": mrr,
+        "customers": [value / 100 for value in mrr],
+        "churned_customers": churned,
+        "burn": 50000,
+    }).to_csv(directory / f"{name}.csv", index=False)
+
+
+def test_portfolio_is_ranked_and_reported(tmp_path):
+    _write_startup(tmp_path, "fast", 0.2, 1)
+    _write_startup(tmp_path, "slow", 0.02, 5)
+    _write_startup(tmp_path, "flat", 0.0, 3)
+    (tmp_path / "broken.json").write_text("{not json")
+    summaries = []
+
+    def commentary(summary):
+        summaries.append(summary)
+        return f"Commentary for {summary.splitlines()[0]}"
+
+    ranked = analyze_portfolio(str(tmp_path), commentary=commentary, max_workers=2, calls_per_minute=0)
+    assert [result["name"] for result in ranked] == ["fast", "slow", "flat", "broken"]
+    assert ranked[0]["commentary"] == "Commentary for Startup: fast"
+    assert ranked[-1]["status"] == "failed" and len(summaries) == 3
+
+    output_dir = tmp_path / "portfolio_report"
+    report = (output_dir / "portfolio_report.md").read_text()
+    assert report.index("| 1 | fast |") < report.index("| 2 | slow |") and "Could not read metrics" in report
+    assert [result["name"] for result in json.loads((output_dir / "portfolio_report.json").read_text())][0] == "fast"
+    assert len(list((output_dir / "startups").iterdir())) == 4
+
+
+def test_rerun_only_redoes_missing_work(tmp_path):
+    for name in ("alpha", "beta", "gamma"):
+        _write_startup(tmp_path, name, 0.1, 2)
+    calls = []
+
+    def flaky(summary):
+        calls.append(summary.splitlines()[0])
+        if "beta" in summary:
+            raise RuntimeError("connection reset")
+        return "ok"
+
+    ranked = analyze_portfolio(str(tmp_path / "*.csv"), commentary=flaky, max_workers=1, calls_per_minute=0)
+    beta = next(result for result in ranked if result["name"] == "beta")
+    assert beta["status"] == "computed" and "connection reset" in beta["error"]
+
+    calls.clear()
+    _write_startup(tmp_path, "gamma", 0.3, 0)
+    ranked = analyze_portfolio(str(tmp_path / "*.csv"), commentary=lambda summary: calls.append(summary.splitlines()[0]) or "ok", calls_per_minute=0)
+    # beta's commentary is retried and the modified gamma recomputed; alpha is reused
+    assert sorted(calls) == ["Startup: beta", "Startup: gamma"]
+    assert all(result["status"] == "complete" for result in ranked) and ranked[0]["name"] == "gamma"
+
+
+def test_rate_limiter_spaces_calls_across_threads():
+    limiter = RateLimiter(calls_per_minute=1200)
+    starts = []
+
+    def call():
+        limiter.wait()
+        starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    starts.sort()
+    assert starts[-1] - starts[0] >= 4 * 0.05 - 0.01
+
+
+def test_portfolio_sources(tmp_path):
+    assert is_portfolio_source(str(tmp_path)) and is_portfolio_source("data/*.csv")
+    assert not is_portfolio_source(str(tmp_path / "metrics.csv"))
+    assert default_output_dir(os.path.join("data", "2025", "*.csv")) == os.path.join("data", "2025", "portfolio_report")
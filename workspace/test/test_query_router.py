@@ -0,0 +1,82 @@
+import sys
+import os
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.query_router import ROUTER_DIRECT_CONFIDENCE, QueryRouter, get_query_router
+
+
+@pytest.fixture(scope="module")
+def router():
+    return get_query_router()
+
+
+@pytest.mark.parametrize("query, agent, method", [
+    ("Just say hello please.", "hello", "run"),
+    ("Use the brainstorming agent to generate ideas for a new app using smolagents.", "brainstorming", "run"),
+    ("data/startup_metrics.csv", "data_analyst", "run"),
+    ("What are the latest developments in speech synthesis?", "technical_assistant", "research_latest_developments"),
+    ("Is this technique novel: sparse mixture of experts for audio?", "technical_assistant", "evaluate_technique_novelty"),
+    ("Quels risques juridiques pour une application de paris sportifs ?", "legal_assistant", "evaluate_legal_risks"),
+    ("Which regulations apply to the telecom sector?", "legal_assistant", "research_sector_regulations"),
+    ("How should we structure a convertible investment of 1M euros?", "legal_assistant", "analyze_investment_legal_structure"),
+])
+def test_routes_unseen_queries(router, query, agent, method):
+    route = router.route(query)
+    assert (route.agent, route.method) == (agent, method)
+    assert route.confidence > 0.5 and route.mentioned_agents in ((), (agent,))
+
+
+# Held out from the table: ROUTER_DIRECT_CONFIDENCE is set between these and the ones below
+@pytest.mark.parametrize("query, agent", [
+    ("Say hi to everyone", "hello"),
+    ("Give me ideas for a pet care startup", "brainstorming"),
+    ("What is the MRR growth in reports/q2.xlsx?", "data_analyst"),
+    ("Recent advances in speech synthesis", "technical_assistant"),
+    ("Evaluate the feasibility of an AI assistant for dentists", "technical_assistant"),
+    ("What are the legal risks of a ride sharing app?", "legal_assistant"),
+    ("What licenses does a crypto exchange need in France?", "legal_assistant"),
+    ("Review the term sheet for our seed round", "legal_assistant"),
+])
+def test_held_out_queries_are_routed_directly(router, query, agent):
+    route = router.route(query)
+    assert route.agent == agent and route.confidence >= ROUTER_DIRECT_CONFIDENCE
+
+
+# Sharing a word with a route ("risks", "sector", "seed", "series", "project") but for no agent, or another one
+@pytest.mark.parametrize("query", [
+    "What are the technical risks of fine-tuning Llama on 8GB GPUs?",
+    "Which sector is best for a new AI startup?",
+    "tell me about seed funding",
+    "What is the risk of overfitting with small datasets?",
+    "Which series of GPUs is best for training?",
+    "How do I manage a software project with a small team?",
+    "What seed should I use for reproducible training runs?",
+    "Explain the structure of a transformer model",
+    "Which sector grows fastest in Europe?",
+    "How do I sort a list in Python?",
+])
+def test_cross_domain_queries_are_not_routed_directly(router, query):
+    assert router.route(query).confidence < ROUTER_DIRECT_CONFIDENCE
+
+
+def test_multi_agent_and_unclear_queries_are_not_confident(router):
+    route = router.route("First say hello to me, then use SCAMPER: brainstorm ideas for a new app")
+    assert set(route.mentioned_agents) == {"hello", "brainstorming"} and route.confidence < 0.85
+    assert router.route("Tell me about the weather").confidence < 0.85
+
+
+def test_routes_within_agents(router):
+    query = "Evaluate the novelty of diffusion models for tabular data"
+    route = router.route(query, agents=["technical_assistant"])
+    assert route.confidence == 1.0 and route.method == "evaluate_technique_novelty"
+    assert router.route(query, agents=["unknown"]) is None
+    # Unclear among the legal methods: the default is kept
+    assert router.method("legal_assistant", "Tell me about the weather", default="analyze_startup_legal_framework") == "analyze_startup_legal_framework"
+
+
+def test_training_is_deterministic(router):
+    query = "Research recent papers on graph neural networks"
+    assert (QueryRouter.from_file().probabilities(query) == router.probabilities(query)).all()
@@ -0,0 +1,116 @@
+import sys
+import os
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from workspace.src.startup_metrics import (
+    cohort_retention,
+    compute_kpis,
+    parse_number,
+    read_metrics,
+    summarize_metrics,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+def test_parse_number():
+    assert parse_number("$50,000") == 50000
+    assert parse_number("5%") == pytest.approx(0.05)
+    assert parse_number("1.2M") == pytest.approx(1.2e6)
+    assert parse_number("12 500 €") == 12500
+    assert parse_number("4,5 %") == pytest.approx(0.045)
+    assert parse_number("n/a") is None
+
+
+def test_text_export_reported_metrics():
+    metrics = read_metrics(os.path.join(DATA_DIR, "startup_metrics.txt"))
+    assert metrics.name == "Innovate Solutions Inc."
+    assert metrics.reported["mrr"] == 50000 and metrics.reported["churn_rate"] == pytest.approx(0.05)
+    kpis = compute_kpis(metrics)
+    assert kpis["ltv_cac"] == pytest.approx(15.0)
+    assert kpis["payback_months"] == pytest.approx(0.8)
+    summary = summarize_metrics(metrics, kpis)
+    assert "LTV / CAC: 15.00x" in summary and "Website Visitors: 10,000" in summary
+
+
+def test_monthly_export_in_chunks(tmp_path):
+    path = tmp_path / "metrics.csv"
+    pd.DataFrame({
+        "Month": [f"2024-{month:02d}" for month in range(1, 13)] + ["2025-01"],
+        "MRR ($)": [f"${10000 + 1000 * index:,}" for index in range(13)],
+        "Active Customers": [100 + 10 * index for index in range(13)],
+        "New Customers": 15,
+        "Churned Customers": 5,
+        "Marketing Spend": 3000,
+        "Net Burn": 60000,
+        "Cash Balance": 1_200_000,
+    }).to_csv(path, sep=";", index=False)
+    kpis = compute_kpis(read_metrics(str(path), chunk_rows=4))
+    assert kpis["months"] == 13 and kpis["mrr"] == 22000
+    assert kpis["yoy_growth"] == pytest.approx(1.2)
+    assert kpis["cmgr"] == pytest.approx((22000 / 10000) ** (1 / 12) - 1)
+    assert kpis["cac"] == pytest.approx(200)
+    # Last quarter: 180k burned for 3k of net new MRR, i.e. 36k of net new ARR
+    assert kpis["burn_multiple"] == pytest.approx(5.0)
+    assert kpis["runway_months"] == pytest.approx(20)
+
+
+def test_french_semicolon_export(tmp_path):
+    path = tmp_path / "startup.csv"
+    path.write_text("Mois;MRR;Clients\n01/03/2024;1 000,50;10\n01/04/2024;1.200,00;12\n", encoding="utf-8")
+    metrics = read_metrics(str(path))
+    # Day-first dates and decimal commas: March and April, not January 3 and 4
+    assert [str(month) for month in metrics.monthly.index] == ["2024-03", "2024-04"]
+    assert metrics.monthly["mrr"].tolist() == [1000.5, 1200.0]
+    assert compute_kpis(metrics)["mom_growth"] == pytest.approx(1200 / 1000.5 - 1)
+
+
+def test_xlsx_export(tmp_path):
+    path = tmp_path / "metrics.xlsx"
+    pd.DataFrame({"Month": ["2024-01", "2024-02"], "MRR": [10000, 12000], "Customers": [50, 55]}).to_excel(path, index=False)
+    metrics = read_metrics(str(path))
+    assert metrics.monthly["mrr"].tolist() == [10000, 12000]
+    assert compute_kpis(metrics)["mom_growth"] == pytest.approx(0.2)
+
+
+def test_blank_cells_stay_missing(tmp_path):
+    path = tmp_path / "metrics.csv"
+    path.write_text(
+        "Month,MRR,Net Burn,Cash\n2024-01,10000,50000,600000\n2024-02,11000,,550000\n2024-03,,40000,510000\n",
+        encoding="utf-8",
+    )
+    metrics = read_metrics(str(path))
+    assert metrics.monthly["mrr"].isna().tolist() == [False, False, True]
+    assert metrics.monthly["burn"].isna().tolist() == [False, True, False]
+    kpis = compute_kpis(metrics)
+    # The latest known MRR, not $0 and a -100% month
+    assert kpis["mrr"] == 11000 and kpis["mom_growth"] == pytest.approx(0.1)
+    assert kpis["runway_months"] == pytest.approx(510000 / 40000)
+
+
+def test_customer_level_export(tmp_path):
+    path = tmp_path / "invoices.jsonl"
+    rows = [
+        # Cohort 2024-01: a, b and c; b leaves after one month, c contracts
+        ("a", "2024-01-05", 100), ("b", "2024-01-09", 100), ("c", "2024-01-20", 200),
+        ("a", "2024-02-05", 100), ("c", "2024-02-20", 100), ("d", "2024-02-11", 50),
+        ("a", "2024-03-05", 150), ("c", "2024-03-20", 100), ("d", "2024-03-11", 50),
+    ]
+    pd.DataFrame(rows, columns=["customer_id", "date", "amount"]).to_json(path, orient="records", lines=True)
+    metrics = read_metrics(str(path), chunk_rows=2)
+    assert metrics.monthly["customers"].tolist() == [3, 3, 3]
+    assert metrics.monthly["new_customers"].tolist() == [3, 1, 0]
+    assert metrics.monthly["churned_customers"].tolist() == [0, 1, 0]
+    retention = cohort_retention(metrics.customer_revenue)
+    assert retention.loc["2024-01"].tolist() == pytest.approx([1, 2 / 3, 2 / 3])
+    assert pd.isna(retention.loc["2024-02", 2])
+
+    kpis = compute_kpis(metrics)
+    assert kpis["logo_churn"] == pytest.approx((1 / 3 + 0) / 2)
+    # February lost b (100) and half of c (100) out of 400; March expanded a by 50 out of 250
+    assert kpis["revenue_churn"] == pytest.approx((200 / 400 + 0) / 2)
+    assert kpis["nrr"] == pytest.approx((200 / 400 + 300 / 250) / 2)